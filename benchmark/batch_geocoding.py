@@ -0,0 +1,59 @@
+"""
+Feed events spread over a few thousand cities to a Geo chart, looking every
+event up on its own versus resolving each distinct city once.
+
+    $ python benchmark/batch_geocoding.py 1000000
+"""
+
+import random
+import sys
+import time
+
+from prettytable import PrettyTable
+
+from pyecharts import datasets
+from pyecharts.charts import Geo
+
+
+def _per_item(chart: Geo, data_pair: list) -> list:
+    result = []
+    for n, v in data_pair:
+        lng, lat = chart.get_coordinate(n)
+        result.append({"name": n, "value": [lng, lat, v]})
+    return result
+
+
+def _batch(chart: Geo, data_pair: list) -> list:
+    return chart._feed_data(data_pair, "scatter")
+
+
+def main(count: int, cities: int = 3000, misspelled: float = 0.03):
+    rng = random.Random(0)
+    names = rng.sample(list(dict.keys(datasets.COORDINATES)), cities)
+    # a few cities come with a suffix, they are matched fuzzily
+    for i in rng.sample(range(cities), int(cities * misspelled)):
+        names[i] += "市区"
+    data_pair = [(rng.choice(names), i) for i in range(count)]
+
+    table = PrettyTable(["geocoding", "lookups", "time (s)"])
+    results = []
+    for name, feed in (("per item", _per_item), ("batch", _batch)):
+        chart = Geo()
+        datasets.COORDINATES._cache.clear()
+        lookups = []
+        get_coordinate = chart.get_coordinate
+
+        def _counted(n, get_coordinate=get_coordinate, lookups=lookups):
+            lookups.append(n)
+            return get_coordinate(n)
+
+        chart.get_coordinate = _counted
+        start = time.perf_counter()
+        results.append(feed(chart, data_pair))
+        table.add_row([name, len(lookups), "%.2f" % (time.perf_counter() - start)])
+    assert results[0] == results[1]
+    print(table)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
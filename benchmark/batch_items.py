@@ -0,0 +1,68 @@
+"""
+Compare styled scatter points given as one `ScatterItem` per point with the
+same points given column by column as `ScatterItems`.
+
+    $ python benchmark/batch_items.py 1000000
+"""
+
+import sys
+import time
+
+import numpy as np
+from prettytable import PrettyTable
+
+from pyecharts import options as opts
+from pyecharts.charts import Scatter
+
+
+def _per_item(values, sizes, colors):
+    return [
+        opts.ScatterItem(
+            value=v,
+            symbol_size=s,
+            symbol_keep_aspect=None,
+            itemstyle_opts=opts.ItemStyleOpts(color=c),
+        )
+        for v, s, c in zip(values.tolist(), sizes.tolist(), colors)
+    ]
+
+
+def _batch(values, sizes, colors):
+    return opts.ScatterItems(values=values, symbol_sizes=sizes, colors=colors)
+
+
+def _measure(build, values, sizes, colors):
+    start = time.perf_counter()
+    data = build(values, sizes, colors)
+    built = time.perf_counter()
+    chart = Scatter().add_xaxis([]).add_yaxis("points", data)
+    content = chart.dump_options()
+    dumped = time.perf_counter()
+    return built - start, dumped - built, content
+
+
+def main(count: int):
+    rng = np.random.default_rng(0)
+    values = rng.random((count, 2))
+    sizes = rng.integers(1, 20, count)
+    colors = ["#%06x" % c for c in rng.integers(0, 1 << 24, count).tolist()]
+
+    table = PrettyTable(["data", "build (s)", "dump (s)", "total (s)"])
+    contents = []
+    for name, build in (("ScatterItem", _per_item), ("ScatterItems", _batch)):
+        build_time, dump_time, content = _measure(build, values, sizes, colors)
+        contents.append(content)
+        table.add_row(
+            [
+                name,
+                "%.2f" % build_time,
+                "%.2f" % dump_time,
+                "%.2f" % (build_time + dump_time),
+            ]
+        )
+    assert contents[0] == contents[1]
+    print(table)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,59 @@
+"""
+Compute the boxes of many groups of samples: with the full sort of every
+group the boxes were computed with before, with the partitions of
+`quantiles.box_stats`, with its pure python fallback, and streamed through
+KLL sketches.
+
+    $ python benchmark/boxplot_quantiles.py 1000 100000
+"""
+
+import sys
+import time
+from unittest.mock import patch
+
+import numpy as np
+from prettytable import PrettyTable
+
+from pyecharts.commons import quantiles
+
+
+def _sorted_boxes(items):
+    data = []
+    for item in items:
+        d, res = sorted(item), []
+        for i in range(1, 4):
+            n = i * (len(d) + 1) / 4
+            k = int(n)
+            m = n - k
+            res.append(d[k - 1] if m == 0 else d[k - 1] * (1 - m) + d[k] * m)
+        data.append([d[0]] + res + [d[-1]])
+    return data
+
+
+def main(groups: int, size: int):
+    samples = np.random.default_rng(0).lognormal(size=(groups, size))
+    lists = samples.tolist()
+    expected = _sorted_boxes(lists)
+
+    table = PrettyTable(["method", "time (s)", "largest median error"])
+
+    def run(method, function):
+        start = time.perf_counter()
+        boxes = function()
+        elapsed = time.perf_counter() - start
+        error = max(abs(b[2] - e[2]) for b, e in zip(boxes, expected))
+        table.add_row([method, "%.2f" % elapsed, "%.2g" % error])
+
+    run("sorted (before)", lambda: _sorted_boxes(lists))
+    run("numpy, lists", lambda: quantiles.box_stats(lists)[0])
+    run("numpy, array", lambda: quantiles.box_stats(samples)[0])
+    run("numpy, tukey", lambda: quantiles.box_stats(samples, 1.5)[0])
+    with patch("pyecharts.commons.utils.optional_numpy", return_value=None):
+        run("python", lambda: quantiles.box_stats(lists)[0])
+    run("kll sketch", lambda: quantiles.sketch_stats(iter(g) for g in lists))
+    print(table)
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]] or [1000, 100000]
+    main(*args)
@@ -0,0 +1,65 @@
+"""
+Compare the memory and lookup time of a gazetteer held in a `FuzzyDict`
+with the same gazetteer in a memory-mapped `CoordinateStore`.
+
+    $ python benchmark/coordinate_store.py 1000000
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from prettytable import PrettyTable
+
+from pyecharts.datasets import CoordinateStore, FuzzyDict, build_coordinate_store
+
+
+def _coords(count: int) -> dict:
+    rng = random.Random(0)
+    return {
+        "place-%d" % i: [rng.uniform(-180, 180), rng.uniform(-90, 90)]
+        for i in range(count)
+    }
+
+
+def _measure(load, names: list):
+    tracemalloc.start()
+    mapping = load()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for name in names:
+        mapping.get(name)
+    return mapping, memory, time.perf_counter() - start
+
+
+def main(count: int, lookups: int = 100_000):
+    coords = _coords(count)
+    names = random.Random(1).sample(list(coords), min(lookups, count))
+    table = PrettyTable(["gazetteer", "python memory (MB)", "lookups (s)"])
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "coords.bin")
+        build_coordinate_store(coords, path)
+
+        def _fuzzy_dict():
+            fd = FuzzyDict()
+            fd.update((k, list(v)) for k, v in coords.items())
+            return fd
+
+        for name, load in (
+            ("FuzzyDict", _fuzzy_dict),
+            ("CoordinateStore", lambda: CoordinateStore(path)),
+        ):
+            mapping, memory, timing = _measure(load, names)
+            table.add_row([name, "%.1f" % (memory / 1e6), "%.3f" % timing])
+            if isinstance(mapping, CoordinateStore):
+                mapping.close()
+            del mapping
+    print(table)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,90 @@
+"""
+Downsample a long, noisy and spiky sensor series with LTTB and min/max
+buckets, for several numbers of points kept, and measure how far the drawn
+lines are from the full series.
+
+The error is measured on a 900 pixels wide chart: for every pixel column,
+the vertical extent the line covers is compared with the one of the full
+series, as a share of the value range.
+
+    $ python benchmark/downsampling.py 5000000
+"""
+
+import sys
+import time
+
+import numpy as np
+from prettytable import PrettyTable
+
+from pyecharts import options as opts
+from pyecharts.charts import Line
+from pyecharts.commons import downsample
+
+_PIXELS = 900
+
+
+def _envelope(x: np.ndarray, y: np.ndarray) -> tuple:
+    # the lowest and highest value the line reaches in every pixel column,
+    # segments crossing a column count for the part inside it
+    columns = np.minimum((x * _PIXELS).astype(int), _PIXELS - 1)
+    low = np.full(_PIXELS, np.inf)
+    high = np.full(_PIXELS, -np.inf)
+    np.minimum.at(low, columns, y)
+    np.maximum.at(high, columns, y)
+    # a segment spanning several columns covers the columns in between
+    ends = columns[1:] - columns[:-1] > 1
+    for i in np.flatnonzero(ends):
+        middle, stop = np.arange(columns[i] + 1, columns[i + 1]), i + 2
+        values = np.interp((middle + 0.5) / _PIXELS, x[i:stop], y[i:stop])
+        low[middle] = np.minimum(low[middle], values)
+        high[middle] = np.maximum(high[middle], values)
+    return low, high
+
+
+def main(count: int):
+    rng = np.random.default_rng(0)
+    y = np.cumsum(rng.normal(0, 1, count)) + rng.normal(0, 5, count)
+    spikes = rng.choice(count, 50, replace=False)
+    y[spikes] += rng.choice([-1, 1], 50) * 400
+    x = np.linspace(0, 1, count, endpoint=False)
+    low, high = _envelope(x, y)
+    value_range = y.max() - y.min()
+
+    table = PrettyTable(
+        ["method", "points", "envelope error (%)", "time (s)", "options size (MB)"]
+    )
+    for method in (downsample.LTTB, downsample.MINMAX):
+        for threshold in (300, 900, 1800, 3600):
+            start = time.perf_counter()
+            c = (
+                Line(init_opts=opts.InitOpts(width="{}px".format(_PIXELS)))
+                .set_downsampling(method, threshold)
+                .add_xaxis(x)
+                .add_yaxis("sensor", y)
+            )
+            elapsed = time.perf_counter() - start
+            kept = c.options["series"][0]["data"]
+            sampled_low, sampled_high = _envelope(kept["f0"], kept["f1"])
+            error = (
+                np.abs(sampled_low - low).mean() + np.abs(sampled_high - high).mean()
+            ) / (2 * value_range)
+            table.add_row(
+                [
+                    method,
+                    len(kept),
+                    "%.2f" % (100 * error),
+                    "%.2f" % elapsed,
+                    "%.2f" % (len(c.dump_options()) / 2**20),
+                ]
+            )
+    start = time.perf_counter()
+    c = Line().add_xaxis(x).add_yaxis("sensor", y)
+    size = len(c.dump_options()) / 2**20
+    table.add_row(
+        ["none", count, "0.00", "%.2f" % (time.perf_counter() - start), "%.2f" % size]
+    )
+    print(table)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000)
@@ -0,0 +1,73 @@
+"""
+Look place names up in `COORDINATES`, a few of them misspelled, with the
+indexed `FuzzyDict` and with a scan of every key like it used to do.
+
+    $ python benchmark/fuzzy_lookup.py 50000
+"""
+
+import difflib
+import random
+import sys
+import time
+
+from prettytable import PrettyTable
+
+from pyecharts.datasets import COORDINATES
+
+
+def _scan(lookfor: str):
+    ratio_calc = difflib.SequenceMatcher()
+    ratio_calc.set_seq1(lookfor)
+    best_ratio, best_key = 0, None
+    for key in dict.keys(COORDINATES):
+        ratio_calc.set_seq2(key)
+        ratio = ratio_calc.ratio()
+        if ratio > best_ratio:
+            best_ratio, best_key = ratio, key
+    return best_key
+
+
+def _indexed(lookfor: str):
+    return COORDINATES._search(lookfor)[1]
+
+
+def _names(count: int, miss_rate: float) -> list:
+    rng = random.Random(0)
+    keys = list(dict.keys(COORDINATES))
+    # a pool of misspellings which comes back like real data does
+    misses = []
+    for key in rng.sample(keys, 200):
+        chars = list(key)
+        chars[rng.randrange(len(chars))] = rng.choice("市县区省州")
+        misses.append("".join(chars))
+    return [
+        rng.choice(misses) if rng.random() < miss_rate else rng.choice(keys)
+        for _ in range(count)
+    ]
+
+
+def _time(lookup, names: list) -> float:
+    COORDINATES._cache.clear()
+    start = time.perf_counter()
+    for name in names:
+        if not dict.__contains__(COORDINATES, name):
+            lookup(name)
+    return time.perf_counter() - start
+
+
+def main(count: int):
+    table = PrettyTable(["miss rate", "scan (s)", "indexed (s)"])
+    for miss_rate in (0.001, 0.01, 0.05):
+        names = _names(count, miss_rate)
+        table.add_row(
+            [
+                "{:.1%}".format(miss_rate),
+                "%.2f" % _time(_scan, names),
+                "%.3f" % _time(_indexed, names),
+            ]
+        )
+    print(table)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,80 @@
+"""
+Build the map script of a synthetic GeoJSON map with detailed borders, at
+several tolerances, and compare their sizes with the raw GeoJSON.
+
+    $ python benchmark/geojson_maps.py 200
+"""
+
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+from prettytable import PrettyTable
+
+from pyecharts.datasets.geojson import DOUGLAS_PEUCKER, VISVALINGAM, build_map_scripts
+
+
+def _region(rng: random.Random, lng: float, lat: float, positions: int) -> list:
+    # a noisy circle, as detailed as a surveyed border
+    ring = []
+    for i in range(positions):
+        angle = 2 * math.pi * i / positions
+        radius = 1 + 0.1 * math.sin(7 * angle) + rng.uniform(-0.01, 0.01)
+        ring.append(
+            [
+                round(lng + radius * math.cos(angle), 6),
+                round(lat + radius * math.sin(angle), 6),
+            ]
+        )
+    ring.append(ring[0])
+    return ring
+
+
+def main(regions: int, positions: int = 5000):
+    rng = random.Random(0)
+    features = [
+        {
+            "type": "Feature",
+            "properties": {"name": "region%d" % i},
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [
+                    _region(rng, 100 + i % 20 * 2, 20 + i // 20 * 2, positions)
+                ],
+            },
+        }
+        for i in range(regions)
+    ]
+    table = PrettyTable(["method", "tolerance", "size (MB)", "build time (s)"])
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "map.json")
+        with open(path, "w") as f:
+            json.dump({"type": "FeatureCollection", "features": features}, f)
+        table.add_row(
+            ["raw GeoJSON", "-", "%.1f" % (os.path.getsize(path) / 2**20), "-"]
+        )
+        for method in (DOUGLAS_PEUCKER, VISVALINGAM):
+            for tolerance in (0, 1e-3, 1e-2):
+                if method == VISVALINGAM:
+                    tolerance = tolerance**2
+                start = time.perf_counter()
+                (script,) = build_map_scripts(
+                    path, {"map": tolerance}, os.path.join(folder, method), method
+                ).values()
+                table.add_row(
+                    [
+                        method,
+                        tolerance,
+                        "%.2f" % (os.path.getsize(script) / 2**20),
+                        "%.2f" % (time.perf_counter() - start),
+                    ]
+                )
+    print(table)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
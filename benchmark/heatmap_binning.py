@@ -0,0 +1,53 @@
+"""
+Build a heat map of events by hour of the week and response time: with one
+`[x, y, value]` item per cell of a dense grid counted in python, as before,
+and with `HeatMap.add_binned`, which only ships the cells holding events.
+
+    $ python benchmark/heatmap_binning.py 10000000
+"""
+
+import sys
+import time
+
+import numpy as np
+from prettytable import PrettyTable
+
+from pyecharts.charts import HeatMap
+
+_HOURS = ["{}h".format(h) for h in range(24 * 7)]
+
+
+def main(count: int):
+    rng = np.random.default_rng(0)
+    hours = rng.integers(0, 24 * 7, count)
+    # response times cluster, most cells of a fine grid stay empty
+    latency = rng.lognormal(3, 0.4, count) + 50 * (hours % 24 > 18)
+    edges = np.linspace(0, 400, 801)
+
+    table = PrettyTable(["method", "cells", "time (s)", "options size (MB)"])
+
+    start = time.perf_counter()
+    counts = {}
+    y_index = np.searchsorted(edges, latency, side="right") - 1
+    for x, y in zip(hours.tolist(), y_index.tolist()):
+        counts[(x, y)] = counts.get((x, y), 0) + 1
+    value = [
+        [x, y, counts.get((x, y), 0)] for x in range(len(_HOURS)) for y in range(800)
+    ]
+    c = HeatMap().add_xaxis(_HOURS).add_yaxis("events", list(range(800)), value)
+    elapsed = time.perf_counter() - start
+    size = len(c.dump_options()) / 2**20
+    table.add_row(["dense, python", len(value), "%.2f" % elapsed, "%.2f" % size])
+
+    start = time.perf_counter()
+    labels = np.array(_HOURS)[hours]
+    c = HeatMap().add_xaxis(_HOURS).add_binned("events", labels, latency, y_bins=edges)
+    elapsed = time.perf_counter() - start
+    cells = len(c.options["series"][0]["data"])
+    size = len(c.dump_options()) / 2**20
+    table.add_row(["add_binned", cells, "%.2f" % elapsed, "%.2f" % size])
+    print(table)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
@@ -0,0 +1,57 @@
+"""
+Time `import pyecharts` and the first use of a chart in fresh interpreters,
+and fail when the import takes longer than the budget (in milliseconds).
+
+    $ python benchmark/import_time.py 200
+"""
+
+import subprocess
+import sys
+
+from prettytable import PrettyTable
+
+_CASES = {
+    "import pyecharts": "import pyecharts",
+    "from pyecharts.charts import Bar": "from pyecharts.charts import Bar",
+    "Bar().render_embed()": (
+        "from pyecharts.charts import Bar\n"
+        "Bar().add_xaxis(['A']).add_yaxis('a', [1]).render_embed()"
+    ),
+    "Geo().get_coordinate()": (
+        "from pyecharts.charts import Geo\n"
+        "Geo().add_schema().get_coordinate('北京')"
+    ),
+}
+
+
+def _time(code: str, repeat: int) -> float:
+    # cumulative time of the top-level imports, interpreter start-up excluded
+    script = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        "{}\n"
+        "print(time.perf_counter() - start)\n".format(code)
+    )
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, "-c", script])
+        timings.append(float(output.decode().split()[-1]))
+    return min(timings) * 1000
+
+
+def main(budget: float, repeat: int = 5):
+    table = PrettyTable(["case", "time (ms)"])
+    timings = {case: _time(code, repeat) for case, code in _CASES.items()}
+    for case, timing in timings.items():
+        table.add_row([case, "%.0f" % timing])
+    print(table)
+    if timings["import pyecharts"] > budget:
+        sys.exit(
+            "import pyecharts took {:.0f}ms, over the {:.0f}ms budget".format(
+                timings["import pyecharts"], budget
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,44 @@
+"""
+Time repeated `render_embed` calls on a chart which does not change between
+calls, and on one which gets a new series before every call.
+
+    $ python benchmark/incremental_dump.py 200000
+"""
+
+import random
+import sys
+import time
+
+from prettytable import PrettyTable
+
+from pyecharts import options as opts
+from pyecharts.charts import Line
+
+
+def _chart(points: int, series: int, cached: bool) -> Line:
+    init_opts = opts.InitOpts(is_fragment_cache=cached)
+    chart = Line(init_opts=init_opts).add_xaxis(list(range(points)))
+    for i in range(series):
+        chart.add_yaxis("series%d" % i, [random.random() for _ in range(points)])
+    return chart
+
+
+def main(points: int, repeat: int = 5):
+    table = PrettyTable(["case", "full dump (s)", "cached dump (s)"])
+    for case in ("unchanged", "add series"):
+        timings = []
+        for cached in (False, True):
+            chart = _chart(points, 4, cached)
+            chart.render_embed()
+            start = time.perf_counter()
+            for i in range(repeat):
+                if case == "add series":
+                    chart.add_yaxis("extra%d" % i, [1] * 10)
+                chart.render_embed()
+            timings.append((time.perf_counter() - start) / repeat)
+        table.add_row([case] + ["%.4f" % t for t in timings])
+    print(table)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,48 @@
+"""
+Compare the throughput of the json backends on a large Line, with its data
+as python lists and as numpy arrays.
+
+    $ python benchmark/json_backends.py 500000
+"""
+
+import sys
+import time
+
+import numpy as np
+from prettytable import PrettyTable
+
+from pyecharts.charts import Line
+from pyecharts.globals import JsonBackendType
+from pyecharts.render import serializer
+
+_BACKENDS = (
+    JsonBackendType.BUILTIN,
+    JsonBackendType.SIMPLEJSON,
+    JsonBackendType.JSON,
+    JsonBackendType.ORJSON,
+)
+
+
+def main(points: int, repeat: int = 3):
+    x = np.arange(points)
+    y = np.random.rand(points) * 1000
+    charts = {
+        "list": Line().add_xaxis(x.tolist()).add_yaxis("series", y.tolist()),
+        "ndarray": Line().add_xaxis(x).add_yaxis("series", y),
+    }
+    table = PrettyTable(["backend"] + ["%s (s)" % name for name in charts] + ["bytes"])
+    for name in _BACKENDS:
+        backend = serializer.get_serializer(name)
+        row = [name]
+        for chart in charts.values():
+            start = time.perf_counter()
+            for _ in range(repeat):
+                content = backend.dumps(chart.options)
+            row.append("%.3f" % ((time.perf_counter() - start) / repeat))
+        row.append(len(content))
+        table.add_row(row)
+    print(table)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
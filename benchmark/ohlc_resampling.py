@@ -0,0 +1,61 @@
+"""
+Aggregate a day of trades into one minute OHLC bars: vectorized in one go,
+with the pure python fallback, and streamed in chunks from an iterator.
+
+    $ python benchmark/ohlc_resampling.py 5000000
+"""
+
+import sys
+import time
+import tracemalloc
+from unittest.mock import patch
+
+import numpy as np
+from prettytable import PrettyTable
+
+from pyecharts.commons import resample
+
+_DAY = 86400 * 1000
+
+
+def _ticks(timestamps, prices, volumes):
+    for i in range(len(timestamps)):
+        yield timestamps[i], prices[i], volumes[i]
+
+
+def main(count: int):
+    rng = np.random.default_rng(0)
+    timestamps = np.sort(rng.uniform(0, _DAY, count))
+    prices = 100 + np.cumsum(rng.normal(0, 0.01, count))
+    volumes = rng.integers(1, 100, count).astype(float)
+
+    table = PrettyTable(["mode", "bars", "time (s)", "peak memory (MB)"])
+
+    def run(mode, function):
+        tracemalloc.start()
+        start = time.perf_counter()
+        bars = function()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        table.add_row([mode, len(bars), "%.2f" % elapsed, "%.1f" % (peak / 2**20)])
+
+    run(
+        "numpy",
+        lambda: resample.resample_ohlc(timestamps, prices, 60000, volumes),
+    )
+    ts, ps, vs = timestamps.tolist(), prices.tolist(), volumes.tolist()
+    with patch("pyecharts.commons.utils.optional_numpy", return_value=None):
+        run("python", lambda: resample.resample_ohlc(ts, ps, 60000, vs))
+    run(
+        "stream",
+        lambda: sum(
+            resample.stream_ohlc(_ticks(ts, ps, vs), 60000),
+            resample.Bars([], [], []),
+        ),
+    )
+    print(table)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000)
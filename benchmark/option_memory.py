@@ -0,0 +1,47 @@
+"""
+Measure the memory taken by data items and common options, per instance.
+
+    $ python benchmark/option_memory.py 100000
+"""
+
+import sys
+import tracemalloc
+
+from prettytable import PrettyTable
+
+from pyecharts import options as opts
+
+_FACTORIES = {
+    "BarItem": lambda i: opts.BarItem(name=str(i), value=i),
+    "LineItem": lambda i: opts.LineItem(name=str(i), value=i),
+    "ScatterItem": lambda i: opts.ScatterItem(name=str(i), value=[i, i]),
+    "PieItem": lambda i: opts.PieItem(name=str(i), value=i),
+    "CandleStickItem": lambda i: opts.CandleStickItem(name=str(i), value=[i] * 4),
+    "GraphNode": lambda i: opts.GraphNode(name=str(i), symbol_size=i),
+    "GraphLink": lambda i: opts.GraphLink(source=str(i), target=str(i + 1)),
+    "TreeItem": lambda i: opts.TreeItem(name=str(i), value=i),
+    "LabelOpts": lambda i: opts.LabelOpts(),
+    "ItemStyleOpts": lambda i: opts.ItemStyleOpts(color="red"),
+}
+
+
+def _bytes_per_item(factory, count: int) -> float:
+    args = list(range(count))
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = [factory(i) for i in args]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return (after - before) / count
+
+
+def main(count: int):
+    table = PrettyTable(["option", "bytes per instance"])
+    for name, factory in _FACTORIES.items():
+        table.add_row([name, "%.0f" % _bytes_per_item(factory, count)])
+    print(table)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
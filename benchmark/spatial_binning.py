@@ -0,0 +1,51 @@
+"""
+Dump a Geo scatter of random points as they are and binned into a grid or
+hexagons at four zoom levels, comparing the size of the options.
+
+    $ python benchmark/spatial_binning.py 1000000
+"""
+
+import random
+import sys
+import time
+
+from prettytable import PrettyTable
+
+from pyecharts.charts import Geo
+
+
+def _chart(names: list, data_pair: list, coords: list, **kwargs) -> Geo:
+    chart = Geo().add_schema(maptype="china")
+    for name, (lng, lat) in zip(names, coords):
+        chart.add_coordinate(name, lng, lat)
+    return chart.add("points", data_pair, **kwargs)
+
+
+def main(count: int, places: int = 100_000):
+    rng = random.Random(0)
+    names = ["p%d" % i for i in range(places)]
+    coords = [(rng.gauss(113, 6), rng.gauss(32, 5)) for _ in range(places)]
+    data_pair = [(rng.choice(names), rng.randint(1, 100)) for _ in range(count)]
+
+    table = PrettyTable(["series", "items", "options size (MB)", "time (s)"])
+    for label, kwargs in (
+        ("points", {}),
+        ("grid", {"bin_method": "grid"}),
+        ("hexbin", {"bin_method": "hex"}),
+    ):
+        start = time.perf_counter()
+        chart = _chart(names, data_pair, coords, **kwargs)
+        content = chart.dump_options() + "".join(chart.js_functions.items)
+        table.add_row(
+            [
+                label,
+                len(chart.options["series"][0]["data"]),
+                "%.1f" % (len(content) / 2 ** 20),
+                "%.2f" % (time.perf_counter() - start),
+            ]
+        )
+    print(table)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,54 @@
+"""
+Compare the peak memory of rendering a large Page to a file, with the whole
+document built first and with the streaming mode.
+
+    $ python benchmark/stream_render.py 50 20000
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from prettytable import PrettyTable
+
+from pyecharts.charts import Line, Page
+
+
+def _page(charts: int, points: int) -> Page:
+    page = Page()
+    x = list(range(points))
+    for i in range(charts):
+        y = [random.random() for _ in range(points)]
+        page.add(Line().add_xaxis(x).add_yaxis("series%d" % i, y))
+    return page
+
+
+def main(charts: int, points: int):
+    path = os.path.join(tempfile.mkdtemp(), "render.html")
+    table = PrettyTable(["mode", "file (MB)", "peak memory (MB)", "time (s)"])
+    for name, is_stream in (("string", False), ("stream", True)):
+        page = _page(charts, points)
+        tracemalloc.start()
+        start = time.perf_counter()
+        page.render(path, is_stream=is_stream)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        table.add_row(
+            [
+                name,
+                "%.1f" % (os.path.getsize(path) / 1e6),
+                "%.1f" % (peak / 1e6),
+                "%.2f" % elapsed,
+            ]
+        )
+    os.remove(path)
+    print(table)
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*(args or [50, 20_000]))
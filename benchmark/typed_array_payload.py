@@ -0,0 +1,85 @@
+"""
+Compare the plain JSON payload with the typed array payload of a large Line.
+
+Reports bytes on disk, python side render time and, when `node` is available,
+the time the javascript engine takes to parse and decode the chart script.
+
+    $ python benchmark/typed_array_payload.py 1000000
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+from prettytable import PrettyTable
+
+from pyecharts import options as opts
+from pyecharts.charts import Line
+
+_NODE_SCRIPT = """
+global.echarts = {init: function () {
+    return {setOption: function (o) {}};
+}};
+global.document = {getElementById: function () {}};
+global.atob = global.atob || function (s) {
+    return Buffer.from(s, 'base64').toString('binary');
+};
+var script = require('fs').readFileSync(process.argv[2], 'utf8');
+var start = process.hrtime.bigint();
+new Function(script)();
+console.log(Number(process.hrtime.bigint() - start) / 1e6);
+"""
+
+
+def _decode_ms(html: str):
+    node = shutil.which("node")
+    if node is None:
+        return None
+    folder = tempfile.mkdtemp()
+    runner, script = os.path.join(folder, "run.js"), os.path.join(folder, "chart.js")
+    with open(runner, "w") as f:
+        f.write(_NODE_SCRIPT)
+    with open(script, "w") as f:
+        # parse and run the chart script, including the option literal
+        f.write(re.search(r"<script>(.*)</script>", html, re.S).group(1))
+    try:
+        out = subprocess.run(
+            [node, runner, script], capture_output=True, text=True, check=True
+        )
+        return float(out.stdout.strip())
+    finally:
+        shutil.rmtree(folder)
+
+
+def main(points: int):
+    x = np.arange(points)
+    y = np.random.rand(points) * 1000
+    table = PrettyTable(["payload", "bytes", "render (s)", "js decode (ms)"])
+    for name, threshold in (("json", None), ("typed array", 1000)):
+        chart = (
+            Line(opts.InitOpts(typed_array_threshold=threshold))
+            .add_xaxis(x)
+            .add_yaxis("series", y)
+        )
+        start = time.perf_counter()
+        html = chart.render_embed()
+        elapsed = time.perf_counter() - start
+        decode = _decode_ms(html)
+        table.add_row(
+            [
+                name,
+                len(html.encode("utf-8")),
+                "%.3f" % elapsed,
+                "-" if decode is None else "%.1f" % decode,
+            ]
+        )
+    print(table)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -1,44 +1,71 @@
-# basic Charts
-from ..charts.basic_charts.bar import Bar
-from ..charts.basic_charts.bmap import BMap
-from ..charts.basic_charts.boxplot import Boxplot
-from ..charts.basic_charts.calendar import Calendar
-from ..charts.basic_charts.effectscatter import EffectScatter
-from ..charts.basic_charts.funnel import Funnel
-from ..charts.basic_charts.gauge import Gauge
-from ..charts.basic_charts.geo import Geo
-from ..charts.basic_charts.graph import Graph
-from ..charts.basic_charts.heatmap import HeatMap
-from ..charts.basic_charts.kline import Kline
-from ..charts.basic_charts.line import Line
-from ..charts.basic_charts.liquid import Liquid
-from ..charts.basic_charts.map import Map
-from ..charts.basic_charts.parallel import Parallel
-from ..charts.basic_charts.pictorialbar import PictorialBar
-from ..charts.basic_charts.pie import Pie
-from ..charts.basic_charts.polar import Polar
-from ..charts.basic_charts.radar import Radar
-from ..charts.basic_charts.sankey import Sankey
-from ..charts.basic_charts.scatter import Scatter
-from ..charts.basic_charts.sunburst import Sunburst
-from ..charts.basic_charts.themeriver import ThemeRiver
-from ..charts.basic_charts.tree import Tree
-from ..charts.basic_charts.treemap import TreeMap
-from ..charts.basic_charts.wordcloud import WordCloud
-
-# Composite Charts
-from ..charts.composite_charts.grid import Grid
-from ..charts.composite_charts.page import Page
-from ..charts.composite_charts.tab import Tab
-from ..charts.composite_charts.timeline import Timeline
-
-# 3d charts
-from ..charts.three_axis_charts.bar3D import Bar3D
-from ..charts.three_axis_charts.line3D import Line3D
-from ..charts.three_axis_charts.map3D import Map3D
-from ..charts.three_axis_charts.map_globe import MapGlobe
-from ..charts.three_axis_charts.scatter3D import Scatter3D
-from ..charts.three_axis_charts.surface3D import Surface3D
+import importlib
+import sys
+
+# Chart classes are imported on first access (see `__getattr__`), a script
+# which only draws a bar chart does not pay for the import of every chart.
+_CHARTS = {
+    # basic Charts
+    "Bar": ".basic_charts.bar",
+    "BMap": ".basic_charts.bmap",
+    "Boxplot": ".basic_charts.boxplot",
+    "Calendar": ".basic_charts.calendar",
+    "EffectScatter": ".basic_charts.effectscatter",
+    "Funnel": ".basic_charts.funnel",
+    "Gauge": ".basic_charts.gauge",
+    "Geo": ".basic_charts.geo",
+    "Graph": ".basic_charts.graph",
+    "HeatMap": ".basic_charts.heatmap",
+    "Kline": ".basic_charts.kline",
+    "Line": ".basic_charts.line",
+    "Liquid": ".basic_charts.liquid",
+    "Map": ".basic_charts.map",
+    "Parallel": ".basic_charts.parallel",
+    "PictorialBar": ".basic_charts.pictorialbar",
+    "Pie": ".basic_charts.pie",
+    "Polar": ".basic_charts.polar",
+    "Radar": ".basic_charts.radar",
+    "Sankey": ".basic_charts.sankey",
+    "Scatter": ".basic_charts.scatter",
+    "Sunburst": ".basic_charts.sunburst",
+    "ThemeRiver": ".basic_charts.themeriver",
+    "Tree": ".basic_charts.tree",
+    "TreeMap": ".basic_charts.treemap",
+    "WordCloud": ".basic_charts.wordcloud",
+    # Composite Charts
+    "Grid": ".composite_charts.grid",
+    "Page": ".composite_charts.page",
+    "Tab": ".composite_charts.tab",
+    "Timeline": ".composite_charts.timeline",
+    # 3d charts
+    "Bar3D": ".three_axis_charts.bar3D",
+    "Line3D": ".three_axis_charts.line3D",
+    "Map3D": ".three_axis_charts.map3D",
+    "MapGlobe": ".three_axis_charts.map_globe",
+    "Scatter3D": ".three_axis_charts.scatter3D",
+    "Surface3D": ".three_axis_charts.surface3D",
+}
 
 # alias
-Candlestick = Kline
+_ALIASES = {"Candlestick": "Kline"}
+
+__all__ = list(_CHARTS) + list(_ALIASES)
+
+
+def __getattr__(name: str):
+    class_name = _ALIASES.get(name, name)
+    if class_name not in _CHARTS:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    module = importlib.import_module(_CHARTS[class_name], __name__)
+    chart = globals()[name] = getattr(module, class_name)
+    return chart
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+# module `__getattr__` (PEP 562) needs Python 3.7, older ones import every
+# chart class up front
+if sys.version_info < (3, 7):
+    for _name in __all__:
+        __getattr__(_name)
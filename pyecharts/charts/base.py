@@ -1,19 +1,20 @@
 import datetime
 import uuid
 import warnings
-
-import simplejson as json
-from jinja2 import Environment
+from typing import TYPE_CHECKING
 
 from ..commons import utils
 from ..globals import CurrentConfig, RenderType, ThemeType, WarningType
 from ..options import InitOpts
 from ..options.global_options import AnimationOpts
 from ..options.series_options import BasicOpts
-from ..render import engine
+from ..render import encoder, engine, serializer
 from ..types import Optional, Sequence, Union
 from .mixins import ChartMixin
 
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
 
 class Base(ChartMixin):
     """
@@ -32,6 +33,8 @@ class Base(ChartMixin):
         self.page_title = _opts.get("page_title", CurrentConfig.PAGE_TITLE)
         self.theme = _opts.get("theme", ThemeType.WHITE)
         self.chart_id = _opts.get("chart_id") or uuid.uuid4().hex
+        self.typed_array_threshold = _opts.get("typed_array_threshold")
+        self.json_backend = _opts.get("json_backend")
 
         self.options: dict = {}
         self.js_host: str = _opts.get("js_host") or CurrentConfig.ONLINE_HOST
@@ -40,34 +43,61 @@ class Base(ChartMixin):
         self.options.update(backgroundColor=_opts.get("bg_color"))
         self.options.update(_opts.get("animationOpts", AnimationOpts()).opts)
         self._is_geo_chart: bool = False
+        # opt-in: a cache only sees changes the chart methods announce, and
+        # those made to the first levels of the options
+        self._fragments = None
+        if _opts.get("is_fragment_cache"):
+            self._fragments = encoder.FragmentCache()
 
     def get_options(self) -> dict:
         return utils.remove_key_with_none_value(self.options)
 
     def dump_options(self) -> str:
-        return utils.replace_placeholder(
-            json.dumps(self.get_options(), indent=4, default=default, ignore_nan=True)
+        backend = self._serializer()
+        if self._fragments is not None and isinstance(
+            backend, serializer.BuiltinSerializer
+        ):
+            return self._fragments.compile(
+                self.options, typed_array_threshold=self.typed_array_threshold
+            )
+        return backend.dumps(
+            self.options, typed_array_threshold=self.typed_array_threshold
         )
 
+    def invalidate_options(self, *keys):
+        """
+        Mark top-level options as changed so that the next dump compiles
+        them again, all of them when no key is given. Only needed after
+        changing nested values of `self.options` by hand, on charts created
+        with `InitOpts(is_fragment_cache=True)`.
+        """
+        if self._fragments is not None:
+            self._fragments.invalidate(*keys)
+        return self
+
     def dump_options_with_quotes(self) -> str:
-        return utils.replace_placeholder_with_quotes(
-            json.dumps(self.get_options(), indent=4, default=default, ignore_nan=True)
+        return self._serializer().dumps(self.options, with_quotes=True)
+
+    def _serializer(self) -> serializer.Serializer:
+        return serializer.get_serializer(
+            self.json_backend or CurrentConfig.JSON_BACKEND
         )
 
     def render(
         self,
         path: str = "render.html",
         template_name: str = "simple_chart.html",
-        env: Optional[Environment] = None,
+        env: Optional["Environment"] = None,
+        is_stream: bool = False,
         **kwargs,
     ) -> str:
         self._prepare_render()
-        return engine.render(self, path, template_name, env, **kwargs)
+        return engine.render(self, path, template_name, env, is_stream, **kwargs)
 
     def render_embed(
         self,
         template_name: str = "simple_chart.html",
-        env: Optional[Environment] = None,
+        env: Optional["Environment"] = None,
         **kwargs,
     ) -> str:
         self._prepare_render()
@@ -93,9 +123,7 @@ def default(o):
     if isinstance(o, (datetime.date, datetime.datetime)):
         return o.isoformat()
     if isinstance(o, utils.JsCode):
-        return (
-            o.replace("\\n|\\t", "").replace(r"\\n", "\n").replace(r"\\t", "\t").js_code
-        )
+        return utils.JS_CODES.token(o)
     if isinstance(o, BasicOpts):
         if isinstance(o.opts, Sequence):
             return [utils.remove_key_with_none_value(item) for item in o.opts]
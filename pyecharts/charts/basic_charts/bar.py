@@ -1,6 +1,7 @@
 from ... import options as opts
 from ... import types
 from ...charts.chart import RectChart
+from ...commons import pyramid
 from ...globals import ChartType
 
 
@@ -15,7 +16,10 @@ class Bar(RectChart):
     def add_yaxis(
         self,
         series_name: str,
-        y_axis: types.Sequence[types.Union[types.Numeric, opts.BarItem, dict]],
+        y_axis: types.Union[
+            types.Sequence[types.Union[types.Numeric, opts.BarItem, dict]],
+            opts.BarItems,
+        ],
         *,
         is_selected: bool = True,
         xaxis_index: types.Optional[types.Numeric] = None,
@@ -51,6 +55,8 @@ class Bar(RectChart):
 
         if self.options.get("dataset") is not None:
             y_axis = None
+        else:
+            y_axis = self._lod_data(series_name, y_axis, pyramid.POINTS) or y_axis
 
         self.options.get("series").append(
             {
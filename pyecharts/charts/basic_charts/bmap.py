@@ -2,7 +2,6 @@ from ... import options as opts
 from ... import types
 from ...charts.basic_charts.geo import GeoChartBase
 from ...commons.utils import OrderedSet
-from ...exceptions import NonexistentCoordinatesException
 from ...globals import ChartType
 
 BAIDU_MAP_API = "https://api.map.baidu.com/api?v=2.0&ak={}"
@@ -20,8 +19,11 @@ class BMap(GeoChartBase):
         self,
         init_opts: types.Init = opts.InitOpts(),
         is_ignore_nonexistent_coord: bool = False,
+        max_added_coordinates: types.Optional[int] = None,
     ):
-        super().__init__(init_opts=init_opts)
+        super().__init__(
+            init_opts=init_opts, max_added_coordinates=max_added_coordinates
+        )
         self.js_dependencies.add("bmap")
         self._is_geo_chart = True
         self._coordinate_system: types.Optional[str] = "bmap"
@@ -29,19 +31,19 @@ class BMap(GeoChartBase):
         self._is_ignore_nonexistent_coord = is_ignore_nonexistent_coord
 
     def _feed_data(self, data_pair: types.Sequence, type_: str) -> types.Sequence:
-        result = []
         type_list = [ChartType.LINES, ChartType.CUSTOM]
         if type_ in type_list:
-            result = data_pair
-        else:
-            for n, v in data_pair:
-                try:
-                    lng, lat = self.get_coordinate(n)
-                    result.append({"name": n, "value": [lng, lat, v]})
-                except TypeError as err:
-                    if self._is_ignore_nonexistent_coord is not True:
-                        raise NonexistentCoordinatesException(err, (n, v))
-        return result
+            return data_pair
+        return self._feed_points(data_pair)
+
+    def _aggregate_flows(
+        self, data_pair: types.Sequence, method: str, top_k: types.Optional[int]
+    ) -> types.Sequence:
+        # dict flows keep their polyline coords and other fields
+        return [
+            f if isinstance(f, dict) else {"coords": [f[0], f[1]], "value": f[2]}
+            for f in super()._aggregate_flows(data_pair, method, top_k)
+        ]
 
     def add_schema(
         self,
@@ -1,6 +1,7 @@
 from ... import options as opts
 from ... import types
 from ...charts.chart import RectChart
+from ...commons import quantiles
 from ...globals import ChartType
 
 
@@ -44,25 +45,62 @@ class Boxplot(RectChart):
         )
         return self
 
+    def add_outliers(
+        self,
+        series_name: str,
+        outliers: types.Sequence,
+        *,
+        xaxis_index: types.Optional[types.Numeric] = None,
+        yaxis_index: types.Optional[types.Numeric] = None,
+        symbol_size: types.Numeric = 6,
+        tooltip_opts: types.Tooltip = None,
+        itemstyle_opts: types.ItemStyle = None,
+    ):
+        """
+        Add the `[group index, value]` outliers of `prepare_outliers` as a
+        scatter series drawn over the boxes.
+        """
+        self.options.get("series").append(
+            {
+                "type": ChartType.SCATTER,
+                "name": series_name,
+                "xAxisIndex": xaxis_index,
+                "yAxisIndex": yaxis_index,
+                "symbolSize": symbol_size,
+                "data": outliers,
+                "tooltip": tooltip_opts,
+                "itemStyle": itemstyle_opts,
+            }
+        )
+        return self
+
+    @staticmethod
+    def prepare_data(
+        items,
+        whisker: types.Optional[types.Numeric] = None,
+        sketch_size: types.Optional[int] = None,
+    ):
+        """
+        Return the `[low, Q1, median, Q3, high]` box of every group of
+        samples, see `pyecharts.commons.quantiles.box_stats`.
+
+        :param items: The groups of samples, or a 2d array of one per row.
+        :param whisker: Whiskers stop at the last samples within `whisker`
+                        times the interquartile range, 1.5 for Tukey's fences.
+                        By default they go to the lowest and highest samples.
+        :param sketch_size: Read the groups once, as iterators, into KLL
+                            sketches of this size for approximate quartiles.
+        """
+        if sketch_size is not None:
+            return quantiles.sketch_stats(items, whisker, sketch_size)
+        boxes, _ = quantiles.box_stats(items, whisker)
+        return boxes
+
     @staticmethod
-    def prepare_data(items):
-        data = []
-        for item in items:
-            try:
-                d, res = sorted(item), []
-                for i in range(1, 4):
-                    n = i * (len(d) + 1) / 4
-                    k = int(n)
-                    m = n - k
-                    if m == 0:
-                        res.append(d[k - 1])
-                    elif m == 1 / 4:
-                        res.append(d[k - 1] * 0.75 + d[k] * 0.25)
-                    elif m == 1 / 2:
-                        res.append(d[k - 1] * 0.50 + d[k] * 0.50)
-                    elif m == 3 / 4:
-                        res.append(d[k - 1] * 0.25 + d[k] * 0.75)
-                data.append([d[0]] + res + [d[-1]])
-            except Exception:
-                pass
-        return data
+    def prepare_outliers(items, whisker: types.Numeric = 1.5):
+        """
+        Return the `[group index, value]` samples beyond the whiskers of
+        `prepare_data(items, whisker)`, for `add_outliers`.
+        """
+        _, outliers = quantiles.box_stats(items, whisker)
+        return outliers
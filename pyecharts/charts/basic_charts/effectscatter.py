@@ -1,6 +1,7 @@
 from ... import options as opts
 from ... import types
 from ...charts.chart import RectChart
+from ...commons import utils
 from ...globals import ChartType
 
 
@@ -31,7 +32,9 @@ class EffectScatter(RectChart):
         self._append_color(color)
         self._append_legend(series_name, is_selected)
 
-        if all([isinstance(d, opts.EffectScatterItem) for d in y_axis]):
+        if utils.is_ndarray(y_axis):
+            y_axis = utils.zip_columns(self._xaxis_data, y_axis)
+        elif all([isinstance(d, opts.EffectScatterItem) for d in y_axis]):
             y_axis = y_axis
         else:
             y_axis = [list(z) for z in zip(self._xaxis_data, y_axis)]
@@ -40,6 +40,7 @@ class Funnel(Chart):
 
         _dset = set(self.options.get("legend")[0].get("data"))
         self.options.get("legend")[0].update(data=list(_dset))
+        self.invalidate_options("legend")
 
         self.options.get("series").append(
             {
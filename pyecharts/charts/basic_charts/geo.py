@@ -1,26 +1,62 @@
+import collections
+
 import simplejson as json
 
+from ... import datasets
 from ... import options as opts
 from ... import types
+from ...commons import binning, flows, utils
 from ...charts.chart import Chart
-from ...datasets import COORDINATES
 from ...exceptions import NonexistentCoordinatesException
 from ...globals import ChartType
 
 
+_BINNABLE_TYPES = (ChartType.SCATTER, ChartType.EFFECT_SCATTER, ChartType.HEATMAP)
+
+# swaps the bins of a series for finer ones as the map is zoomed in
+_BIN_ZOOM_SWITCH = """
+(function (chart) {{
+    var levels = {levels};
+    var zoomLevels = {zoom_levels};
+    var current = 0;
+    chart.on('georoam', function () {{
+        var zoom = chart.getOption().geo[0].zoom || 1;
+        var level = 0;
+        for (var i = 1; i < levels.length; i++) {{
+            if (zoom >= zoomLevels[i]) level = i;
+        }}
+        if (level !== current) {{
+            current = level;
+            chart.setOption({{series: [{{id: {series_id}, data: levels[level]}}]}});
+        }}
+    }});
+}})({{chart}});
+"""
+
+
 class GeoChartBase(Chart):
-    def __init__(self, init_opts: types.Init = opts.InitOpts()):
+    def __init__(
+        self,
+        init_opts: types.Init = opts.InitOpts(),
+        max_added_coordinates: types.Optional[int] = None,
+    ):
         super().__init__(init_opts=init_opts)
         self.set_global_opts()
-        self._coordinates = COORDINATES
+        # coordinates added to this chart never reach the shared COORDINATES
+        self._coordinates = datasets.CoordinateOverlay(
+            datasets.COORDINATES, max_size=max_added_coordinates
+        )
         self._zlevel = 1
         self._coordinate_system: types.Optional[str] = None
         self._chart_type = ChartType.GEO
+        self._is_ignore_nonexistent_coord = False
+        # name -> number of data items dropped for lack of coordinates
+        self.coordinate_misses: collections.Counter = collections.Counter()
 
     def add_coordinate(
         self, name: str, longitude: types.Numeric, latitude: types.Numeric
     ):
-        self._coordinates.update({name: [longitude, latitude]})
+        self._coordinates.add(name, [longitude, latitude])
         return self
 
     def add_coordinate_json(self, json_file: str):
@@ -31,8 +67,108 @@ class GeoChartBase(Chart):
         return self
 
     def get_coordinate(self, name: str) -> types.Optional[types.Sequence]:
-        if name in self._coordinates:
-            return self._coordinates[name]
+        # exact names first, coordinate stores are never matched fuzzily
+        coordinate = self._coordinates.get_exact(name)
+        if coordinate is not None:
+            return coordinate
+        for store in datasets.COORDINATE_STORES:
+            coordinate = store.get(name)
+            if coordinate is not None:
+                return coordinate
+        return self._coordinates.search(name)
+
+    def get_coordinates(
+        self, names: types.Iterable
+    ) -> types.Tuple[dict, types.List[str]]:
+        """
+        Look many names up at once, every distinct name is only resolved once.
+
+        Return the coordinates of the names found, by name, and the names
+        which have no coordinate.
+        """
+        coordinates, misses = {}, []
+        for name in dict.fromkeys(names):
+            coordinate = self.get_coordinate(name)
+            if coordinate is None:
+                misses.append(name)
+            else:
+                coordinates[name] = coordinate
+        return coordinates, misses
+
+    def _feed_points(
+        self, data_pair: types.Sequence, is_lines: bool = False
+    ) -> types.Sequence:
+        # data pairs are read twice, once for their names then for the items
+        data_pair = list(data_pair)
+        if is_lines:
+            names = (x for item in data_pair for x in item[:2])
+        else:
+            names = (n for n, _ in data_pair)
+        coordinates, misses = self.get_coordinates(names)
+        if misses:
+            missing = set(misses)
+            if is_lines:
+                pairs = [
+                    item
+                    for item in data_pair
+                    if item[0] in missing or item[1] in missing
+                ]
+                names = (x for item in pairs for x in item[:2] if x in missing)
+            else:
+                pairs = [(n, v) for n, v in data_pair if n in missing]
+                names = (n for n, _ in pairs)
+            if self._is_ignore_nonexistent_coord is not True:
+                raise NonexistentCoordinatesException(
+                    "no coordinate for {} names: {}".format(len(misses), misses[:10]),
+                    pairs[0],
+                )
+            self.coordinate_misses.update(names)
+
+        get = coordinates.get
+        result = []
+        if is_lines:
+            for item in data_pair:
+                n, v = item[0], item[1]
+                f, t = get(n), get(v)
+                if f is not None and t is not None:
+                    line = {"name": "{}->{}".format(n, v), "coords": [f, t]}
+                    if len(item) > 2:
+                        line["value"] = item[2]
+                    result.append(line)
+        else:
+            for n, v in data_pair:
+                coordinate = get(n)
+                if coordinate is not None:
+                    lng, lat = coordinate
+                    result.append({"name": n, "value": [lng, lat, v]})
+        return result
+
+    def _aggregate_flows(
+        self, data_pair: types.Sequence, method: str, top_k: types.Optional[int]
+    ) -> types.Sequence:
+        return flows.aggregate_flows(data_pair, method, top_k)
+
+    def _bin_points(
+        self,
+        series_id: str,
+        data: types.Sequence,
+        method: str,
+        sizes: types.Sequence[types.Numeric],
+        aggregate: str,
+        zoom_levels: types.Optional[types.Sequence[types.Numeric]],
+        is_zoom_switch: bool,
+    ) -> types.Sequence:
+        levels = binning.bin_levels([d["value"] for d in data], sizes, method, aggregate)
+        if is_zoom_switch and len(levels) > 1 and self._coordinate_system == "geo":
+            if zoom_levels is None:
+                zoom_levels = [2 ** i for i in range(len(levels))]
+            js_code = _BIN_ZOOM_SWITCH.format(
+                series_id=json.dumps(series_id),
+                levels=json.dumps(levels),
+                zoom_levels=json.dumps(list(zoom_levels)),
+            )
+            self.add_js_funcs(utils.ChartJsCode(self, js_code))
+        return levels[0]
 
     def add(
         self,
@@ -58,9 +194,39 @@ class GeoChartBase(Chart):
         itemstyle_opts: types.ItemStyle = None,
         render_item: types.JsCode = None,
         encode: types.Union[types.JsCode, dict] = None,
+        flow_aggregate: types.Optional[str] = None,
+        flow_top_k: types.Optional[int] = None,
+        flow_width_range: types.Optional[types.Sequence] = None,
+        bin_method: types.Optional[str] = None,
+        bin_sizes: types.Sequence[types.Numeric] = (2, 1, 0.5, 0.25),
+        bin_aggregate: str = "count",
+        bin_zoom_levels: types.Optional[types.Sequence[types.Numeric]] = None,
+        is_bin_zoom_switch: bool = True,
     ):
+        if flow_top_k is not None and flow_aggregate is None:
+            raise ValueError("flow_top_k needs flow_aggregate to be set")
         self._zlevel += 1
+        is_aggregated = type_ == ChartType.LINES and flow_aggregate is not None
+        if is_aggregated:
+            # identical routes are drawn once, with their weight as `value`
+            data_pair = self._aggregate_flows(data_pair, flow_aggregate, flow_top_k)
         data = self._feed_data(data_pair, type_)
+        if is_aggregated and flow_width_range is not None:
+            data = flows.scale_flow_widths(data, flow_width_range)
+        series_id = None
+        if bin_method is not None and type_ in _BINNABLE_TYPES:
+            # one item per bin of the coarsest level instead of one per point.
+            # Series of a legend group share their name, not their id
+            series_id = "{}_{}".format(self.chart_id, len(self.options.get("series")))
+            data = self._bin_points(
+                series_id,
+                data,
+                bin_method,
+                bin_sizes,
+                bin_aggregate,
+                bin_zoom_levels,
+                is_bin_zoom_switch,
+            )
 
         self._append_color(color)
         self._append_legend(series_name, is_selected)
@@ -69,6 +235,7 @@ class GeoChartBase(Chart):
             self.options.get("series").append(
                 {
                     "type": type_,
+                    "id": series_id,
                     "name": series_name,
                     "coordinateSystem": self._coordinate_system,
                     "symbol": symbol,
@@ -84,6 +251,7 @@ class GeoChartBase(Chart):
             self.options.get("series").append(
                 {
                     "type": type_,
+                    "id": series_id,
                     "name": series_name,
                     "coordinateSystem": self._coordinate_system,
                     "showEffectOn": "render",
@@ -101,6 +269,7 @@ class GeoChartBase(Chart):
             self.options.get("series").append(
                 {
                     "type": type_,
+                    "id": series_id,
                     "name": series_name,
                     "coordinateSystem": self._coordinate_system,
                     "data": data,
@@ -159,25 +328,16 @@ class Geo(GeoChartBase):
         self,
         init_opts: types.Init = opts.InitOpts(),
         is_ignore_nonexistent_coord: bool = False,
+        max_added_coordinates: types.Optional[int] = None,
     ):
-        super().__init__(init_opts=init_opts)
+        super().__init__(
+            init_opts=init_opts, max_added_coordinates=max_added_coordinates
+        )
         self._coordinate_system: types.Optional[str] = "geo"
         self._is_ignore_nonexistent_coord = is_ignore_nonexistent_coord
 
     def _feed_data(self, data_pair: types.Sequence, type_: str) -> types.Sequence:
-        result = []
-        for n, v in data_pair:
-            try:
-                if type_ == ChartType.LINES:
-                    f, t = self.get_coordinate(n), self.get_coordinate(v)
-                    result.append({"name": "{}->{}".format(n, v), "coords": [f, t]})
-                else:
-                    lng, lat = self.get_coordinate(n)
-                    result.append({"name": n, "value": [lng, lat, v]})
-            except TypeError as err:
-                if self._is_ignore_nonexistent_coord is not True:
-                    raise NonexistentCoordinatesException(err, (n, v))
-        return result
+        return self._feed_points(data_pair, is_lines=type_ == ChartType.LINES)
 
     def add_schema(
         self,
@@ -1,6 +1,7 @@
 from ... import options as opts
 from ... import types
 from ...charts.chart import RectChart
+from ...commons import binning
 from ...globals import ChartType
 
 
@@ -16,6 +17,8 @@ class HeatMap(RectChart):
     def __init__(self, init_opts: types.Init = opts.InitOpts()):
         super().__init__(init_opts=init_opts)
         self.set_global_opts(visualmap_opts=opts.VisualMapOpts(orient="horizontal"))
+        # the lowest and highest values of the cells of `add_binned` series
+        self._cell_range = None
 
     def add_yaxis(
         self,
@@ -34,6 +37,7 @@ class HeatMap(RectChart):
     ):
         self._append_legend(series_name, is_selected)
         self.options.get("yAxis")[0].update(data=yaxis_data)
+        self.invalidate_options("yAxis")
         self.options.get("series").append(
             {
                 "type": ChartType.HEATMAP,
@@ -49,3 +53,65 @@ class HeatMap(RectChart):
             }
         )
         return self
+
+    def add_binned(
+        self,
+        series_name: str,
+        x_values: types.Sequence,
+        y_values: types.Sequence,
+        *,
+        weights: types.Optional[types.Sequence] = None,
+        x_bins: types.Union[int, types.Sequence, None] = None,
+        y_bins: types.Union[int, types.Sequence, None] = None,
+        aggregate: str = "count",
+        is_visualmap_range: bool = True,
+        **kwargs,
+    ):
+        """
+        Bin events into the cells of the heat map and add the cells holding
+        events as a series, see `pyecharts.commons.binning.axis_bins` and
+        `count_cells`. Both axes get the labels of their bins.
+
+        :param x_values: The x value of every event.
+        :param y_values: The y value of every event.
+        :param weights: The weight of every event, for `sum` and `mean`.
+        :param x_bins: None to bin by category, in the order of the x axis
+                       data when it is set already, a number of bins of the
+                       same width, or the edges of the bins.
+        :param y_bins: The same for the y axis.
+        :param aggregate: `count`, `sum` or `mean`.
+        :param is_visualmap_range: Set the min and max of the visual map to
+                                   the range of the cell values. Visual map
+                                   options set afterwards replace it.
+        Other keyword arguments go to `add_yaxis`.
+        """
+        x_categories = getattr(self, "_xaxis_data", None) if x_bins is None else None
+        y_categories = self.options["yAxis"][0].get("data") if y_bins is None else None
+        x_index, x_labels = binning.axis_bins(x_values, x_bins, x_categories)
+        y_index, y_labels = binning.axis_bins(y_values, y_bins, y_categories)
+        cells, value_range = binning.count_cells(
+            x_index, y_index, (len(x_labels), len(y_labels)), weights, aggregate
+        )
+        if is_visualmap_range and value_range is not None:
+            self._set_visualmap_range(*value_range)
+        self.add_xaxis(x_labels)
+        return self.add_yaxis(series_name, y_labels, cells, **kwargs)
+
+    def _set_visualmap_range(self, low: types.Numeric, high: types.Numeric):
+        if self._cell_range is not None:
+            low, high = min(low, self._cell_range[0]), max(high, self._cell_range[1])
+        self._cell_range = (low, high)
+        visualmap = self.options.get("visualMap") or {}
+        if isinstance(visualmap, opts.VisualMapOpts):
+            visualmap = visualmap.opts
+        # updated on a copy, visual map options may be shared between charts
+        if isinstance(visualmap, (list, tuple)):
+            # of several visual maps, the first one maps the cells
+            first = visualmap[0] if visualmap else {}
+            if isinstance(first, opts.VisualMapOpts):
+                first = first.opts
+            visualmap = [dict(first, min=low, max=high)] + list(visualmap[1:])
+        else:
+            visualmap = dict(visualmap, min=low, max=high)
+        self.options["visualMap"] = visualmap
+        self.invalidate_options("visualMap")
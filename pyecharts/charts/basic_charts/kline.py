@@ -1,8 +1,12 @@
 from ... import options as opts
 from ... import types
 from ...charts.chart import RectChart
+from ...commons import pyramid, resample
 from ...globals import ChartType
 
+# the narrowest candlestick `Kline.add_ticks` draws, in pixels
+_MIN_BAR_PIXELS = 4
+
 
 class Kline(RectChart):
     """
@@ -35,6 +39,7 @@ class Kline(RectChart):
         itemstyle_opts: types.ItemStyle = None,
     ):
         self._append_legend(series_name, is_selected)
+        y_axis = self._lod_data(series_name, y_axis, pyramid.OHLC) or y_axis
         self.options.get("series").append(
             {
                 "type": ChartType.KLINE,
@@ -49,3 +54,37 @@ class Kline(RectChart):
             }
         )
         return self
+
+    def add_ticks(
+        self,
+        series_name: str,
+        timestamps: types.Sequence,
+        prices: types.Sequence,
+        interval: resample.Interval,
+        *,
+        volumes: types.Optional[types.Sequence] = None,
+        origin: types.Numeric = 0,
+        max_bars: types.Optional[int] = None,
+        **kwargs,
+    ):
+        """
+        Aggregate trades into OHLC bars of `interval`, see
+        `pyecharts.commons.resample.resample_ohlc`, and add them as the x axis
+        and a series. Bars are merged into bars of a multiple of `interval`
+        when more than `max_bars` of them would be drawn, by default as many
+        as fit in the chart width. Volumes, when given, are the fifth value of
+        every bar. Other keyword arguments go to `add_yaxis`.
+        """
+        interval = resample._interval(interval)
+        if max_bars is None:
+            max_bars = max(1, self._pixel_width() // _MIN_BAR_PIXELS)
+        bars = resample.resample_ohlc(timestamps, prices, interval, volumes, origin)
+        bars, interval = resample.rebucket(bars, interval, max_bars, origin)
+
+        _, axis_type = pyramid.axis_values(timestamps[:1])
+        is_time = axis_type == "time"
+        self.add_xaxis(resample.bar_labels(bars.starts, interval, is_time))
+        y_axis = bars.rows
+        if volumes is not None:
+            y_axis = [row + [v] for row, v in zip(bars.rows, bars.volumes)]
+        return self.add_yaxis(series_name, y_axis, **kwargs)
@@ -1,6 +1,7 @@
 from ... import options as opts
 from ... import types
 from ...charts.chart import RectChart
+from ...commons import pyramid, utils
 from ...globals import ChartType
 
 
@@ -43,12 +44,18 @@ class Line(RectChart):
         self._append_color(color)
         self._append_legend(series_name, is_selected)
 
-        if all([isinstance(d, opts.LineItem) for d in y_axis]):
+        lod_data = self._lod_data(series_name, y_axis, pyramid.POINTS)
+        xaxis_data, y_axis = self._downsample(y_axis)
+        if lod_data is not None:
+            data = lod_data
+        elif utils.is_ndarray(y_axis):
+            data = utils.zip_columns(xaxis_data, y_axis)
+        elif all([isinstance(d, opts.LineItem) for d in y_axis]):
             data = y_axis
         else:
             # 合并 x 和 y 轴数据，避免当 X 轴的类型设置为 'value' 的时候，
             # X、Y 轴均显示 Y 轴数据
-            data = [list(z) for z in zip(self._xaxis_data, y_axis)]
+            data = [list(z) for z in zip(xaxis_data, y_axis)]
 
         self.options.get("series").append(
             {
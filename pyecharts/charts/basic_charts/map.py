@@ -14,7 +14,10 @@ class MapMixin:
     def add(
         self,
         series_name: str,
-        data_pair: types.Sequence[types.Union[types.Sequence, opts.MapItem, dict]],
+        data_pair: types.Union[
+            types.Sequence[types.Union[types.Sequence, opts.MapItem, dict]],
+            opts.MapItems,
+        ],
         maptype: str = "china",
         *,
         is_selected: bool = True,
@@ -41,7 +44,9 @@ class MapMixin:
     ):
         self.js_dependencies.add(maptype)
 
-        if isinstance(data_pair[0], opts.MapItem):
+        if isinstance(data_pair, opts.BatchItems):
+            data = data_pair
+        elif isinstance(data_pair[0], opts.MapItem):
             data = data_pair
         else:
             data = [{"name": n, "value": v} for n, v in data_pair]
@@ -16,7 +16,10 @@ class Pie(Chart):
     def add(
         self,
         series_name: str,
-        data_pair: types.Sequence[types.Union[types.Sequence, opts.PieItem, dict]],
+        data_pair: types.Union[
+            types.Sequence[types.Union[types.Sequence, opts.PieItem, dict]],
+            opts.PieItems,
+        ],
         *,
         color: types.Optional[str] = None,
         radius: types.Optional[types.Sequence] = None,
@@ -34,6 +37,8 @@ class Pie(Chart):
             self.options.get("legend")[0].update(
                 data=[d[0] for d in self.options.get("dataset").get("source")][1:]
             )
+        elif isinstance(data_pair, opts.BatchItems):
+            data = data_pair
         elif isinstance(data_pair[0], opts.PieItem):
             data = data_pair
         else:
@@ -47,6 +52,8 @@ class Pie(Chart):
             _dset.sort(key=_dlst.index)
             self.options.get("legend")[0].update(data=list(_dset))
 
+        self.invalidate_options("legend")
+
         if not radius:
             radius = ["0%", "75%"]
         if not center:
@@ -1,6 +1,7 @@
 from ... import options as opts
 from ... import types
 from ...charts.chart import Chart
+from ...commons import flows
 from ...globals import ChartType
 
 
@@ -36,9 +37,20 @@ class Sankey(Chart):
         linestyle_opt: types.LineStyle = opts.LineStyleOpts(),
         tooltip_opts: types.Tooltip = None,
         itemstyle_opts: types.ItemStyle = None,
+        link_aggregate: types.Optional[str] = None,
+        link_top_k: types.Optional[int] = None,
     ):
         if layout_iterations < 32:
             layout_iterations = 32
+        if link_top_k is not None and link_aggregate is None:
+            raise ValueError("link_top_k needs link_aggregate to be set")
+        if link_aggregate is not None:
+            links = [
+                f
+                if isinstance(f, dict)
+                else {"source": f[0], "target": f[1], "value": f[2]}
+                for f in flows.aggregate_flows(links, link_aggregate, link_top_k)
+            ]
 
         self._append_legend(series_name, is_selected)
         self.options.get("series").append(
@@ -3,6 +3,7 @@ import itertools
 from ... import options as opts
 from ... import types
 from ...charts.chart import RectChart
+from ...commons import utils
 from ...globals import ChartType
 
 
@@ -17,26 +18,36 @@ class Scatter(RectChart):
     """
 
     def _parse_data(
-        self, y_axis: types.Sequence[types.Union[opts.ScatterItem, dict]]
+        self,
+        y_axis: types.Union[
+            types.Sequence[types.Union[opts.ScatterItem, dict]], opts.ScatterItems
+        ],
     ) -> types.Optional[types.Sequence]:
         if self.options.get("dataset") is not None:
             return None
-        elif len(self._xaxis_data) == 0:
+        xaxis_data, y_axis = self._downsample(y_axis)
+        if len(xaxis_data) == 0:
+            return y_axis
+        elif isinstance(y_axis, opts.BatchItems):
             return y_axis
+        elif utils.is_ndarray(y_axis):
+            return utils.zip_columns(xaxis_data, y_axis)
         elif isinstance(y_axis[0], (opts.ScatterItem, dict)):
             return y_axis
         elif isinstance(y_axis[0], types.Sequence):
             return [
                 list(itertools.chain(list([x]), y))
-                for x, y in zip(self._xaxis_data, y_axis)
+                for x, y in zip(xaxis_data, y_axis)
             ]
         else:
-            return [list(z) for z in zip(self._xaxis_data, y_axis)]
+            return [list(z) for z in zip(xaxis_data, y_axis)]
 
     def add_yaxis(
         self,
         series_name: str,
-        y_axis: types.Sequence[types.Union[opts.ScatterItem, dict]],
+        y_axis: types.Union[
+            types.Sequence[types.Union[opts.ScatterItem, dict]], opts.ScatterItems
+        ],
         *,
         is_selected: bool = True,
         xaxis_index: types.Optional[types.Numeric] = None,
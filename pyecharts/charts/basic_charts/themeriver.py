@@ -40,4 +40,5 @@ class ThemeRiver(Chart):
 
         self.options.update(singleAxis=singleaxis_opts)
         self.options.get("tooltip").update(trigger="axis")
+        self.invalidate_options("tooltip")
         return self
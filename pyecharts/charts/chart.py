@@ -1,6 +1,12 @@
+import os
+import re
+
+import simplejson as json
+
 from .. import options as opts
 from .. import types
 from ..charts.base import Base
+from ..commons import downsample, pyramid, utils
 from ..globals import RenderType, ThemeType, ToolTipFormatterType
 from ..types import Optional, Sequence
 
@@ -28,6 +34,7 @@ class Chart(Base):
 
     def set_colors(self, colors: Sequence[str]):
         self.options.update(color=colors)
+        self.invalidate_options("color")
         return self
 
     def set_series_opts(
@@ -82,17 +89,20 @@ class Chart(Base):
             if len(kwargs) > 0:
                 s.update(kwargs)
 
+        self.invalidate_options("series")
         return self
 
     def _append_legend(self, name, is_selected):
         self.options.get("legend")[0].get("data").append(name)
         self.options.get("legend")[0].get("selected").update({name: is_selected})
+        self.invalidate_options("legend")
 
     def _append_color(self, color: Optional[str]):
         if color:
             self.colors = [color] + self.colors
             if self.theme == ThemeType.WHITE:
                 self.options.update(color=self.colors)
+                self.invalidate_options("color")
 
     def set_global_opts(
         self,
@@ -140,6 +150,19 @@ class Chart(Base):
                 yaxis_opts = yaxis_opts.opts
             self.options["yAxis"][0].update(yaxis_opts)
 
+        self.invalidate_options(
+            "title",
+            "toolbox",
+            "tooltip",
+            "visualMap",
+            "dataZoom",
+            "graphic",
+            "axisPointer",
+            "brush",
+            "legend",
+            "xAxis",
+            "yAxis",
+        )
         return self
 
     def add_dataset(
@@ -148,6 +171,10 @@ class Chart(Base):
         dimensions: types.Optional[types.Sequence] = None,
         source_header: types.Optional[bool] = None,
     ):
+        if utils.is_ndarray(source) and getattr(source, "columns", None) is not None:
+            # DataFrame, dump it as a keyed-column source so that every column
+            # is formatted straight from its buffer.
+            source = {str(name): column for name, column in source.items()}
         self.options.update(
             dataset={
                 "source": source,
@@ -158,10 +185,131 @@ class Chart(Base):
         return self
 
 
+# the width downsampling is tied to when the chart width is not in pixels
+_DEFAULT_SAMPLING_WIDTH = 1920
+
+
+# fetches the chunks of the pyramid level which fits the zoomed window
+_LOD_FETCH = """
+(function (chart) {{
+    var url = {url}, name = {name}, threshold = {threshold};
+    var xMin = {x_min}, xMax = {x_max};
+    var index = null, request = 0, timer = null;
+    function fetchJson(path) {{
+        return fetch(url + path).then(function (r) {{ return r.json(); }});
+    }}
+    function visible(chunks, low, high) {{
+        var result = [];
+        for (var i = 0; i < chunks.length; i++) {{
+            if (chunks[i][1] >= low && chunks[i][0] <= high) result.push(i);
+        }}
+        return result;
+    }}
+    function update() {{
+        var zoom = chart.getOption().dataZoom[0];
+        var low = xMin + (xMax - xMin) * zoom.start / 100;
+        var high = xMin + (xMax - xMin) * zoom.end / 100;
+        var levels = index.levels, level = levels.length - 1;
+        for (var k = 0; k < levels.length; k++) {{
+            var count = 0;
+            visible(levels[k].chunks, low, high).forEach(function (i) {{
+                count += levels[k].chunks[i][2];
+            }});
+            if (count <= 2 * threshold) {{ level = k; break; }}
+        }}
+        var current = ++request;
+        var chunks = visible(levels[level].chunks, low, high);
+        Promise.all(chunks.map(function (i) {{
+            return fetchJson(level + '/' + i + '.json');
+        }})).then(function (parts) {{
+            if (current !== request) return;
+            var data = [].concat.apply([], parts);
+            chart.setOption({{series: [{{name: name, data: data}}]}});
+        }});
+    }}
+    chart.on('datazoom', function () {{
+        clearTimeout(timer);
+        timer = setTimeout(function () {{
+            if (index) return update();
+            fetchJson('index.json').then(function (i) {{ index = i; update(); }});
+        }}, 100);
+    }});
+}})({{chart}});
+"""
+
+
+def _take(values: Sequence, indices: Sequence[int]) -> Sequence:
+    if utils.is_ndarray(values):
+        return utils.as_ndarray(values)[indices]
+    return [values[i] for i in indices]
+
+
 class RectChart(Chart):
     def __init__(self, init_opts: types.Init = opts.InitOpts()):
         super().__init__(init_opts=init_opts)
         self.options.update(xAxis=[opts.AxisOpts().opts], yAxis=[opts.AxisOpts().opts])
+        self._sampling: Optional[tuple] = None
+        self._sampled_indices: set = set()
+        self._lod: Optional[dict] = None
+        self._lod_pyramids: list = []
+        self._lod_written: set = set()
+
+    def _pixel_width(self) -> int:
+        match = re.fullmatch(r"\s*(\d+)(px)?\s*", str(self.width))
+        return int(match.group(1)) if match else _DEFAULT_SAMPLING_WIDTH
+
+    def set_downsampling(self, method: str = "lttb", threshold: Optional[int] = None):
+        """
+        Downsample the series added afterwards by `Line.add_yaxis` and
+        `Scatter.add_yaxis`, see `pyecharts.commons.downsample`. Only series
+        of plain values as long as the x axis data are downsampled.
+
+        :param method: `lttb`, or `minmax` for spiky data.
+        :param threshold: The number of points series are reduced to. By
+                          default, one point (`lttb`) or two (`minmax`) per
+                          pixel of the chart width.
+        """
+        if method not in (downsample.LTTB, downsample.MINMAX):
+            raise ValueError("unknown downsampling method: {}".format(method))
+        if threshold is None:
+            points_per_pixel = 2 if method == downsample.MINMAX else 1
+            threshold = self._pixel_width() * points_per_pixel
+        self._sampling = (method, threshold)
+        return self
+
+    def _downsample(self, y_axis: Sequence) -> tuple:
+        """
+        Return the x axis data and the y values of the points of a series
+        kept by `set_downsampling`.
+        """
+        xaxis_data = getattr(self, "_xaxis_data", None)
+        # series of a pyramid are reduced by its levels instead
+        if self._sampling is None or self._lod is not None or xaxis_data is None:
+            return xaxis_data, y_axis
+        method, threshold = self._sampling
+        indices = range(len(y_axis))
+        if len(y_axis) == len(xaxis_data) and len(y_axis) > threshold:
+            try:
+                indices = downsample.downsample(xaxis_data, y_axis, threshold, method)
+            except (TypeError, ValueError):
+                # items, or points of several dimensions
+                pass
+        self._sampled_indices.update(indices)
+        xaxis = self.options["xAxis"][0]
+        if xaxis.get("type") in (None, "category"):
+            if len(indices) < len(y_axis) and downsample.is_numeric(xaxis_data):
+                # a number on a category axis is read as the index of a
+                # category, the points kept are put at their x on a value axis
+                xaxis.update(type="value", data=None)
+            elif len(self._sampled_indices) < len(xaxis_data):
+                # the axis only keeps the categories of the points kept
+                xaxis["data"] = _take(xaxis_data, sorted(self._sampled_indices))
+            else:
+                xaxis["data"] = xaxis_data
+            self.invalidate_options("xAxis")
+        if len(indices) == len(y_axis):
+            return xaxis_data, y_axis
+        return _take(xaxis_data, indices), _take(y_axis, indices)
 
     def extend_axis(
         self,
@@ -178,16 +326,121 @@ class RectChart(Chart):
             if isinstance(yaxis, opts.AxisOpts):
                 yaxis = yaxis.opts
             self.options["yAxis"].append(yaxis)
+        self.invalidate_options("xAxis", "yAxis")
+        return self
+
+    def set_lod_pyramid(
+        self,
+        factor: int = 4,
+        threshold: Optional[int] = None,
+        folder: str = "lod",
+        url_prefix: Optional[str] = None,
+    ):
+        """
+        Build a level of detail pyramid of the series added afterwards by
+        `Line.add_yaxis`, `Bar.add_yaxis` and `Kline.add_yaxis`, see
+        `pyecharts.commons.pyramid`. Only the top level is in the page, the
+        others are written next to it by `render` and fetched as the first
+        dataZoom of the chart moves. Pages have to be served over http to
+        fetch them.
+
+        The x axis data must be numbers or dates, the x axis becomes a value
+        or a time axis.
+
+        :param factor: How many times fewer points a level has than the one
+                       below it.
+        :param threshold: The number of points shown at once, by default one
+                          per pixel of the chart width.
+        :param folder: The folder the levels are written to, next to the page.
+        :param url_prefix: The url the folder is served at, by default the
+                           folder relative to the page.
+        """
+        self._lod = {
+            "factor": factor,
+            "threshold": threshold or self._pixel_width(),
+            "folder": folder,
+            "url": url_prefix or folder.rstrip("/") + "/",
+        }
         return self
 
+    def _lod_data(self, series_name: str, y_axis: Sequence, kind: str):
+        """
+        Return the top level of the pyramid of a series added after
+        `set_lod_pyramid`, None otherwise.
+        """
+        if self._lod is None:
+            return None
+        x, axis_type = pyramid.axis_values(self._xaxis_data)
+        if utils.is_ndarray(y_axis):
+            y_axis = utils.as_ndarray(y_axis).tolist()
+        if kind == pyramid.OHLC:
+            items = [[v] + list(row) for v, row in zip(x, y_axis)]
+        else:
+            items = [[v, y] for v, y in zip(x, y_axis)]
+        levels = pyramid.build_pyramid(
+            items, kind, self._lod["factor"], self._lod["threshold"]
+        )
+        key = pyramid.pyramid_key(levels, self._lod["threshold"])
+        self._lod_pyramids.append((key, levels))
+
+        self.options["xAxis"][0].update(type=axis_type, data=None)
+        self.invalidate_options("xAxis")
+        js_code = _LOD_FETCH.format(
+            url=json.dumps(self._lod["url"] + key + "/"),
+            name=json.dumps(series_name),
+            threshold=self._lod["threshold"],
+            x_min=json.dumps(items[0][0] if items else 0),
+            x_max=json.dumps(items[-1][0] if items else 0),
+        )
+        self.add_js_funcs(utils.ChartJsCode(self, js_code))
+        return levels[-1]
+
+    def write_lod_files(self, directory: str):
+        """
+        Write the pyramids of `set_lod_pyramid` to `directory`. `render` of
+        the chart, or of the page or tab holding it, does it on its own next
+        to the page, `render_embed` and `render_notebook` need it done first.
+        """
+        for key, levels in self._lod_pyramids:
+            path = os.path.join(directory, key)
+            pyramid.write_pyramid(levels, path, self._lod["threshold"])
+            self._lod_written.add(key)
+        return self
+
+    def _write_lod_files_beside(self, path: str):
+        if self._lod_pyramids:
+            folder = os.path.dirname(os.path.abspath(path))
+            self.write_lod_files(os.path.join(folder, self._lod["folder"]))
+
+    def _check_lod_files(self):
+        if any(key not in self._lod_written for key, _ in self._lod_pyramids):
+            raise ValueError(
+                "the levels of set_lod_pyramid are not written, "
+                "call write_lod_files before embedding the chart"
+            )
+
+    def render(self, path: str = "render.html", *args, **kwargs) -> str:
+        self._write_lod_files_beside(path)
+        return super().render(path, *args, **kwargs)
+
+    def render_embed(self, *args, **kwargs) -> str:
+        self._check_lod_files()
+        return super().render_embed(*args, **kwargs)
+
+    def render_notebook(self):
+        self._check_lod_files()
+        return super().render_notebook()
+
     def add_xaxis(self, xaxis_data: Sequence):
         self.options["xAxis"][0].update(data=xaxis_data)
         self._xaxis_data = xaxis_data
+        self.invalidate_options("xAxis")
         return self
 
     def reversal_axis(self):
         self.options["yAxis"][0]["data"] = self._xaxis_data
         self.options["xAxis"][0]["data"] = None
+        self.invalidate_options("xAxis", "yAxis")
         return self
 
     def overlap(self, chart: Base):
@@ -198,6 +451,7 @@ class RectChart(Chart):
             chart.options.get("legend")[0].get("selected")
         )
         self.options.get("series").extend(chart.options.get("series"))
+        self.invalidate_options("legend", "series")
         return self
 
 
@@ -207,8 +461,9 @@ class Chart3D(Chart):
     """
 
     def __init__(self, init_opts: types.Init = opts.InitOpts()):
-        init_opts.renderer = RenderType.CANVAS
         super().__init__(init_opts)
+        # echarts-gl only draws on canvas
+        self.renderer = RenderType.CANVAS
         self.js_dependencies.add("echarts-gl")
         self.options.update(visualMap=opts.VisualMapOpts().opts)
         self._3d_chart_type: Optional[str] = None  # 3d chart type,don't use it directly
@@ -229,6 +484,7 @@ class ThreeAxisChart(Chart3D):
         encode: types.Union[types.JSFunc, dict, None] = None,
     ):
         self.options.get("legend")[0].get("data").append(series_name)
+        self.invalidate_options("legend")
         self.options.update(
             xAxis3D=xaxis3d_opts,
             yAxis3D=yaxis3d_opts,
@@ -78,4 +78,6 @@ class Grid(Base):
 
         self.options.get("grid").append(grid_opts)
         self._axis_index += 1
+        self.invalidate_options()
+        chart.invalidate_options("series", "xAxis", "yAxis")
         return self
@@ -1,8 +1,7 @@
 import json
 import re
 import uuid
-
-from jinja2 import Environment
+from typing import TYPE_CHECKING
 
 from ... import types
 from ...commons import utils
@@ -11,6 +10,9 @@ from ...options import PageLayoutOpts
 from ...render import engine
 from ..mixins import CompositeMixin
 
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
 _MARK_FREEDOM_LAYOUT = "_MARK_FREEDOM_LAYOUT_"
 
 DOWNLOAD_CFG_FUNC = """
@@ -83,10 +85,10 @@ class Page(CompositeMixin):
             result += "{}:{}; ".format(k, v)
         return result
 
-    def _prepare_render(self):
+    def _prepare_render(self, is_lazy: bool = False):
         for c in self:
             if hasattr(c, "dump_options"):
-                c.json_contents = c.dump_options()
+                c.json_contents = engine.LazyOptions(c) if is_lazy else c.dump_options()
             if hasattr(c, "theme"):
                 if c.theme not in ThemeType.BUILTIN_THEMES:
                     self.js_dependencies.add(c.theme)
@@ -128,22 +130,26 @@ class Page(CompositeMixin):
         self,
         path: str = "render.html",
         template_name: str = "simple_page.html",
-        env: types.Optional[Environment] = None,
+        env: types.Optional["Environment"] = None,
+        is_stream: bool = False,
         **kwargs,
     ) -> str:
-        self._prepare_render()
-        return engine.render(self, path, template_name, env, **kwargs)
+        self._prepare_render(is_lazy=is_stream)
+        self._write_lod_files(path)
+        return engine.render(self, path, template_name, env, is_stream, **kwargs)
 
     def render_embed(
         self,
         template_name: str = "simple_page.html",
-        env: types.Optional[Environment] = None,
+        env: types.Optional["Environment"] = None,
         **kwargs,
     ) -> str:
+        self._check_lod_files()
         self._prepare_render()
         return engine.render_embed(self, template_name, env, **kwargs)
 
     def render_notebook(self):
+        self._check_lod_files()
         for c in self:
             c.chart_id = uuid.uuid4().hex
             if hasattr(c, "dump_options"):
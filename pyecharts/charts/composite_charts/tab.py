@@ -1,6 +1,5 @@
 import uuid
-
-from jinja2 import Environment
+from typing import TYPE_CHECKING
 
 from ... import types
 from ...commons import utils
@@ -8,6 +7,9 @@ from ...globals import CurrentConfig, ThemeType
 from ...render import engine
 from ..mixins import CompositeMixin
 
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
 
 class Tab(CompositeMixin):
     def __init__(self, page_title: str = CurrentConfig.PAGE_TITLE, js_host: str = ""):
@@ -25,10 +27,10 @@ class Tab(CompositeMixin):
             self.js_dependencies.add(d)
         return self
 
-    def _prepare_render(self):
+    def _prepare_render(self, is_lazy: bool = False):
         for c in self:
             if hasattr(c, "dump_options"):
-                c.json_contents = c.dump_options()
+                c.json_contents = engine.LazyOptions(c) if is_lazy else c.dump_options()
             if hasattr(c, "theme"):
                 if c.theme not in ThemeType.BUILTIN_THEMES:
                     self.js_dependencies.add(c.theme)
@@ -37,22 +39,26 @@ class Tab(CompositeMixin):
         self,
         path: str = "render.html",
         template_name: str = "simple_tab.html",
-        env: types.Optional[Environment] = None,
+        env: types.Optional["Environment"] = None,
+        is_stream: bool = False,
         **kwargs,
     ) -> str:
-        self._prepare_render()
-        return engine.render(self, path, template_name, env, **kwargs)
+        self._prepare_render(is_lazy=is_stream)
+        self._write_lod_files(path)
+        return engine.render(self, path, template_name, env, is_stream, **kwargs)
 
     def render_embed(
         self,
         template_name: str = "simple_tab.html",
-        env: types.Optional[Environment] = None,
+        env: types.Optional["Environment"] = None,
         **kwargs,
     ) -> str:
+        self._check_lod_files()
         self._prepare_render()
         return engine.render_embed(self, template_name, env, **kwargs)
 
     def render_notebook(self):
+        self._check_lod_files()
         self._prepare_render()
         # only notebook env need to re-generate chart_id
         for c in self:
@@ -67,6 +67,7 @@ class Timeline(Base):
                 "controlStyle": controlstyle_opts,
             }
         )
+        self.invalidate_options("baseOption")
         return self
 
     def add(self, chart: Base, time_point: str):
@@ -92,6 +93,7 @@ class Timeline(Base):
         )
         self.__check_components(chart)
         self.options.get("baseOption").update(series=chart.options.get("series"))
+        self.invalidate_options()
         return self
 
     def __check_components(self, chart: Base):
@@ -18,3 +18,13 @@ class CompositeMixin(ChartMixin):
 
     def __len__(self):
         return len(self._charts)
+
+    def _write_lod_files(self, path: str):
+        for chart in self:
+            if hasattr(chart, "write_lod_files"):
+                chart._write_lod_files_beside(path)
+
+    def _check_lod_files(self):
+        for chart in self:
+            if hasattr(chart, "write_lod_files"):
+                chart._check_lod_files()
@@ -1,6 +1,5 @@
 import uuid
-
-from jinja2 import Environment
+from typing import TYPE_CHECKING
 
 from ... import types
 from ...charts.basic_charts.map import MapMixin
@@ -11,6 +10,9 @@ from ...options import InitOpts
 from ...render.display import HTML
 from ...render.engine import RenderEngine
 
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
 
 class MapGlobe(Chart3D, MapMixin):
     """
@@ -28,7 +30,7 @@ class MapGlobe(Chart3D, MapMixin):
         self,
         path: str = "render.html",
         template_name: str = "simple_globe.html",
-        env: types.Optional[Environment] = None,
+        env: types.Optional["Environment"] = None,
         **kwargs,
     ) -> str:
         return super().render(path=path, template_name=template_name, env=env, **kwargs)
@@ -0,0 +1,309 @@
+"""
+Spatial binning of points, so that the size of a series depends on the
+number of bins rather than on the number of points.
+
+Points are `[longitude, latitude]` or `[longitude, latitude, weight]`
+sequences. Bins are either square cells of a grid or the hexagons of a
+hexagonal grid, `size` being the width of a cell (in degrees).
+
+`axis_bins` and `count_cells` bin the two columns of events into the cells
+of a heat map, category by category or value range by value range, and
+only return the cells holding events.
+"""
+
+import bisect
+import math
+from typing import List, Optional, Sequence, Tuple, Union
+
+from . import utils
+
+Numeric = Union[int, float]
+
+GRID = "grid"
+HEXBIN = "hex"
+
+_SQRT3 = math.sqrt(3)
+# cells are counted in a dense array up to this many, sparsely above
+_DENSE_CELLS = 1 << 24
+
+
+def _check(method: str, aggregate: str, size: Numeric):
+    if method not in (GRID, HEXBIN):
+        raise ValueError("unknown binning method: {}".format(method))
+    if aggregate not in ("count", "sum"):
+        raise ValueError("unknown aggregation method: {}".format(aggregate))
+    if not size > 0:
+        raise ValueError("bin size must be positive, got {}".format(size))
+
+
+def _center(method: str, size: Numeric, ix: int, iy: int, lattice: int):
+    if method == GRID:
+        return (ix + 0.5) * size, (iy + 0.5) * size
+    # hexagon centers are the union of two rectangular lattices, the second
+    # one shifted by half a cell in both directions
+    shift = 0.5 * lattice
+    return (ix + shift) * size, (iy + shift) * size * _SQRT3
+
+
+def _bin_python(points, size, method, aggregate) -> List[list]:
+    is_count = aggregate == "count"
+    height = size * _SQRT3
+    totals = {}
+    for point in points:
+        x, y = point[0], point[1]
+        if method == GRID:
+            key = (math.floor(x / size), math.floor(y / size), 0)
+        else:
+            ix0, iy0 = round(x / size), round(y / height)
+            ix1, iy1 = math.floor(x / size), math.floor(y / height)
+            d0 = (x - ix0 * size) ** 2 + (y - iy0 * height) ** 2
+            d1 = (x - (ix1 + 0.5) * size) ** 2 + (y - (iy1 + 0.5) * height) ** 2
+            key = (ix0, iy0, 0) if d0 <= d1 else (ix1, iy1, 1)
+        weight = 1 if is_count or len(point) < 3 else float(point[2])
+        totals[key] = totals.get(key, 0) + weight
+    return [list(_center(method, size, *key)) + [totals[key]] for key in sorted(totals)]
+
+
+def _bin_numpy(np, points, size, method, aggregate) -> List[list]:
+    values = np.asarray(points, dtype=float)
+    if values.size == 0:
+        return []
+    x, y = values[:, 0], values[:, 1]
+    if method == GRID:
+        ix, iy = np.floor(x / size), np.floor(y / size)
+        lattice = np.zeros(len(x))
+    else:
+        height = size * _SQRT3
+        # numpy rounds halves to even, python's round does the same
+        ix0, iy0 = np.round(x / size), np.round(y / height)
+        ix1, iy1 = np.floor(x / size), np.floor(y / height)
+        d0 = (x - ix0 * size) ** 2 + (y - iy0 * height) ** 2
+        d1 = (x - (ix1 + 0.5) * size) ** 2 + (y - (iy1 + 0.5) * height) ** 2
+        is_first = d0 <= d1
+        ix, iy = np.where(is_first, ix0, ix1), np.where(is_first, iy0, iy1)
+        lattice = np.where(is_first, 0, 1)
+    ix, iy = ix.astype(np.int64), iy.astype(np.int64)
+    lattice = lattice.astype(np.int64)
+
+    # a single integer key sorted as the (ix, iy, lattice) tuples
+    ix_min, iy_min = ix.min(), iy.min()
+    rows = iy.max() - iy_min + 1
+    keys = ((ix - ix_min) * rows + (iy - iy_min)) * 2 + lattice
+    unique, inverse = np.unique(keys, return_inverse=True)
+    if aggregate == "count" or values.shape[1] < 3:
+        totals = np.bincount(inverse.ravel()).tolist()
+    else:
+        totals = np.bincount(inverse.ravel(), weights=values[:, 2]).tolist()
+
+    lattice = unique % 2
+    cells = unique // 2
+    ix, iy = cells // rows + ix_min, cells % rows + iy_min
+    return [
+        list(_center(method, size, i, j, k)) + [total]
+        for i, j, k, total in zip(ix.tolist(), iy.tolist(), lattice.tolist(), totals)
+    ]
+
+
+def bin_points(
+    points: Sequence,
+    size: Numeric,
+    method: str = GRID,
+    aggregate: str = "count",
+) -> List[list]:
+    """
+    Bin points and return one `[longitude, latitude, value]` item per non
+    empty bin, at the center of the bin.
+
+    :param points: `[longitude, latitude(, weight)]` sequences or a 2d array.
+    :param size: The width of a bin.
+    :param method: `grid` for square bins, `hex` for hexagonal ones.
+    :param aggregate: `count` counts the points of a bin, `sum` adds their
+                      weights up, a missing weight counting as 1.
+    """
+    _check(method, aggregate, size)
+    np = utils.optional_numpy()
+    if np is None:
+        return _bin_python(points, size, method, aggregate)
+    return _bin_numpy(np, points, size, method, aggregate)
+
+
+def bin_levels(
+    points: Sequence,
+    sizes: Sequence[Numeric],
+    method: str = GRID,
+    aggregate: str = "count",
+) -> List[List[list]]:
+    """
+    Bin points once per bin size, see `bin_points`. Sizes go from the
+    coarsest level to the finest one.
+    """
+    np = utils.optional_numpy()
+    if np is not None:
+        # convert the points only once for all levels
+        points = np.asarray(points, dtype=float)
+    return [bin_points(points, size, method, aggregate) for size in sizes]
+
+
+def _format_edge(value: float) -> str:
+    return "{:g}".format(value)
+
+
+def _edges(values, bins: Union[int, Sequence[Numeric]]) -> List[float]:
+    if not isinstance(bins, int):
+        edges = [float(e) for e in bins]
+        if len(edges) < 2 or any(a >= b for a, b in zip(edges, edges[1:])):
+            raise ValueError("bin edges must be at least two increasing values")
+        return edges
+    if bins < 1:
+        raise ValueError("the number of bins must be positive, got {}".format(bins))
+    np = utils.optional_numpy()
+    if np is not None:
+        values = np.asarray(values, dtype=float)
+        low, high = (values.min(), values.max()) if len(values) else (0, 1)
+    else:
+        low, high = (min(values), max(values)) if len(values) else (0, 1)
+    low, high = float(low), float(high)
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    return [low + (high - low) * i / bins for i in range(bins)] + [high]
+
+
+def _is_searchable(np, values, categories) -> bool:
+    # categories of the same kind as the values, strings or numbers, can be
+    # compared with them as arrays
+    if not categories or len(set(categories)) != len(categories):
+        return False
+    kinds = {values.dtype.kind, np.asarray(categories).dtype.kind}
+    return kinds <= set("US") or kinds <= set("iuf")
+
+
+def axis_bins(
+    values: Sequence,
+    bins: Union[int, Sequence[Numeric], None] = None,
+    categories: Optional[Sequence] = None,
+) -> Tuple[Sequence[int], list]:
+    """
+    Return the bin of every value, -1 for values in none, and the labels of
+    the bins.
+
+    :param values: The values of one axis of the events.
+    :param bins: None to bin by category, a number of bins of the same width
+                 between the lowest and highest values, or the edges of the
+                 bins. Bins hold their lower edge and the last one its upper
+                 edge too, as with `numpy.histogram`.
+    :param categories: The categories, in axis order. By default, the values
+                       found, sorted.
+    """
+    np = utils.optional_numpy()
+    if bins is None:
+        if np is None:
+            if categories is None:
+                categories = sorted(set(values))
+            positions = {c: i for i, c in enumerate(categories)}
+            return [positions.get(v, -1) for v in values], list(categories)
+        values = np.asarray(values)
+        if categories is not None and _is_searchable(np, values, categories):
+            # a lookup among the sorted categories, without sorting values
+            table = np.asarray(categories)
+            order = np.argsort(table, kind="stable")
+            table = table[order]
+            found = np.searchsorted(table, values).clip(max=len(table) - 1)
+            indices = np.where(table[found] == values, order[found], -1)
+            return indices, list(categories)
+        found, inverse = np.unique(values, return_inverse=True)
+        found = found.tolist()
+        if categories is None:
+            categories = found
+        positions = {c: i for i, c in enumerate(categories)}
+        table = np.array([positions.get(v, -1) for v in found], dtype=np.int64)
+        return table[inverse.ravel()], list(categories)
+
+    edges = _edges(values, bins)
+    labels = [
+        "{} - {}".format(_format_edge(a), _format_edge(b))
+        for a, b in zip(edges, edges[1:])
+    ]
+    last = len(edges) - 2
+    if np is None:
+        indices = []
+        for v in values:
+            i = bisect.bisect_right(edges, v) - 1
+            if v == edges[-1]:
+                i = last
+            indices.append(i if 0 <= i <= last else -1)
+        return indices, labels
+    values = np.asarray(values, dtype=float)
+    indices = np.searchsorted(edges, values, side="right") - 1
+    indices[values == edges[-1]] = last
+    indices[(indices < 0) | (indices > last) | np.isnan(values)] = -1
+    return indices, labels
+
+
+def count_cells(
+    x_index: Sequence[int],
+    y_index: Sequence[int],
+    shape: Tuple[int, int],
+    weights: Optional[Sequence[Numeric]] = None,
+    aggregate: str = "count",
+) -> Tuple[List[list], Optional[Tuple[Numeric, Numeric]]]:
+    """
+    Aggregate events into the cells of a grid and return the `[x, y,
+    value]` items of the cells holding events, by x then y, with the lowest
+    and highest values of the cells. Events of index -1 are left out.
+
+    :param shape: The number of x and y bins.
+    :param aggregate: `count` counts the events of a cell, `sum` adds their
+                      weights up and `mean` averages them.
+    """
+    if aggregate not in ("count", "sum", "mean"):
+        raise ValueError("unknown aggregation method: {}".format(aggregate))
+    if aggregate != "count" and weights is None:
+        raise ValueError("the {} of cells needs weights".format(aggregate))
+    np = utils.optional_numpy()
+    if np is None:
+        counts, totals = {}, {}
+        for i, (x, y) in enumerate(zip(x_index, y_index)):
+            if x < 0 or y < 0:
+                continue
+            counts[(x, y)] = counts.get((x, y), 0) + 1
+            if weights is not None:
+                totals[(x, y)] = totals.get((x, y), 0) + float(weights[i])
+        cells = []
+        for key in sorted(counts):
+            if aggregate == "count":
+                value = counts[key]
+            elif aggregate == "sum":
+                value = totals[key]
+            else:
+                value = totals[key] / counts[key]
+            cells.append([key[0], key[1], value])
+    else:
+        x_index, y_index = np.asarray(x_index), np.asarray(y_index)
+        is_kept = (x_index >= 0) & (y_index >= 0)
+        keys = x_index[is_kept].astype(np.int64) * shape[1] + y_index[is_kept]
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float)[is_kept]
+        if shape[0] * shape[1] <= max(_DENSE_CELLS, len(keys)):
+            counts = np.bincount(keys, minlength=shape[0] * shape[1])
+            occupied = np.flatnonzero(counts)
+            counts = counts[occupied]
+            if weights is not None:
+                totals = np.bincount(keys, weights, shape[0] * shape[1])[occupied]
+        else:
+            occupied, inverse, counts = np.unique(
+                keys, return_inverse=True, return_counts=True
+            )
+            if weights is not None:
+                totals = np.bincount(inverse.ravel(), weights, len(occupied))
+        if aggregate == "count":
+            values = counts
+        elif aggregate == "sum":
+            values = totals
+        else:
+            values = totals / counts
+        xs, ys = occupied // shape[1], occupied % shape[1]
+        cells = [list(cell) for cell in zip(xs.tolist(), ys.tolist(), values.tolist())]
+    if not cells:
+        return cells, None
+    values = [cell[2] for cell in cells]
+    return cells, (min(values), max(values))
@@ -0,0 +1,207 @@
+"""
+Downsampling of long series to about as many points as the chart has
+pixels, keeping their visual shape.
+
+`lttb` is Largest-Triangle-Three-Buckets: one point per bucket, the one
+making the largest triangle with the point kept in the previous bucket and
+the average of the next bucket. `minmax` keeps the lowest and the highest
+point of every bucket, for spiky data whose peaks must not be lost. Both
+keep the first and the last points.
+"""
+
+import datetime
+import math
+import numbers
+from typing import List, Sequence
+
+from . import utils
+
+LTTB = "lttb"
+MINMAX = "minmax"
+
+
+def _position(value, index: int) -> float:
+    if isinstance(value, numbers.Real) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    if isinstance(value, datetime.date):
+        return float(value.toordinal() * 86400)
+    # categories are evenly spaced
+    return float(index)
+
+
+def _value(value) -> float:
+    if value is None:
+        return math.nan
+    return float(value)
+
+
+def _values(np, y):
+    if isinstance(y, np.ndarray):
+        return y.astype(float)
+    return np.array([_value(v) for v in y], dtype=float)
+
+
+def positions(x: Sequence) -> List[float]:
+    """
+    Return the positions of x axis values along the axis: numbers as they
+    are, dates as timestamps and categories as their index.
+    """
+    np = utils.optional_numpy()
+    if np is not None and isinstance(x, np.ndarray):
+        if x.dtype.kind in "iuf":
+            return x.astype(float)
+        if x.dtype.kind == "M":
+            return x.astype("datetime64[us]").astype("int64") / 1e6
+        if x.dtype.kind != "O":
+            return np.arange(len(x), dtype=float)
+    return [_position(v, i) for i, v in enumerate(x)]
+
+
+def is_numeric(x: Sequence) -> bool:
+    """
+    Whether x axis values are all numbers, placed at their value along the axis.
+    """
+    np = utils.optional_numpy()
+    if np is not None and isinstance(x, np.ndarray):
+        return x.dtype.kind in "iuf"
+    return all(isinstance(v, numbers.Real) and not isinstance(v, bool) for v in x)
+
+
+def _lttb_edges(size: int, threshold: int) -> List[int]:
+    # the first and the last points are buckets of their own
+    buckets = threshold - 2
+    return [1 + (size - 2) * i // buckets for i in range(buckets + 1)]
+
+
+def _lttb_python(x, y, threshold) -> List[int]:
+    size = len(y)
+    edges = _lttb_edges(size, threshold)
+    selected = [0]
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            # the average of the next bucket, missing values left out
+            following = [j for j in range(stop, edges[i + 2]) if y[j] == y[j]]
+            cx, cy = 0.0, math.nan
+            if following:
+                cx = sum(x[j] for j in following) / len(following)
+                cy = sum(y[j] for j in following) / len(following)
+        else:
+            cx, cy = x[size - 1], y[size - 1]
+        a = selected[-1]
+        ax, ay = x[a], y[a]
+        best, best_area = start, -1.0
+        for j in range(start, stop):
+            area = abs((ax - cx) * (y[j] - ay) - (ax - x[j]) * (cy - ay))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+    selected.append(size - 1)
+    return selected
+
+
+def _lttb_numpy(np, x, y, threshold) -> List[int]:
+    size = len(y)
+    edges = np.array(_lttb_edges(size, threshold))
+    # averages of every bucket, missing values left out
+    is_valid = ~np.isnan(y)
+    counts = np.add.reduceat(is_valid, edges[:-1]).astype(float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_x = np.add.reduceat(np.where(is_valid, x, 0), edges[:-1]) / counts
+        mean_y = np.add.reduceat(np.where(is_valid, y, 0), edges[:-1]) / counts
+    mean_x[counts == 0], mean_y[counts == 0] = 0, np.nan
+
+    selected = [0]
+    a = 0
+    with np.errstate(invalid="ignore"):
+        for i in range(threshold - 2):
+            start, stop = edges[i], edges[i + 1]
+            if i + 2 < len(edges):
+                cx, cy = mean_x[i + 1], mean_y[i + 1]
+            else:
+                cx, cy = x[size - 1], y[size - 1]
+            ax, ay = x[a], y[a]
+            areas = np.abs(
+                (ax - cx) * (y[start:stop] - ay) - (ax - x[start:stop]) * (cy - ay)
+            )
+            areas[np.isnan(areas)] = -1
+            a = int(start + np.argmax(areas))
+            selected.append(a)
+    selected.append(size - 1)
+    return selected
+
+
+def lttb(x: Sequence, y: Sequence, threshold: int) -> List[int]:
+    """
+    Return the indices of the points kept by LTTB, in order.
+
+    :param x: The x axis values, see `positions`.
+    :param y: The y values, `None` or NaN for missing ones.
+    :param threshold: The number of points to keep, at least 3.
+    """
+    size = len(y)
+    if threshold >= size or threshold < 3:
+        return list(range(size))
+    np = utils.optional_numpy()
+    if np is None:
+        return _lttb_python(positions(x), [_value(v) for v in y], threshold)
+    x = np.asarray(positions(x), dtype=float)
+    y = _values(np, y)
+    return _lttb_numpy(np, x, y, threshold)
+
+
+def _minmax_python(y, buckets) -> List[int]:
+    size = len(y)
+    step = -(-size // buckets)
+    selected = {0, size - 1}
+    for start in range(0, size, step):
+        indices = range(start, min(start + step, size))
+        selected.add(min(indices, key=lambda j: math.inf if y[j] != y[j] else y[j]))
+        selected.add(max(indices, key=lambda j: -math.inf if y[j] != y[j] else y[j]))
+    return sorted(selected)
+
+
+def _minmax_numpy(np, y, buckets) -> List[int]:
+    size = len(y)
+    step = -(-size // buckets)
+    padded = np.full(step * (-(-size // step)), y[-1])
+    padded[:size] = y
+    blocks = padded.reshape(-1, step)
+    is_missing = np.isnan(blocks)
+    offsets = np.arange(0, len(padded), step)
+    lows = offsets + np.argmin(np.where(is_missing, np.inf, blocks), axis=1)
+    highs = offsets + np.argmax(np.where(is_missing, -np.inf, blocks), axis=1)
+    selected = np.concatenate(([0, size - 1], lows, highs))
+    return np.unique(np.minimum(selected, size - 1)).tolist()
+
+
+def minmax(y: Sequence, threshold: int) -> List[int]:
+    """
+    Return the indices of the lowest and highest points of `threshold / 2`
+    buckets of the same size, in order.
+
+    :param y: The y values, `None` or NaN for missing ones.
+    :param threshold: The number of points to keep, about.
+    """
+    size = len(y)
+    buckets = threshold // 2
+    if threshold >= size or buckets < 1:
+        return list(range(size))
+    np = utils.optional_numpy()
+    if np is None:
+        return _minmax_python([_value(v) for v in y], buckets)
+    y = _values(np, y)
+    return _minmax_numpy(np, y, buckets)
+
+
+def downsample(x: Sequence, y: Sequence, threshold: int, method: str = LTTB):
+    """
+    Return the indices of the points kept by `lttb` or `minmax`.
+    """
+    if method == LTTB:
+        return lttb(x, y, threshold)
+    if method == MINMAX:
+        return minmax(y, threshold)
+    raise ValueError("unknown downsampling method: {}".format(method))
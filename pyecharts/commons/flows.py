@@ -0,0 +1,96 @@
+"""
+Aggregation of flows, the lines of Geo and BMap charts and the links of
+Sankey charts, so that a route taken many times is drawn once with its
+total weight.
+
+Flows are `(source, target)` or `(source, target, weight)` sequences, or
+dicts with `source` and `target`, or `coords`, and an optional `value`.
+Dict flows are merged when their endpoints, or all of their coords, are the
+same, and keep the other fields of the first of them.
+"""
+
+import heapq
+from typing import Iterable, List, Optional, Sequence
+
+
+def _endpoint(obj):
+    # coordinates given as lists have to be hashed as tuples
+    return tuple(obj) if isinstance(obj, list) else obj
+
+
+def _key(flow) -> tuple:
+    if isinstance(flow, dict):
+        coords = flow.get("coords")
+        if coords is not None:
+            return ("coords",) + tuple(_endpoint(c) for c in coords)
+        return _endpoint(flow.get("source")), _endpoint(flow.get("target"))
+    return _endpoint(flow[0]), _endpoint(flow[1])
+
+
+def _weight(flow):
+    if isinstance(flow, dict):
+        return flow.get("value")
+    return flow[2] if len(flow) > 2 else None
+
+
+def _value(flow):
+    return flow["value"] if isinstance(flow, dict) else flow[2]
+
+
+def aggregate_flows(
+    flows: Iterable, method: str = "sum", top_k: Optional[int] = None
+) -> list:
+    """
+    Merge the flows which share their endpoints, in a single pass over them.
+
+    :param flows: See the module documentation.
+    :param method: `sum` adds the weights up, a missing weight counting as 1,
+                   `count` counts the flows.
+    :param top_k: Only keep the `top_k` heaviest flows, heaviest first.
+
+    Return a copy of the first dict flow of every route with the total as
+    its `value`, or a `(source, target, value)` tuple for sequence flows, in
+    the order in which the routes first appear.
+    """
+    if method not in ("sum", "count"):
+        raise ValueError("unknown aggregation method: {}".format(method))
+    is_count = method == "count"
+    totals, firsts = {}, {}
+    for flow in flows:
+        weight = None if is_count else _weight(flow)
+        if weight is None:
+            weight = 1
+        key = _key(flow)
+        total = totals.get(key)
+        if total is None:
+            totals[key] = weight
+            firsts[key] = flow
+        else:
+            totals[key] = total + weight
+    result = []
+    for key, flow in firsts.items():
+        if isinstance(flow, dict):
+            result.append(dict(flow, value=totals[key]))
+        else:
+            result.append((flow[0], flow[1], totals[key]))
+    if top_k is not None:
+        result = heapq.nlargest(top_k, result, key=_value)
+    return result
+
+
+def scale_flow_widths(data: List[dict], width_range: Sequence) -> List[dict]:
+    """
+    Set `lineStyle.width` of every flow dict in proportion to its `value`,
+    linearly from `width_range[0]` for the lightest flow to `width_range[1]`
+    for the heaviest one. Other line styles of the flows are kept.
+    """
+    if not data:
+        return data
+    low, high = width_range
+    values = [item["value"] for item in data]
+    smallest, largest = min(values), max(values)
+    span = largest - smallest
+    for item, value in zip(data, values):
+        width = high if not span else low + (high - low) * (value - smallest) / span
+        item["lineStyle"] = dict(item.get("lineStyle") or {}, width=width)
+    return data
@@ -0,0 +1,142 @@
+"""
+Level of detail pyramids of long series.
+
+Every level holds about `factor` times fewer points than the one below it,
+up to a top level small enough to be drawn as it is. Levels are split into
+chunks written as JSON files, with an `index.json` giving the x range of
+every chunk, so that a page only fetches the chunks of the zoomed window at
+the level of detail the chart can show.
+
+Line and bar points keep the lowest and the highest point of every bucket,
+see `downsample.minmax`. Candlesticks are merged, with the open of the first
+one, the close of the last one and the extremes of all, their volumes added
+up when they have one.
+"""
+
+import datetime
+import hashlib
+import os
+from typing import List, Sequence, Tuple
+
+import simplejson as json
+
+from . import downsample, utils
+
+POINTS = "points"
+OHLC = "ohlc"
+
+# seconds of a day, dates are placed at midnight UTC
+_DAY = 86400
+
+
+def _epoch_ms(value) -> float:
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value.timestamp() * 1000
+    if isinstance(value, datetime.date):
+        epoch = datetime.date(1970, 1, 1).toordinal()
+        return float((value.toordinal() - epoch) * _DAY * 1000)
+    if isinstance(value, str):
+        return _epoch_ms(datetime.datetime.fromisoformat(value))
+    raise ValueError("x values must be numbers or dates, got {!r}".format(value))
+
+
+def axis_values(x: Sequence) -> Tuple[List[float], str]:
+    """
+    Return the x values as numbers with the type of axis they go on: numbers
+    on a `value` axis, dates and ISO date strings as epoch milliseconds on a
+    `time` axis.
+    """
+    if utils.is_ndarray(x):
+        x = utils.as_ndarray(x)
+        if x.dtype.kind in "iuf":
+            return x.astype(float).tolist(), "value"
+        if x.dtype.kind == "M":
+            x = x.astype("datetime64[ms]").astype("int64")
+            return x.astype(float).tolist(), "time"
+        x = x.tolist()
+    x = list(x)
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in x):
+        return [float(v) for v in x], "value"
+    return [_epoch_ms(v) for v in x], "time"
+
+
+def _reduce_points(level: list, factor: int) -> list:
+    kept = downsample.minmax([item[1] for item in level], len(level) // factor)
+    return [level[i] for i in kept]
+
+
+def _reduce_ohlc(level: list, factor: int) -> list:
+    result = []
+    for start in range(0, len(level), factor):
+        stop = start + factor
+        bucket = level[start:stop]
+        merged = [
+            bucket[0][0],
+            bucket[0][1],
+            bucket[-1][2],
+            min(item[3] for item in bucket),
+            max(item[4] for item in bucket),
+        ]
+        if len(bucket[0]) > 5:
+            merged.append(sum(item[5] for item in bucket))
+        result.append(merged)
+    return result
+
+
+def build_pyramid(
+    items: list, kind: str = POINTS, factor: int = 4, threshold: int = 1000
+) -> List[list]:
+    """
+    Return the levels of a pyramid, the full series first and the top level,
+    of at most `threshold` items, last.
+
+    :param items: `[x, y]` items, or `[x, open, close, low, high(, volume)]`
+                  items for `ohlc`, sorted by x.
+    """
+    if factor < 2:
+        raise ValueError("the reduction factor must be at least 2")
+    reduce = _reduce_ohlc if kind == OHLC else _reduce_points
+    levels = [items]
+    while len(levels[-1]) > threshold:
+        level = reduce(levels[-1], factor)
+        if len(level) == len(levels[-1]):
+            break
+        levels.append(level)
+    return levels
+
+
+def pyramid_key(levels: List[list], chunk_size: int) -> str:
+    """
+    Return a key of the files `write_pyramid` writes, the same for the same
+    levels and chunks so that rendering again overwrites them.
+    """
+    digest = hashlib.sha1(str(chunk_size).encode())
+    for level in levels:
+        dumped = json.dumps(level, ignore_nan=True, separators=(",", ":"))
+        digest.update(dumped.encode())
+    return digest.hexdigest()[:12]
+
+
+def write_pyramid(levels: List[list], directory: str, chunk_size: int) -> dict:
+    """
+    Write the levels of a pyramid to `directory`, as `<level>/<chunk>.json`
+    files of `chunk_size` items, and return the index written to
+    `index.json`.
+    """
+    index = {"levels": []}
+    for number, level in enumerate(levels):
+        folder = os.path.join(directory, str(number))
+        os.makedirs(folder, exist_ok=True)
+        chunks = []
+        for chunk, start in enumerate(range(0, len(level), chunk_size)):
+            stop = start + chunk_size
+            items = level[start:stop]
+            with open(os.path.join(folder, "{}.json".format(chunk)), "w") as f:
+                json.dump(items, f, ignore_nan=True, separators=(",", ":"))
+            chunks.append([items[0][0], items[-1][0], len(items)])
+        index["levels"].append({"chunks": chunks})
+    with open(os.path.join(directory, "index.json"), "w") as f:
+        json.dump(index, f, separators=(",", ":"))
+    return index
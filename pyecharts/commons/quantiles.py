@@ -0,0 +1,258 @@
+"""
+Box plot statistics of groups of samples: the lowest value, the quartiles
+and the highest value of every group, or with Tukey's fences, the whiskers
+and the outliers beyond them.
+
+Quartile `i` is at the 1-based position `i * (n + 1) / 4` of the sorted
+samples, interpolated between its neighbours and kept within the samples.
+Only the samples at these positions are sorted into place, with
+`numpy.partition` over the groups of the same size at once when NumPy is
+installed.
+
+Groups read from iterators go through a KLL sketch instead, which keeps
+`O(k log(n / k))` samples per group for quartiles within about `1.7 / k` of
+their rank.
+"""
+
+import bisect
+import itertools
+import random
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from . import utils
+
+Numeric = Union[int, float]
+
+# the most samples of a block of groups partitioned at once
+_BLOCK_SIZE = 1 << 22
+
+
+def _quartile_positions(size: int) -> List[Tuple[int, float]]:
+    positions = []
+    for i in range(1, 4):
+        n = min(max(i * (size + 1) / 4, 1), size)
+        k = int(n)
+        positions.append((k, n - k))
+    return positions
+
+
+def _interpolate(lower, upper, fraction: float):
+    if fraction == 0:
+        return lower
+    return lower * (1 - fraction) + upper * fraction
+
+
+def _box(size: int, at, whisker: Optional[Numeric]) -> Tuple[list, Optional[tuple]]:
+    """
+    Return the box of a group whose sorted sample at `i` is `at(i)`, and its
+    fences when there are whiskers.
+    """
+    quartiles = [
+        _interpolate(at(k - 1), at(k) if m else None, m)
+        for k, m in _quartile_positions(size)
+    ]
+    fences = None
+    if whisker is not None:
+        spread = whisker * (quartiles[2] - quartiles[0])
+        fences = (quartiles[0] - spread, quartiles[2] + spread)
+    return [at(0)] + quartiles + [at(size - 1)], fences
+
+
+def _stats_python(group, index: int, whisker, boxes: list, outliers: list):
+    d = sorted(group)
+    box, fences = _box(len(d), d.__getitem__, whisker)
+    if fences is not None:
+        start = bisect.bisect_left(d, fences[0])
+        stop = bisect.bisect_right(d, fences[1])
+        box[0], box[-1] = d[start], d[stop - 1]
+        outliers.extend([index, v] for v in d[:start])
+        outliers.extend([index, v] for v in d[stop:])
+    boxes[index] = box
+
+
+def _stats_numpy(np, block, indices, whisker, boxes: list, outliers: list):
+    size = block.shape[1]
+    kth = {0, size - 1}
+    for k, m in _quartile_positions(size):
+        kth.update((k - 1, k) if m else (k - 1,))
+    block = np.partition(block, sorted(kth), axis=1)
+    columns = {i: block[:, i].tolist() for i in kth}
+    fences = []
+    for row, index in enumerate(indices):
+        box, fence = _box(size, lambda i: columns[i][row], whisker)
+        boxes[index] = box
+        fences.append(fence)
+    if whisker is None:
+        return
+    lows, highs = (np.array(f, dtype=float) for f in zip(*fences))
+    is_inside = (block >= lows[:, None]) & (block <= highs[:, None])
+    # the whisker ends are samples, of the type of the samples
+    rows = np.arange(len(block))
+    lows = block[rows, np.where(is_inside, block, np.inf).argmin(axis=1)].tolist()
+    highs = block[rows, np.where(is_inside, block, -np.inf).argmax(axis=1)].tolist()
+    for row, index in enumerate(indices):
+        boxes[index][0], boxes[index][-1] = lows[row], highs[row]
+    rows, cols = np.nonzero(~is_inside)
+    values = block[rows, cols]
+    order = np.lexsort((values, rows))
+    positions = np.asarray(indices)[rows[order]].tolist()
+    outliers.extend([[i, v] for i, v in zip(positions, values[order].tolist())])
+
+
+def _check_sizes(items) -> list:
+    sizes = [len(group) for group in items]
+    for index, size in enumerate(sizes):
+        if size == 0:
+            raise ValueError("group {} has no samples".format(index))
+    return sizes
+
+
+def box_stats(
+    items: Sequence[Sequence[Numeric]], whisker: Optional[Numeric] = None
+) -> Tuple[List[list], List[list]]:
+    """
+    Return the `[low, Q1, median, Q3, high]` box of every group, and the
+    `[group index, value]` outliers, sorted by group then by value.
+
+    :param items: The groups of samples, or a 2d array of one group per row.
+    :param whisker: The whiskers stop at the last samples within `whisker`
+                    times the interquartile range of the box, the samples
+                    beyond are outliers. By default, the whiskers go to the
+                    lowest and the highest samples, without outliers.
+    """
+    sizes = _check_sizes(items)
+    boxes, outliers = [None] * len(sizes), []
+    np = utils.optional_numpy()
+    if np is None:
+        for index, group in enumerate(items):
+            _stats_python(group, index, whisker, boxes, outliers)
+        return boxes, outliers
+
+    is_array = isinstance(items, np.ndarray)
+    by_size = {}
+    for index, size in enumerate(sizes):
+        by_size.setdefault(size, []).append(index)
+    for size, indices in by_size.items():
+        rows = max(1, _BLOCK_SIZE // size)
+        for start in range(0, len(indices), rows):
+            stop = start + rows
+            chunk = indices[start:stop]
+            if is_array:
+                first, last = chunk[0], chunk[-1] + 1
+                block = items[first:last]
+            else:
+                block = np.asarray([items[i] for i in chunk])
+            _stats_numpy(np, block, chunk, whisker, boxes, outliers)
+    if len(by_size) > 1:
+        outliers.sort(key=lambda o: o[0])
+    return boxes, outliers
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch of a stream of numbers. Samples go through levels of
+    compactors, a full compactor keeping every other one of its sorted
+    samples, each at twice its weight, for the level above. The lowest and
+    highest samples are kept exactly.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = 0):
+        if k < 8:
+            raise ValueError("the sketch size must be at least 8, got {}".format(k))
+        self.k = k
+        self.count = 0
+        self.low = self.high = None
+        self._levels = [[]]
+        self._random = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, int(self.k * (2 / 3) ** depth))
+
+    def _size(self) -> int:
+        return sum(len(items) for items in self._levels)
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(level) for level in range(len(self._levels)))
+
+    def _compress(self):
+        # compactions are lazy: only the lowest full level is compacted, and
+        # only once the sketch as a whole is full
+        for level, items in enumerate(self._levels):
+            if len(items) < self._capacity(level):
+                continue
+            if level + 1 == len(self._levels):
+                self._levels.append([])
+            items.sort()
+            # an odd sample out stays at its level
+            kept = items.pop() if len(items) % 2 else None
+            offset = self._random.randint(0, 1)
+            self._levels[level + 1].extend(items[offset::2])
+            items[:] = [] if kept is None else [kept]
+            if self._size() < self._max_size():
+                return
+
+    def update(self, values: Iterable[Numeric]):
+        """
+        Add samples to the sketch.
+        """
+        values = iter(values)
+        while True:
+            # samples come in batches of at least k, which the sketch may
+            # hold beyond its capacity until they are compacted
+            room = max(self.k, self._max_size() - self._size())
+            batch = list(itertools.islice(values, room))
+            if not batch:
+                return self
+            self.count += len(batch)
+            low, high = min(batch), max(batch)
+            if self.low is None or low < self.low:
+                self.low = low
+            if self.high is None or high > self.high:
+                self.high = high
+            self._levels[0].extend(batch)
+            if self._size() >= self._max_size():
+                self._compress()
+
+    def quantile(self, q: float) -> Numeric:
+        """
+        Return the sample at about rank `q * count`.
+        """
+        if not self.count:
+            raise ValueError("the sketch has no samples")
+        weighted = sorted(
+            (v, 1 << level) for level, items in enumerate(self._levels) for v in items
+        )
+        total = sum(w for _, w in weighted)
+        rank, cumulative = q * total, 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= rank:
+                return min(max(value, self.low), self.high)
+        return self.high
+
+
+def sketch_stats(
+    items: Iterable[Iterable[Numeric]],
+    whisker: Optional[Numeric] = None,
+    k: int = 200,
+) -> List[list]:
+    """
+    Return the approximate `[low, Q1, median, Q3, high]` box of every group,
+    read once from iterators, see `KLLSketch`. With `whisker`, the whiskers
+    end at the fences, or at the lowest and highest samples when they are
+    within them. Outliers are not kept.
+    """
+    boxes = []
+    for index, group in enumerate(items):
+        sketch = KLLSketch(k).update(group)
+        if not sketch.count:
+            raise ValueError("group {} has no samples".format(index))
+        quartiles = [sketch.quantile(q) for q in (0.25, 0.5, 0.75)]
+        low, high = sketch.low, sketch.high
+        if whisker is not None:
+            spread = whisker * (quartiles[2] - quartiles[0])
+            low = max(low, quartiles[0] - spread)
+            high = min(high, quartiles[2] + spread)
+        boxes.append([low] + quartiles + [high])
+    return boxes
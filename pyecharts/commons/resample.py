@@ -0,0 +1,315 @@
+"""
+Resampling of trades into OHLC(V) bars, `[open, close, low, high]` as the
+candlesticks of `Kline` take them, plus the traded volume.
+
+Trades are timestamps, prices and optional volumes. Timestamps are numbers,
+or dates, datetimes and ISO strings taken as epoch milliseconds, see
+`pyramid.axis_values`. A trade at `t` goes to the bar starting at
+`origin + k * interval` with `k = floor((t - origin) / interval)`. Intervals
+without any trade get no bar.
+"""
+
+import datetime
+import itertools
+import math
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from . import pyramid, utils
+
+Numeric = Union[int, float]
+Interval = Union[Numeric, datetime.timedelta]
+
+_DAY_MS = 86400 * 1000
+
+
+def _interval(interval: Interval) -> float:
+    if isinstance(interval, datetime.timedelta):
+        interval = interval.total_seconds() * 1000
+    if not interval > 0:
+        raise ValueError("the interval must be positive, got {}".format(interval))
+    return float(interval)
+
+
+def _timestamps(timestamps: Sequence) -> List[float]:
+    np = utils.optional_numpy()
+    if np is not None and isinstance(timestamps, np.ndarray):
+        if timestamps.dtype.kind in "iuf":
+            return timestamps.astype(float)
+    values, _ = pyramid.axis_values(timestamps)
+    return values
+
+
+class Bars:
+    """
+    OHLC(V) bars, as columns: the start of every bar, its `[open, close,
+    low, high]` row and its volume, 0 when trades have no volume.
+    """
+
+    __slots__ = ("starts", "rows", "volumes")
+
+    def __init__(self, starts: list, rows: list, volumes: list):
+        self.starts = starts
+        self.rows = rows
+        self.volumes = volumes
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self):
+        return iter(zip(self.starts, self.rows, self.volumes))
+
+    def __add__(self, other: "Bars") -> "Bars":
+        return Bars(
+            self.starts + other.starts,
+            self.rows + other.rows,
+            self.volumes + other.volumes,
+        )
+
+
+def _aggregate_python(keys, opens, closes, lows, highs, volumes):
+    starts, rows, totals = [], [], []
+    for i, key in enumerate(keys):
+        if starts and starts[-1] == key:
+            row = rows[-1]
+            row[1] = closes[i]
+            row[2] = min(row[2], lows[i])
+            row[3] = max(row[3], highs[i])
+            totals[-1] += volumes[i]
+        else:
+            starts.append(key)
+            rows.append([opens[i], closes[i], lows[i], highs[i]])
+            totals.append(volumes[i])
+    return starts, rows, totals
+
+
+def _aggregate_numpy(np, keys, opens, closes, lows, highs, volumes):
+    firsts = np.concatenate(([0], np.flatnonzero(keys[1:] != keys[:-1]) + 1))
+    lasts = np.append(firsts[1:], len(keys)) - 1
+    columns = (
+        opens[firsts],
+        closes[lasts],
+        np.minimum.reduceat(lows, firsts),
+        np.maximum.reduceat(highs, firsts),
+    )
+    rows = np.column_stack(columns).tolist()
+    return keys[firsts].tolist(), rows, np.add.reduceat(volumes, firsts).tolist()
+
+
+def _aggregate(keys, opens, closes, lows, highs, volumes) -> tuple:
+    """
+    Merge the consecutive bars, or trades, of the same bucket key. Keys are
+    in order.
+    """
+    if len(keys) == 0:
+        return [], [], []
+    np = utils.optional_numpy()
+    if np is None:
+        return _aggregate_python(keys, opens, closes, lows, highs, volumes)
+    arrays = [np.asarray(c, dtype=float) for c in (opens, closes, lows, highs)]
+    volumes = np.asarray(volumes, dtype=float)
+    return _aggregate_numpy(np, np.asarray(keys, dtype=np.int64), *arrays, volumes)
+
+
+def _bucket_keys(timestamps, interval: float, origin: float):
+    np = utils.optional_numpy()
+    if np is None:
+        return [math.floor((t - origin) / interval) for t in timestamps]
+    timestamps = np.asarray(timestamps, dtype=float)
+    return np.floor((timestamps - origin) / interval).astype(np.int64)
+
+
+def _sorted(np, timestamps, *columns) -> tuple:
+    # trades are usually in order already, sorting is then skipped. They are
+    # sorted by time rather than by bar, the open and close of a bar being
+    # its earliest and latest trades
+    if np is None:
+        timestamps = list(timestamps)
+        if all(a <= b for a, b in zip(timestamps, timestamps[1:])):
+            return (timestamps,) + columns
+        order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
+        return tuple([c[i] for i in order] for c in (timestamps,) + columns)
+    timestamps = np.asarray(timestamps, dtype=float)
+    columns = tuple(np.asarray(c, dtype=float) for c in columns)
+    if len(timestamps) < 2 or (timestamps[1:] >= timestamps[:-1]).all():
+        return (timestamps,) + columns
+    order = np.argsort(timestamps, kind="stable")
+    return tuple(c[order] for c in (timestamps,) + columns)
+
+
+def _trade_bars(timestamps, prices, volumes, interval, origin) -> tuple:
+    if len(timestamps) != len(prices):
+        raise ValueError("there must be as many timestamps as prices")
+    if volumes is None:
+        volumes = [0.0] * len(prices)
+    elif len(volumes) != len(prices):
+        raise ValueError("there must be as many volumes as prices")
+    np = utils.optional_numpy()
+    if np is not None and utils.is_ndarray(prices):
+        prices = utils.as_ndarray(prices)
+    timestamps, prices, volumes = _sorted(np, _timestamps(timestamps), prices, volumes)
+    keys = _bucket_keys(timestamps, interval, origin)
+    return _aggregate(keys, prices, prices, prices, prices, volumes)
+
+
+def resample_ohlc(
+    timestamps: Sequence,
+    prices: Sequence,
+    interval: Interval,
+    volumes: Optional[Sequence] = None,
+    origin: Numeric = 0,
+) -> Bars:
+    """
+    Aggregate trades into OHLC(V) bars of `interval`.
+
+    :param timestamps: The time of every trade, in any order.
+    :param prices: The price of every trade.
+    :param interval: The length of a bar, in the unit of the timestamps,
+                     milliseconds for dates. A `timedelta` is turned into
+                     milliseconds.
+    :param volumes: The volume of every trade.
+    :param origin: The start of a bar, bars are aligned on it.
+    """
+    interval = _interval(interval)
+    keys, rows, totals = _trade_bars(timestamps, prices, volumes, interval, origin)
+    starts = [origin + key * interval for key in keys]
+    return Bars(starts, rows, totals)
+
+
+class OHLCResampler:
+    """
+    Aggregate trades into OHLC(V) bars of `interval` chunk by chunk, keeping
+    only the bar still open in memory. Chunks must come in time order, the
+    trades of a chunk may be in any order.
+    """
+
+    def __init__(self, interval: Interval, origin: Numeric = 0):
+        self.interval = _interval(interval)
+        self.origin = origin
+        # the key, [open, close, low, high] row and volume of the open bar
+        self._pending = None
+
+    def _bars(self, keys, rows, totals) -> Bars:
+        starts = [self.origin + key * self.interval for key in keys]
+        return Bars(starts, rows, totals)
+
+    def update(
+        self,
+        timestamps: Sequence,
+        prices: Sequence,
+        volumes: Optional[Sequence] = None,
+    ) -> Bars:
+        """
+        Add a chunk of trades and return the bars it closed.
+        """
+        keys, rows, totals = _trade_bars(
+            timestamps, prices, volumes, self.interval, self.origin
+        )
+        if not keys:
+            return Bars([], [], [])
+        if self._pending is not None:
+            key, row, total = self._pending
+            if keys[0] < key:
+                raise ValueError("chunks of trades must come in time order")
+            if keys[0] == key:
+                first = rows[0]
+                rows[0] = [
+                    row[0],
+                    first[1],
+                    min(row[2], first[2]),
+                    max(row[3], first[3]),
+                ]
+                totals[0] += total
+            else:
+                keys, rows, totals = [key] + keys, [row] + rows, [total] + totals
+        self._pending = (keys.pop(), rows.pop(), totals.pop())
+        return self._bars(keys, rows, totals)
+
+    def flush(self) -> Bars:
+        """
+        Close the open bar and return it.
+        """
+        if self._pending is None:
+            return Bars([], [], [])
+        key, row, total = self._pending
+        self._pending = None
+        return self._bars([key], [row], [total])
+
+
+def _chunks(ticks: Iterable, chunk_size: int):
+    ticks = iter(ticks)
+    while True:
+        chunk = list(itertools.islice(ticks, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def stream_ohlc(
+    ticks: Iterable[Sequence],
+    interval: Interval,
+    origin: Numeric = 0,
+    chunk_size: int = 65536,
+) -> Iterable[Bars]:
+    """
+    Aggregate an iterator of `(timestamp, price)` or `(timestamp, price,
+    volume)` trades in time order into OHLC(V) bars, `chunk_size` trades at
+    a time, and yield the bars of every chunk as they are closed. Memory
+    does not grow with the number of trades.
+    """
+    resampler = OHLCResampler(interval, origin)
+    for chunk in _chunks(ticks, chunk_size):
+        columns = list(zip(*chunk))
+        volumes = columns[2] if len(columns) > 2 else None
+        bars = resampler.update(list(columns[0]), list(columns[1]), volumes)
+        if len(bars):
+            yield bars
+    bars = resampler.flush()
+    if len(bars):
+        yield bars
+
+
+def bar_labels(starts: Sequence[float], interval: float, is_time: bool) -> list:
+    """
+    Return the x axis labels of bars: their start, as a date, a time to the
+    minute or a time to the second for bars of dates, as it is otherwise.
+    """
+    if not is_time:
+        return [int(s) if float(s).is_integer() else s for s in starts]
+    day = _DAY_MS
+    if interval % day == 0 and all(s % day == 0 for s in starts):
+        pattern = "%Y-%m-%d"
+    elif interval % 60000 == 0 and all(s % 60000 == 0 for s in starts):
+        pattern = "%Y-%m-%d %H:%M"
+    else:
+        pattern = "%Y-%m-%d %H:%M:%S"
+    epoch = datetime.datetime(1970, 1, 1)
+    return [
+        (epoch + datetime.timedelta(milliseconds=s)).strftime(pattern) for s in starts
+    ]
+
+
+def rebucket(
+    bars: Bars, interval: Interval, max_bars: int, origin: Numeric = 0
+) -> Tuple[Bars, float]:
+    """
+    Merge bars of `interval` into bars of a multiple of it, the smallest one
+    leaving at most `max_bars` bars, and return them with their interval.
+    """
+    interval = _interval(interval)
+    if len(bars) <= max_bars:
+        return bars, interval
+    if max_bars < 1:
+        raise ValueError("max_bars must be at least 1, got {}".format(max_bars))
+    first = math.floor((bars.starts[0] - origin) / interval)
+    last = math.floor((bars.starts[-1] - origin) / interval)
+    multiple = max(2, -(-(last - first + 1) // max_bars))
+    while True:
+        merged = interval * multiple
+        keys = _bucket_keys(bars.starts, merged, origin)
+        columns = list(zip(*bars.rows))
+        keys, rows, totals = _aggregate(keys, *columns, bars.volumes)
+        # bars not aligned on the merged interval may span one more bucket
+        if len(keys) <= max_bars:
+            starts = [origin + key * merged for key in keys]
+            return Bars(starts, rows, totals), merged
+        multiple += 1
@@ -1,17 +1,134 @@
+import functools
 import re
+import sys
+import weakref
 
-from ..datasets import EXTRA, FILENAMES
+from simplejson.encoder import encode_basestring_ascii
+
+from ..datasets import DEPENDENCY_RESOLVER
+
+_compile_pattern = functools.lru_cache(maxsize=256)(re.compile)
 
 
 class JsCode:
     def __init__(self, js_code: str):
-        self.js_code = "--x_x--0_0--" + js_code + "--x_x--0_0--"
+        self.js_code = js_code
 
     def replace(self, pattern: str, repl: str):
-        self.js_code = re.sub(pattern, repl, self.js_code)
+        self.js_code = _compile_pattern(pattern).sub(repl, self.js_code)
         return self
 
 
+def js_code_body(o: JsCode) -> str:
+    """
+    Return the javascript of a `JsCode` object as it is written into options,
+    with literal newlines and tabs dropped and escaped ones restored.
+    """
+    return (
+        o.js_code.replace("\n", "")
+        .replace("\t", "")
+        .replace("\\n", "\n")
+        .replace("\\t", "\t")
+    )
+
+
+class JsCodeRegistry:
+    """
+    Hands out unique tokens for `JsCode` objects so that they can go through
+    a plain JSON encoder, and splices the javascript back in a single linear
+    scan of the output. Tokens live as long as their `JsCode` object.
+    """
+
+    PREFIX = "__pyecharts_js_code_"
+    SUFFIX = "__"
+    # a token holds at most 16 hex digits, plus the quotes around it
+    MAX_TOKEN_SIZE = len(PREFIX) + 16 + len(SUFFIX) + 2
+
+    def __init__(self):
+        self._codes = weakref.WeakValueDictionary()
+
+    def token(self, o: JsCode) -> str:
+        key = "{:x}".format(id(o))
+        self._codes[key] = o
+        return self.PREFIX + key + self.SUFFIX
+
+    def splice(self, text: str, with_quotes: bool = False) -> str:
+        prefix, suffix = self.PREFIX, self.SUFFIX
+        start = text.find(prefix)
+        if start < 0:
+            return text
+        parts, pos = [], 0
+        while start >= 0:
+            end = text.find(suffix, start + len(prefix))
+            if end < 0:
+                break
+            key_start = start + len(prefix)
+            code = self._codes.get(text[key_start:end])
+            end += len(suffix)
+            if code is None:
+                parts.append(text[pos:end])
+            else:
+                body = encode_basestring_ascii(js_code_body(code))[1:-1]
+                if not with_quotes:
+                    # drop the quotes the JSON encoder put around the token
+                    if start > pos and text[start - 1] == '"':
+                        start -= 1
+                    if text.startswith('"', end):
+                        end += 1
+                parts.append(text[pos:start])
+                parts.append(body)
+            pos = end
+            start = text.find(prefix, pos)
+        parts.append(text[pos:])
+        return "".join(parts)
+
+    def splice_stream(self, chunks, with_quotes: bool = False):
+        """
+        Same as `splice` over an iterable of text chunks, tokens may span
+        chunk boundaries. Only the tail of a chunk which may hold the start
+        of a token is kept until the next chunk comes.
+        """
+        prefix, hold = self.PREFIX, self.MAX_TOKEN_SIZE
+        carry = ""
+        for chunk in chunks:
+            text = carry + chunk if carry else chunk
+            cut = len(text) - hold
+            if cut <= 0:
+                carry = text
+                continue
+            # do not cut a token, nor the quote in front of it
+            start = text.find(prefix, max(cut - hold, 0), cut + 1 + len(prefix))
+            if 0 <= start <= cut + 1:
+                cut = start - 1
+            if cut <= 0:
+                carry = text
+                continue
+            yield self.splice(text[:cut], with_quotes=with_quotes)
+            carry = text[cut:]
+        if carry:
+            yield self.splice(carry, with_quotes=with_quotes)
+
+
+JS_CODES = JsCodeRegistry()
+
+
+class ChartJsCode:
+    """
+    Javascript for the `js_functions` of a chart, in which `{chart}` stands
+    for the variable of the chart. It is only filled in when the chart is
+    rendered, notebooks give a chart a new id every time.
+    """
+
+    __slots__ = ("chart", "js_code")
+
+    def __init__(self, chart, js_code: str):
+        self.chart = chart
+        self.js_code = js_code
+
+    def __str__(self) -> str:
+        return self.js_code.replace("{chart}", "chart_" + self.chart.chart_id)
+
+
 class OrderedSet:
     def __init__(self, *args):
         self._values = dict()
@@ -32,26 +149,85 @@ def produce_require_dict(js_dependencies, js_host) -> dict:
         if name.startswith("https://api.map.baidu.com"):
             confs.append("'baidu_map_api{}':'{}'".format(len(name), name))
             libraries.append("'baidu_map_api{}'".format(len(name)))
-        if name in FILENAMES:
-            f, _ = FILENAMES[name]
-            confs.append("'{}':'{}{}'".format(name, js_host, f))
+        resolved = DEPENDENCY_RESOLVER.resolve(name)
+        if resolved is not None:
+            url, f, _ = resolved
+            confs.append("'{}':'{}{}'".format(name, url or js_host, f))
             libraries.append("'{}'".format(name))
-        else:
-            for url, files in EXTRA.items():
-                if name in files:
-                    f, _ = files[name]
-                    confs.append("'{}':'{}{}'".format(name, url, f))
-                    libraries.append("'{}'".format(name))
-                    break
     return dict(config_items=confs, libraries=libraries)
 
 
+def is_ndarray(obj) -> bool:
+    """
+    Whether `obj` is a numpy array or a pandas Series/Index/DataFrame.
+
+    numpy and pandas are optional, they are only looked up when the caller
+    has already imported them.
+    """
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(obj, np.ndarray):
+        return True
+    pd = sys.modules.get("pandas")
+    return pd is not None and isinstance(obj, (pd.Series, pd.Index, pd.DataFrame))
+
+
+def optional_numpy():
+    """
+    Return the numpy module, or None when it is not installed. The helpers of
+    `pyecharts.commons` use it to vectorize their work and fall back to pure
+    python giving the same results without it.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def as_ndarray(obj):
+    """
+    Convert a numpy/pandas object or a plain sequence to a numpy array without
+    copying when possible. DataFrames become record arrays, one field per column.
+    """
+    import numpy as np
+
+    pd = sys.modules.get("pandas")
+    if pd is not None:
+        if isinstance(obj, pd.DataFrame):
+            return obj.to_records(index=False)
+        if isinstance(obj, (pd.Series, pd.Index)):
+            return obj.to_numpy()
+    return np.asarray(obj)
+
+
+def zip_columns(*columns):
+    """
+    Zip columns into a record array truncated to the shortest column, so rows
+    are dumped as `[col0, col1, ...]` without building a list for every row.
+    """
+    import numpy as np
+
+    arrays = []
+    for c in columns:
+        a = as_ndarray(c)
+        if a.ndim == 2 and a.dtype.names is None:
+            arrays.extend(a.T)
+        else:
+            arrays.append(a)
+    size = min(len(a) for a in arrays)
+    return np.rec.fromarrays([a[:size] for a in arrays])
+
+
 def replace_placeholder(html: str) -> str:
-    return re.sub('"?--x_x--0_0--"?', "", html)
+    return JS_CODES.splice(html)
 
 
 def replace_placeholder_with_quotes(html: str) -> str:
-    return re.sub("--x_x--0_0--", "", html)
+    return JS_CODES.splice(html, with_quotes=True)
+
+
+def replace_placeholder_stream(chunks):
+    return JS_CODES.splice_stream(chunks)
 
 
 def _flat(obj):
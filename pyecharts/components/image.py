@@ -1,6 +1,5 @@
 import uuid
-
-from jinja2 import Environment
+from typing import TYPE_CHECKING
 
 from ..charts.mixins import ChartMixin
 from ..commons.utils import OrderedSet
@@ -9,6 +8,9 @@ from ..options import ComponentTitleOpts
 from ..render import engine
 from ..types import Optional, Union
 
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
 
 class Image(ChartMixin):
     def __init__(self, page_title: str = CurrentConfig.PAGE_TITLE, js_host: str = ""):
@@ -37,7 +39,7 @@ class Image(ChartMixin):
         self,
         path: str = "render.html",
         template_name: str = "components.html",
-        env: Optional[Environment] = None,
+        env: Optional["Environment"] = None,
         **kwargs,
     ) -> str:
         return engine.render(self, path, template_name, env, **kwargs)
@@ -45,7 +47,7 @@ class Image(ChartMixin):
     def render_embed(
         self,
         template_name: str = "components.html",
-        env: Optional[Environment] = None,
+        env: Optional["Environment"] = None,
         **kwargs,
     ) -> str:
         return engine.render_embed(self, template_name, env, **kwargs)
@@ -1,6 +1,6 @@
 import uuid
+from typing import TYPE_CHECKING
 
-from jinja2 import Environment
 from prettytable import PrettyTable
 
 from ..charts.mixins import ChartMixin
@@ -10,6 +10,9 @@ from ..options import ComponentTitleOpts
 from ..render import engine
 from ..types import Optional, Sequence, Union
 
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
 
 class Table(ChartMixin):
     def __init__(self, page_title: str = CurrentConfig.PAGE_TITLE, js_host: str = ""):
@@ -38,7 +41,7 @@ class Table(ChartMixin):
         self,
         path: str = "render.html",
         template_name: str = "components.html",
-        env: Optional[Environment] = None,
+        env: Optional["Environment"] = None,
         **kwargs,
     ) -> str:
         return engine.render(self, path, template_name, env, **kwargs)
@@ -46,7 +49,7 @@ class Table(ChartMixin):
     def render_embed(
         self,
         template_name: str = "components.html",
-        env: Optional[Environment] = None,
+        env: Optional["Environment"] = None,
         **kwargs,
     ) -> str:
         return engine.render_embed(self, template_name, env, **kwargs)
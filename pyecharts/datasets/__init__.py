@@ -1,75 +1,168 @@
+import collections
 import difflib
+import hashlib
 import os
+import pathlib
+import sys
+import threading
+import time
 import typing
 import urllib.request
+import warnings
 
 import simplejson as json
 
+from .coordinate_store import CoordinateStore, build_coordinate_store
+from .geojson import DOUGLAS_PEUCKER, build_map_scripts
+
 
 class FuzzyDict(dict):
     """Provides a dictionary that performs fuzzy lookup"""
 
-    def __init__(self, cutoff: float = 0.6):
+    def __init__(self, cutoff: float = 0.6, cache_size: int = 1024):
         """Construct a new FuzzyDict instance
 
         items is an dictionary to copy items from (optional)
         cutoff is the match ratio below which matches should not be considered
         cutoff needs to be a float between 0 and 1 (where zero is no match
-        and 1 is a perfect match)"""
+        and 1 is a perfect match)
+        cache_size is the number of fuzzy lookups whose result is kept"""
         super(FuzzyDict, self).__init__()
         self.cutoff = cutoff
+        self.cache_size = cache_size
 
         # short wrapper around some super (dict) methods
         self._dict_contains = lambda key: super(FuzzyDict, self).__contains__(key)
         self._dict_getitem = lambda key: super(FuzzyDict, self).__getitem__(key)
 
+        # character index of the string keys, built on the first fuzzy lookup
+        self._index = None
+        self._cache = collections.OrderedDict()
+        # charts rendered in several threads share the bundled datasets
+        self._cache_lock = threading.Lock()
+
+    def _changed(self):
+        self._index = None
+        with self._cache_lock:
+            self._cache.clear()
+
+    def __setitem__(self, key, value):
+        super(FuzzyDict, self).__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super(FuzzyDict, self).__delitem__(key)
+        self._changed()
+
+    def update(self, *args, **kwargs):
+        super(FuzzyDict, self).update(*args, **kwargs)
+        self._changed()
+
+    def setdefault(self, key, default=None):
+        self._changed()
+        return super(FuzzyDict, self).setdefault(key, default)
+
+    def pop(self, *args):
+        self._changed()
+        return super(FuzzyDict, self).pop(*args)
+
+    def popitem(self):
+        self._changed()
+        return super(FuzzyDict, self).popitem()
+
+    def clear(self):
+        super(FuzzyDict, self).clear()
+        self._changed()
+
+    def _build_index(self):
+        keys, postings = [], {}
+        for key in super(FuzzyDict, self).__iter__():
+            if not isinstance(key, str):
+                continue
+            for char, count in collections.Counter(key).items():
+                postings.setdefault(char, []).append((len(keys), count))
+            keys.append(key)
+        self._index = keys, postings
+        return self._index
+
     def _search(self, lookfor: typing.Any, stop_on_first: bool = False):
         """Returns the value whose key best matches lookfor
 
         if stop_on_first is True then the method returns as soon
-        as it finds the first item
+        as it finds an item that matches
         """
 
         # if the item is in the dictionary then just return it
         if self._dict_contains(lookfor):
             return True, lookfor, self._dict_getitem(lookfor), 1
 
+        cache_key = (lookfor, stop_on_first)
+        with self._cache_lock:
+            result = self._cache.get(cache_key)
+            if result is not None:
+                self._cache.move_to_end(cache_key)
+                return result
+        result = self._fuzzy_search(lookfor, stop_on_first)
+        if self.cache_size:
+            with self._cache_lock:
+                self._cache[cache_key] = result
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return result
+
+    def _fuzzy_search(self, lookfor: typing.Any, stop_on_first: bool):
+        # only strings can be fuzzy matched
+        if not isinstance(lookfor, str):
+            return False, None, None, 0
+        index = self._index
+        if index is None:
+            index = self._build_index()
+        keys, postings = index
+
+        # number of characters each key shares with lookfor, keys without any
+        # shared character have a ratio of 0
+        shared = {}
+        for char, count in collections.Counter(lookfor).items():
+            for i, key_count in postings.get(char, ()):
+                shared[i] = shared.get(i, 0) + min(count, key_count)
+        # `SequenceMatcher.quick_ratio` of every candidate, an upper bound of
+        # its ratio, best candidates first and then in the order of the keys
+        candidates = sorted(
+            (-2.0 * m / (len(lookfor) + len(keys[i])), i) for i, m in shared.items()
+        )
+
         # set up the fuzzy matching tool
         ratio_calc = difflib.SequenceMatcher()
         ratio_calc.set_seq1(lookfor)
 
-        # test each key in the dictionary
         best_ratio = 0
-        best_match = None
-        best_key = None
-        for key in self:
-            # if the current key is not a string
-            # then we just skip it
-            try:
-                # set up the SequenceMatcher with other text
-                ratio_calc.set_seq2(key)
-            except TypeError:
-                continue
-
-            # we get an error here if the item to look for is not a
-            # string - if it cannot be fuzzy matched and we are here
-            # this it is definitely not in the dictionary
-            try:
-                # calculate the match value
-                ratio = ratio_calc.ratio()
-            except TypeError:
+        best_index = None
+        for bound, i in candidates:
+            # no candidate left can beat the best match
+            if -bound < best_ratio or (stop_on_first and -bound < self.cutoff):
                 break
+            ratio_calc.set_seq2(keys[i])
+            ratio = ratio_calc.ratio()
 
-            # if this is the best ratio so far - save it and the value
-            if ratio > best_ratio:
+            # on equal ratios the first key wins, like in a scan of the keys
+            if ratio > best_ratio or (
+                ratio == best_ratio and best_index is not None and i < best_index
+            ):
                 best_ratio = ratio
-                best_key = key
-                best_match = self._dict_getitem(key)
+                best_index = i
 
             if stop_on_first and ratio >= self.cutoff:
                 break
 
-        return best_ratio >= self.cutoff, best_key, best_match, best_ratio
+        if best_index is None:
+            return best_ratio >= self.cutoff, None, None, best_ratio
+        best_key = keys[best_index]
+        return (
+            best_ratio >= self.cutoff,
+            best_key,
+            self._dict_getitem(best_key),
+            best_ratio,
+        )
 
     def __contains__(self, item: typing.Any):
         if self._search(item, True)[0]:
@@ -89,53 +182,369 @@ class FuzzyDict(dict):
         return item
 
 
+class CoordinateOverlay:
+    """
+    Coordinates added to a single chart, layered over a shared base such as
+    `COORDINATES` which is never written to. Charts rendered concurrently do
+    not see each other's coordinates, and the base does not grow.
+
+    With `max_size`, only the most recently used added coordinates are kept.
+    """
+
+    def __init__(self, base: FuzzyDict, max_size: typing.Optional[int] = None):
+        self.base = base
+        self.max_size = max_size
+        self.added = FuzzyDict(cutoff=getattr(base, "cutoff", 0.6))
+        # names of the added coordinates, least recently used first. Hits only
+        # reorder them, the fuzzy index of `added` is kept
+        self._recency = collections.OrderedDict()
+
+    def add(self, name: str, coordinate: typing.Sequence):
+        self.added[name] = coordinate
+        if self.max_size is None:
+            return
+        self._recency[name] = None
+        self._recency.move_to_end(name)
+        if len(self._recency) > self.max_size:
+            oldest, _ = self._recency.popitem(last=False)
+            del self.added[oldest]
+
+    def update(self, coords: dict):
+        for name, coordinate in coords.items():
+            self.add(name, coordinate)
+
+    def get_exact(self, name: str) -> typing.Optional[typing.Sequence]:
+        if dict.__contains__(self.added, name):
+            if self.max_size is not None:
+                self._recency.move_to_end(name)
+            return dict.__getitem__(self.added, name)
+        if dict.__contains__(self.base, name):
+            return dict.__getitem__(self.base, name)
+        return None
+
+    def search(self, name: str) -> typing.Optional[typing.Sequence]:
+        """
+        Fuzzy lookup over both layers, the best match wins and the base wins
+        ties, as if the added coordinates were appended to it.
+        """
+        if not isinstance(self.base, FuzzyDict):
+            return self.base.get(name)
+        result = self.base._search(name)
+        if self.added:
+            added = self.added._search(name)
+            if added[3] > result[3]:
+                result = added
+        is_matched, _, coordinate, _ = result
+        return coordinate if is_matched else None
+
+    def __len__(self) -> int:
+        return len(self.added)
+
+
 __HERE = os.path.abspath(os.path.dirname(__file__))
-with open(os.path.join(__HERE, "map_filename.json"), "r", encoding="utf8") as f:
-    FILENAMES: FuzzyDict = FuzzyDict()
-    for k, v in json.load(f).items():
-        FILENAMES[k] = v
+# bundled datasets, parsed on first access through the module `__getattr__`
+_DATASET_FILES = {
+    "FILENAMES": "map_filename.json",
+    "COORDINATES": "city_coordinates.json",
+}
+_DATASET_LOCK = threading.Lock()
+
+
+def _dataset(name: str) -> FuzzyDict:
+    dataset = globals().get(name)
+    if dataset is not None:
+        return dataset
+    with _DATASET_LOCK:
+        dataset = globals().get(name)
+        if dataset is None:
+            path = os.path.join(__HERE, _DATASET_FILES[name])
+            with open(path, "r", encoding="utf8") as f:
+                dataset = FuzzyDict()
+                dataset.update(json.load(f))
+            globals()[name] = dataset
+    return dataset
+
+
+def __getattr__(name: str):
+    if name in _DATASET_FILES:
+        return _dataset(name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+# module `__getattr__` (PEP 562) needs Python 3.7, older ones load the
+# datasets up front
+if sys.version_info < (3, 7):
+    for _name in _DATASET_FILES:
+        _dataset(_name)
 
-with open(os.path.join(__HERE, "city_coordinates.json"), "r", encoding="utf8") as f:
-    COORDINATES: FuzzyDict = FuzzyDict()
-    for k, v in json.load(f).items():
-        COORDINATES[k] = v
 
 EXTRA = {}
+# files built by pyecharts, such as the maps of `register_geojson`
+CACHE_DIR = os.environ.get("PYECHARTS_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "pyecharts"
+)
+# coordinate stores registered with `register_coord_store`
+COORDINATE_STORES = []
 
 
-def register_url(asset_url: str):
-    if asset_url:
-        registry = asset_url + "/registry.json"
+class DependencyResolver:
+    """
+    Resolve javascript dependencies to their files by exact name, from
+    `FILENAMES` first and then from the urls registered in `EXTRA`.
+    Results are memoized until more files are registered.
+
+    Fuzzy matching of `FILENAMES` scans all of its keys on every miss, it is
+    only tried as a last resort when `is_fuzzy` is set. Its results are
+    memoized as well.
+    """
+
+    def __init__(
+        self,
+        filenames: typing.Optional[FuzzyDict] = None,
+        extra: typing.Optional[dict] = None,
+        is_fuzzy: bool = False,
+    ):
+        # `FILENAMES` and `EXTRA` by default, `FILENAMES` is loaded on first use
+        self._filenames = filenames
+        self.extra = EXTRA if extra is None else extra
+        self.is_fuzzy = is_fuzzy
+        self._cache = {}
+        self._stamp = None
+
+    @property
+    def filenames(self) -> FuzzyDict:
+        if self._filenames is None:
+            return _dataset("FILENAMES")
+        return self._filenames
+
+    def clear(self):
+        self._cache.clear()
+
+    def resolve(self, name: str) -> typing.Optional[tuple]:
+        """
+        Return `(url, file name, extension)` of a dependency, where `url` is
+        None for the files served by the js host, or None for unknown ones.
+        """
+        # registering files through the dicts themselves is picked up too
+        stamp = (
+            len(self.filenames),
+            len(self.extra),
+            sum(len(files) for files in self.extra.values()),
+        )
+        if stamp != self._stamp:
+            self._cache.clear()
+            self._stamp = stamp
+        key = (name, self.is_fuzzy)
+        if key not in self._cache:
+            self._cache[key] = self._lookup(name)
+        return self._cache[key]
+
+    def _lookup(self, name: str) -> typing.Optional[tuple]:
+        filenames = self.filenames
+        if dict.__contains__(filenames, name):
+            f, ext = dict.__getitem__(filenames, name)
+            return None, f, ext
+        for url, files in self.extra.items():
+            if name in files:
+                f, ext = files[name]
+                return url, f, ext
+        if self.is_fuzzy and isinstance(filenames, FuzzyDict):
+            matched, _, value, _ = filenames._search(name)
+            if matched:
+                f, ext = value
+                return None, f, ext
+        return None
+
+
+DEPENDENCY_RESOLVER = DependencyResolver()
+
+
+# registries of `register_url` are downloaded again once older than this
+REGISTRY_MAX_AGE = 7 * 24 * 3600
+# bumped whenever the cached registries change
+_REGISTRY_CACHE_VERSION = 1
+
+
+def _parse_registry(asset_url: str, contents: dict) -> typing.Tuple[str, dict]:
+    files = {}
+    pinyin_names = set()
+    for name, pinyin in contents["PINYIN_MAP"].items():
+        file_name = contents["FILE_MAP"][pinyin]
+        files[name] = [file_name, "js"]
+        pinyin_names.add(pinyin)
+
+    for key, file_name in contents["FILE_MAP"].items():
+        if key not in pinyin_names:
+            # English names
+            files[key] = [file_name, "js"]
+
+    js_folder_name = contents["JS_FOLDER"]
+    if js_folder_name == "/":
+        js_file_prefix = f"{asset_url}/"
+    else:
+        js_file_prefix = f"{asset_url}/{js_folder_name}/"
+    return js_file_prefix, files
+
+
+def _fetch_registry(asset_url: str, timeout: float, retries: int) -> dict:
+    registry = asset_url + "/registry.json"
+    for attempt in range(retries + 1):
         try:
-            contents = urllib.request.urlopen(registry).read()
-            contents = json.loads(contents)
-        except Exception as e:
-            raise e
-        files = {}
-        pinyin_names = set()
-        for name, pinyin in contents["PINYIN_MAP"].items():
-            file_name = contents["FILE_MAP"][pinyin]
-            files[name] = [file_name, "js"]
-            pinyin_names.add(pinyin)
-
-        for key, file_name in contents["FILE_MAP"].items():
-            if key not in pinyin_names:
-                # English names
-                files[key] = [file_name, "js"]
-
-        js_folder_name = contents["JS_FOLDER"]
-        if js_folder_name == "/":
-            js_file_prefix = f"{asset_url}/"
+            contents = urllib.request.urlopen(registry, timeout=timeout).read()
+            return json.loads(contents)
+        except OSError:
+            if attempt == retries:
+                raise
+            time.sleep(0.5 * 2 ** attempt)
+
+
+def _registry_cache_path(asset_url: str) -> str:
+    digest = hashlib.sha256(asset_url.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, "registry", digest + ".json")
+
+
+def _read_registry_cache(asset_url: str) -> typing.Optional[dict]:
+    try:
+        with open(_registry_cache_path(asset_url), "r", encoding="utf8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("version") != _REGISTRY_CACHE_VERSION:
+        return None
+    if cached.get("url") != asset_url:
+        return None
+    return cached
+
+
+def _write_registry_cache(asset_url: str, prefix: str, files: dict):
+    path = _registry_cache_path(asset_url)
+    cached = {
+        "version": _REGISTRY_CACHE_VERSION,
+        "url": asset_url,
+        "fetched": time.time(),
+        "prefix": prefix,
+        "files": files,
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # written aside first, a concurrent start never reads half a file
+        partial = "{}.{}.tmp".format(path, os.getpid())
+        with open(partial, "w", encoding="utf8") as f:
+            json.dump(cached, f, ensure_ascii=False)
+        os.replace(partial, path)
+    except OSError as e:
+        warnings.warn("registry of {} not cached: {}".format(asset_url, e))
+
+
+def register_url(
+    asset_url: str,
+    is_refresh: bool = False,
+    max_age: typing.Optional[float] = None,
+    timeout: float = 10,
+    retries: int = 2,
+):
+    """
+    Register the maps of an asset host, listed in its `registry.json`.
+
+    The registry is cached under `CACHE_DIR/registry` and reused without
+    network until it is older than `max_age` seconds (`REGISTRY_MAX_AGE` by
+    default). When it can not be downloaded again, the stale copy is used
+    instead, unless the registry is refreshed.
+
+    :param is_refresh: Download the registry even if its copy is still valid,
+                       see `refresh_url`.
+    :param timeout: The timeout of a download, in seconds.
+    :param retries: The number of times a failed download is tried again.
+    """
+    if asset_url:
+        max_age = REGISTRY_MAX_AGE if max_age is None else max_age
+        cached = _read_registry_cache(asset_url)
+        is_valid = cached is not None and time.time() - cached["fetched"] < max_age
+        if is_valid and not is_refresh:
+            prefix, files = cached["prefix"], cached["files"]
         else:
-            js_file_prefix = f"{asset_url}/{js_folder_name}/"
-        EXTRA[js_file_prefix] = files
+            try:
+                contents = _fetch_registry(asset_url, timeout, retries)
+            except OSError as e:
+                if cached is None or is_refresh:
+                    raise e
+                warnings.warn(
+                    "registry of {} not downloaded, reusing a copy of {}: {}".format(
+                        asset_url, time.ctime(cached["fetched"]), e
+                    )
+                )
+                prefix, files = cached["prefix"], cached["files"]
+            else:
+                prefix, files = _parse_registry(asset_url, contents)
+                _write_registry_cache(asset_url, prefix, files)
+        EXTRA[prefix] = files
+        DEPENDENCY_RESOLVER.clear()
+
+
+def refresh_url(asset_url: str, timeout: float = 10, retries: int = 2):
+    """
+    Download the registry of an asset host again, update its cached copy and
+    register its maps, see `register_url`.
+    """
+    register_url(asset_url, is_refresh=True, timeout=timeout, retries=retries)
 
 
 def register_files(asset_files: dict):
     if asset_files:
-        FILENAMES.update(asset_files)
+        _dataset("FILENAMES").update(asset_files)
+        DEPENDENCY_RESOLVER.clear()
 
 
 def register_coords(coords: dict):
     if coords:
-        COORDINATES.update(coords)
+        _dataset("COORDINATES").update(coords)
+
+
+def register_coord_store(path: str) -> CoordinateStore:
+    """
+    Open a coordinate store built with `build_coordinate_store` and look
+    coordinates up in it, after the exact names of `COORDINATES`.
+    """
+    store = CoordinateStore(path)
+    COORDINATE_STORES.append(store)
+    return store
+
+
+def register_geojson(
+    name: str,
+    path: str,
+    tolerances: typing.Sequence[float] = (0,),
+    method: str = DOUGLAS_PEUCKER,
+    quantization: int = 1024,
+    cache_dir: typing.Optional[str] = None,
+    url_prefix: typing.Optional[str] = None,
+) -> typing.List[str]:
+    """
+    Register a GeoJSON map to `Map`, `Geo` and `Map3D`, at one resolution per
+    tolerance, see `pyecharts.datasets.geojson`. The map scripts are built
+    once and then reused from `cache_dir`.
+
+    Return the names of the maps: `name` for the first tolerance and
+    `name@tolerance` for the following ones.
+
+    :param tolerances: The simplification tolerance of every resolution, in
+                       degrees (squared for Visvalingam), 0 keeps every position.
+    :param method: `douglas-peucker` or `visvalingam`.
+    :param quantization: The number of steps per degree coordinates are
+                         rounded to.
+    :param cache_dir: The folder of the map scripts, `CACHE_DIR/maps` by default.
+    :param url_prefix: The url the folder is served at, the scripts are linked
+                       as local files by default.
+    """
+    cache_dir = cache_dir or os.path.join(CACHE_DIR, "maps")
+    levels = {}
+    for i, tolerance in enumerate(tolerances):
+        levels[name if i == 0 else "{}@{}".format(name, tolerance)] = tolerance
+    paths = build_map_scripts(path, levels, cache_dir, method, quantization)
+    if url_prefix is None:
+        url_prefix = pathlib.Path(cache_dir).resolve().as_uri() + "/"
+    files = EXTRA.setdefault(url_prefix, {})
+    for map_name, script in paths.items():
+        files[map_name] = [os.path.splitext(os.path.basename(script))[0], "js"]
+    DEPENDENCY_RESOLVER.clear()
+    return list(paths)
@@ -0,0 +1,157 @@
+"""
+On-disk coordinate store for very large gazetteers.
+
+Names are kept sorted in a single file along with their coordinates as
+packed little-endian float64 pairs. The file is opened with `mmap`, so that
+a store takes no python memory per entry and is shared by every process
+which opens it. Build one with:
+
+    $ python -m pyecharts.datasets.coordinate_store coords.json coords.bin
+"""
+
+import argparse
+import bisect
+import mmap
+import struct
+import sys
+from array import array
+from typing import Iterator, List, Mapping, Optional, Sequence, Union
+
+import simplejson as json
+
+_MAGIC = b"PYECRD01"
+# magic, number of entries, size of the names
+_HEADER = struct.Struct("<8sQQ")
+_OFFSETS = struct.Struct("<QQ")
+_COORDINATE = struct.Struct("<2d")
+# every n-th name is kept in memory to narrow binary searches down
+_SPARSE_STEP = 128
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def build_coordinate_store(coords: Union[Mapping, str], path: str) -> int:
+    """
+    Write a coordinate store and return its number of entries.
+
+    :param coords: A dict of name -> [longitude, latitude], or the path of
+                   a JSON file holding one.
+    :param path: The file to write the store to.
+    """
+    if isinstance(coords, str):
+        with open(coords, "r", encoding="utf-8") as f:
+            coords = json.load(f)
+    entries = sorted((str(k).encode("utf-8"), v) for k, v in coords.items())
+
+    offsets, values = array("Q", [0]), array("d")
+    for name, (lng, lat) in entries:
+        offsets.append(offsets[-1] + len(name))
+        values.append(float(lng))
+        values.append(float(lat))
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(entries), offsets[-1]))
+        f.write(_little_endian(offsets))
+        f.write(_little_endian(values))
+        for name, _ in entries:
+            f.write(name)
+    return len(entries)
+
+
+class CoordinateStore:
+    """
+    Read-only mapping of name -> [longitude, latitude] backed by a file
+    written by `build_coordinate_store`. Names are matched exactly, with a
+    binary search over the sorted names.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._size, _ = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            self._mmap.close()
+            raise ValueError("{} is not a coordinate store".format(path))
+        self._offsets = _HEADER.size
+        self._values = self._offsets + 8 * (self._size + 1)
+        self._names = self._values + _COORDINATE.size * self._size
+        self._sparse = None
+
+    def _name(self, index: int) -> bytes:
+        start, stop = _OFFSETS.unpack_from(self._mmap, self._offsets + 8 * index)
+        offset = self._names
+        return self._mmap[offset + start:offset + stop]
+
+    def _find(self, name: str) -> int:
+        try:
+            key = name.encode("utf-8")
+        except AttributeError:
+            return -1
+        if self._sparse is None:
+            self._sparse = [self._name(i) for i in range(0, self._size, _SPARSE_STEP)]
+        block = bisect.bisect_right(self._sparse, key) - 1
+        if block < 0:
+            return -1
+        low = block * _SPARSE_STEP
+        high = end = min(low + _SPARSE_STEP, self._size)
+        while low < high:
+            middle = (low + high) // 2
+            if self._name(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < end and self._name(low) == key:
+            return low
+        return -1
+
+    def get(self, name: str, default=None) -> Optional[List[float]]:
+        index = self._find(name)
+        if index < 0:
+            return default
+        offset = self._values + _COORDINATE.size * index
+        return list(_COORDINATE.unpack_from(self._mmap, offset))
+
+    def __getitem__(self, name: str) -> List[float]:
+        coordinate = self.get(name)
+        if coordinate is None:
+            raise KeyError(name)
+        return coordinate
+
+    def __contains__(self, name) -> bool:
+        return self._find(name) >= 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._size):
+            yield self._name(index).decode("utf-8")
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Build a coordinate store from a JSON file of "
+        "name -> [longitude, latitude]."
+    )
+    parser.add_argument("source", help="JSON file to read the coordinates from")
+    parser.add_argument("target", help="file to write the store to")
+    args = parser.parse_args(argv)
+    count = build_coordinate_store(args.source, args.target)
+    print("{} coordinates written to {}".format(count, args.target))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Build map scripts out of GeoJSON files, at several resolutions.
+
+Polygons are simplified with Douglas-Peucker or Visvalingam-Whyatt, their
+coordinates are quantized and delta encoded into strings, with the
+compressed GeoJSON format echarts decodes on `registerMap`. Every output is
+written once to a cache folder, under a name derived from the hash of the
+GeoJSON file and of the build parameters.
+"""
+
+import hashlib
+import heapq
+import math
+import os
+import re
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import simplejson as json
+
+DOUGLAS_PEUCKER = "douglas-peucker"
+VISVALINGAM = "visvalingam"
+
+# bumped whenever the scripts change, so that stale outputs are not reused
+_FORMAT_VERSION = 1
+# deltas are written as UTF-16 code units, kept under the surrogates
+_MAX_DELTA = (0xD800 - 64) // 2 - 1
+
+_MAP_SCRIPT = """(function (root, factory) {{
+    if (typeof define === 'function' && define.amd) {{
+        define(['exports', 'echarts'], factory);
+    }} else if (typeof exports === 'object' && typeof exports.nodeName !== 'string') {{
+        factory(exports, require('echarts'));
+    }} else {{
+        factory({{}}, root.echarts);
+    }}
+}}(this, function (exports, echarts) {{
+    echarts.registerMap({name}, {geojson});
+}}));
+"""
+
+
+def _segment_distance(point, start, end) -> float:
+    (x, y), (x0, y0), (x1, y1) = point[:2], start[:2], end[:2]
+    dx, dy = x1 - x0, y1 - y0
+    if dx == 0 and dy == 0:
+        return math.hypot(x - x0, y - y0)
+    return abs(dy * (x - x0) - dx * (y - y0)) / math.hypot(dx, dy)
+
+
+def _delta(start, end) -> Tuple[float, float]:
+    return end[0] - start[0], end[1] - start[1]
+
+
+def _farthest(points, first: int, last: int) -> Tuple[int, float]:
+    (x0, y0), (x1, y1) = points[first][:2], points[last][:2]
+    dx, dy = x1 - x0, y1 - y0
+    if dx == 0 and dy == 0:
+        index, distance = -1, -1.0
+        for i in range(first + 1, last):
+            d = _segment_distance(points[i], points[first], points[last])
+            if d > distance:
+                index, distance = i, d
+        return index, distance
+    # the largest cross product is the largest distance to the segment
+    index, cross = -1, -1.0
+    for i in range(first + 1, last):
+        x, y = points[i][:2]
+        c = abs(dy * (x - x0) - dx * (y - y0))
+        if c > cross:
+            index, cross = i, c
+    return index, cross / math.hypot(dx, dy)
+
+
+def _douglas_peucker(points: Sequence, tolerance: float) -> List[int]:
+    # a ring starts and ends on the same position, it is split on the
+    # position farthest from its start and on the one farthest from that cut
+    last = len(points) - 1
+    far = max(range(last), key=lambda i: math.hypot(*_delta(points[0], points[i])))
+    third, _ = max(
+        (_farthest(points, 0, far), _farthest(points, far, last)), key=lambda x: x[1]
+    )
+    kept = {0, far, last, third}
+    stack = [(0, far), (far, last)]
+    while stack:
+        first, end = stack.pop()
+        index, distance = _farthest(points, first, end)
+        if index >= 0 and distance > tolerance:
+            kept.add(index)
+            stack.append((first, index))
+            stack.append((index, end))
+    return sorted(i for i in kept if i >= 0)
+
+
+def _area(a, b, c) -> float:
+    return abs((b[0] - a[0]) * (c[1] - a[1]) - (c[0] - a[0]) * (b[1] - a[1])) / 2
+
+
+def _visvalingam(points: Sequence, min_area: float) -> List[int]:
+    count = len(points)
+    previous = list(range(-1, count - 1))
+    following = list(range(1, count + 1))
+    areas = [math.inf] * count
+    heap = []
+    for i in range(1, count - 1):
+        areas[i] = _area(points[i - 1], points[i], points[i + 1])
+        heap.append((areas[i], i))
+    heapq.heapify(heap)
+    removed = [False] * count
+    # a ring keeps at least a triangle
+    remaining = count
+    while heap and remaining > 4:
+        area, i = heapq.heappop(heap)
+        if removed[i] or area != areas[i]:
+            continue
+        if area > min_area:
+            break
+        removed[i] = True
+        remaining -= 1
+        p, n = previous[i], following[i]
+        following[p], previous[n] = n, p
+        for j in (p, n):
+            if 0 < j < count - 1:
+                # the area of a triangle never drops below the removed one
+                areas[j] = max(
+                    area, _area(points[previous[j]], points[j], points[following[j]])
+                )
+                heapq.heappush(heap, (areas[j], j))
+    return [i for i in range(count) if not removed[i]]
+
+
+def simplify_ring(ring: Sequence, tolerance: float, method: str = DOUGLAS_PEUCKER):
+    """
+    Simplify a closed ring of `[x, y]` positions, down to a triangle at most.
+
+    :param tolerance: The largest distance a removed position may be from
+                      the simplified ring, or for Visvalingam, the largest
+                      area of the triangle it makes with its neighbours.
+    """
+    if method not in (DOUGLAS_PEUCKER, VISVALINGAM):
+        raise ValueError("unknown simplification method: {}".format(method))
+    if tolerance <= 0 or len(ring) <= 4:
+        return list(ring)
+    if method == DOUGLAS_PEUCKER:
+        kept = _douglas_peucker(ring, tolerance)
+    else:
+        kept = _visvalingam(ring, tolerance)
+    return [ring[i] for i in kept]
+
+
+def _polygons(geometry: dict) -> Optional[list]:
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+    return None
+
+
+def simplify_geojson(
+    geojson: dict, tolerance: float, method: str = DOUGLAS_PEUCKER
+) -> dict:
+    """
+    Return a copy of a GeoJSON FeatureCollection whose polygons are simplified
+    with `simplify_ring`. Other geometries are left as they are.
+    """
+    features = []
+    for feature in geojson["features"]:
+        geometry = feature.get("geometry")
+        polygons = _polygons(geometry) if geometry else None
+        if polygons is not None:
+            coordinates = [
+                [simplify_ring(ring, tolerance, method) for ring in polygon]
+                for polygon in polygons
+            ]
+            if geometry["type"] == "Polygon":
+                coordinates = coordinates[0]
+            feature = dict(feature, geometry=dict(geometry, coordinates=coordinates))
+        features.append(feature)
+    return dict(geojson, features=features)
+
+
+def _zigzag(value: int) -> int:
+    return 2 * value if value >= 0 else -2 * value - 1
+
+
+def _encode_ring(ring: Sequence, scale: float) -> Tuple[str, List[int]]:
+    positions = [(round(x * scale), round(y * scale)) for x, y, *_ in ring]
+    chars = []
+    px, py = positions[0]
+    for x, y in positions:
+        dx, dy = x - px, y - py
+        if dx == 0 and dy == 0 and chars:
+            continue
+        # long steps are cut into shorter ones on the same line
+        steps = max(1, math.ceil(max(abs(dx), abs(dy)) / _MAX_DELTA))
+        ox, oy = px, py
+        for step in range(1, steps + 1):
+            sx, sy = ox + round(dx * step / steps), oy + round(dy * step / steps)
+            chars.append(chr(_zigzag(sx - px) + 64) + chr(_zigzag(sy - py) + 64))
+            px, py = sx, sy
+    return "".join(chars), list(positions[0])
+
+
+def encode_geojson(geojson: dict, scale: int = 1024) -> dict:
+    """
+    Quantize the polygons of a GeoJSON FeatureCollection to `1 / scale` and
+    delta encode them, in the compressed format echarts decodes itself.
+    """
+    features = []
+    for feature in geojson["features"]:
+        geometry = feature.get("geometry")
+        polygons = _polygons(geometry) if geometry else None
+        if polygons is not None:
+            encoded = [[_encode_ring(ring, scale) for ring in p] for p in polygons]
+            coordinates = [[ring for ring, _ in polygon] for polygon in encoded]
+            offsets = [[offset for _, offset in polygon] for polygon in encoded]
+            if geometry["type"] == "Polygon":
+                coordinates, offsets = coordinates[0], offsets[0]
+            geometry = dict(
+                geometry, coordinates=coordinates, encodeOffsets=offsets
+            )
+            feature = dict(feature, geometry=geometry)
+        features.append(feature)
+    return dict(geojson, features=features, UTF8Encoding=True, UTF8Scale=scale)
+
+
+def map_script(name: str, geojson: dict) -> str:
+    """
+    Return the script registering a GeoJSON map under `name` to echarts.
+    """
+    return _MAP_SCRIPT.format(
+        name=json.dumps(name),
+        geojson=json.dumps(geojson, ensure_ascii=False, separators=(",", ":")),
+    )
+
+
+def build_map_scripts(
+    path: str,
+    levels: Mapping[str, float],
+    cache_dir: str,
+    method: str = DOUGLAS_PEUCKER,
+    scale: int = 1024,
+) -> Dict[str, str]:
+    """
+    Write the map script of every level to `cache_dir`, unless it is there
+    already, and return their paths by map name.
+
+    :param path: The GeoJSON file of the map.
+    :param levels: The tolerance of every level, by the name its map is
+                   registered under.
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+    digest = hashlib.sha256(content)
+    digest.update(json.dumps([method, scale, _FORMAT_VERSION]).encode())
+
+    os.makedirs(cache_dir, exist_ok=True)
+    geojson, paths = None, {}
+    for name, tolerance in levels.items():
+        key = digest.copy()
+        key.update(json.dumps([name, float(tolerance)]).encode())
+        target = os.path.join(
+            cache_dir,
+            "{}-{}.js".format(re.sub(r"[^\w.-]+", "_", name), key.hexdigest()[:16]),
+        )
+        if not os.path.exists(target):
+            if geojson is None:
+                geojson = json.loads(content.decode("utf-8"))
+            simplified = simplify_geojson(geojson, tolerance, method)
+            script = map_script(name, encode_geojson(simplified, scale))
+            # written aside first, a concurrent build never reads half a file
+            partial = "{}.{}.tmp".format(target, os.getpid())
+            with open(partial, "w", encoding="utf-8") as f:
+                f.write(script)
+            os.replace(partial, target)
+        paths[name] = target
+    return paths
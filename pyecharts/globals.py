@@ -1,7 +1,5 @@
 import os
 
-from jinja2 import Environment, FileSystemLoader
-
 from pyecharts.commons.utils import JsCode
 
 
@@ -127,6 +125,13 @@ class _OnlineHost:
     NOTEBOOK_HOST = "http://localhost:8888/nbextensions/assets/"
 
 
+class _JsonBackend:
+    BUILTIN: str = "builtin"
+    SIMPLEJSON: str = "simplejson"
+    JSON: str = "json"
+    ORJSON: str = "orjson"
+
+
 class _WarningControl:
     ShowWarning = True
 
@@ -141,22 +146,43 @@ BMapType = _BMapType
 NotebookType = _NotebookType()
 OnlineHostType = _OnlineHost()
 WarningType = _WarningControl()
+JsonBackendType = _JsonBackend()
 
 
 class _CurrentConfig:
     PAGE_TITLE = "Awesome-pyecharts"
     ONLINE_HOST = OnlineHostType.DEFAULT_HOST
     NOTEBOOK_TYPE = NotebookType.JUPYTER_NOTEBOOK
-    GLOBAL_ENV = Environment(
-        keep_trailing_newline=True,
-        trim_blocks=True,
-        lstrip_blocks=True,
-        loader=FileSystemLoader(
-            os.path.join(
-                os.path.abspath(os.path.dirname(__file__)), "render", "templates"
+    JSON_BACKEND = JsonBackendType.BUILTIN
+    _global_env = None
+
+    @property
+    def GLOBAL_ENV(self):
+        # jinja is only imported when the first chart is rendered
+        if self._global_env is None:
+            from jinja2 import Environment, FileSystemLoader
+
+            self._global_env = Environment(
+                keep_trailing_newline=True,
+                trim_blocks=True,
+                lstrip_blocks=True,
+                loader=FileSystemLoader(
+                    os.path.join(
+                        os.path.abspath(os.path.dirname(__file__)),
+                        "render",
+                        "templates",
+                    )
+                ),
             )
-        ),
-    )
+        return self._global_env
+
+    @GLOBAL_ENV.setter
+    def GLOBAL_ENV(self, env):
+        self._global_env = env
+
+    @GLOBAL_ENV.deleter
+    def GLOBAL_ENV(self):
+        self._global_env = None
 
 
 CurrentConfig = _CurrentConfig()
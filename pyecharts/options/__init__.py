@@ -2,7 +2,9 @@
 
 from .charts_options import (
     BarItem,
+    BarItems,
     BarBackgroundStyleOpts,
+    BatchItems,
     BMapCopyrightTypeOpts,
     BMapGeoLocationControlOpts,
     BMapNavigationControlOpts,
@@ -31,6 +33,7 @@ from .charts_options import (
     GraphNode,
     LineItem,
     MapItem,
+    MapItems,
     Map3DColorMaterialOpts,
     Map3DLabelOpts,
     Map3DLightOpts,
@@ -40,10 +43,12 @@ from .charts_options import (
     Map3DViewControlOpts,
     PageLayoutOpts,
     PieItem,
+    PieItems,
     PieLabelLineOpts,
     RadarItem,
     SankeyLevelsOpts,
     ScatterItem,
+    ScatterItems,
     SunburstItem,
     ThemeRiverItem,
     TimelineCheckPointerStyle,
@@ -1,5 +1,6 @@
 import simplejson as json
 
+from ..commons import utils
 from ..globals import BMapType
 from .global_options import TooltipOpts
 from .series_options import (
@@ -19,6 +20,9 @@ from .series_options import (
 
 # Data Item
 class BarItem(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         name: Union[int, str],
@@ -38,6 +42,9 @@ class BarItem(BasicOpts):
 
 
 class BoxplotItem(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         name: Union[int, str],
@@ -55,6 +62,9 @@ class BoxplotItem(BasicOpts):
 
 
 class CandleStickItem(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         name: Union[str, int],
@@ -72,6 +82,9 @@ class CandleStickItem(BasicOpts):
 
 
 class EffectScatterItem(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         name: Union[str, Numeric],
@@ -101,6 +114,9 @@ class EffectScatterItem(BasicOpts):
 
 
 class FunnelItem(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         name: Union[str, int],
@@ -128,6 +144,9 @@ class FunnelItem(BasicOpts):
 
 
 class LineItem(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         name: Union[str, Numeric] = None,
@@ -157,6 +176,9 @@ class LineItem(BasicOpts):
 
 
 class MapItem(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -177,6 +199,9 @@ class MapItem(BasicOpts):
 
 
 class PieItem(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -197,6 +222,9 @@ class PieItem(BasicOpts):
 
 
 class RadarItem(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -229,6 +257,9 @@ class RadarItem(BasicOpts):
 
 
 class ScatterItem(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         name: Union[str, Numeric] = None,
@@ -257,6 +288,9 @@ class ScatterItem(BasicOpts):
 
 
 class SunburstItem(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         value: Optional[Numeric] = None,
@@ -279,6 +313,9 @@ class SunburstItem(BasicOpts):
 
 
 class ThemeRiverItem(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         date: Optional[str] = None,
@@ -289,6 +326,9 @@ class ThemeRiverItem(BasicOpts):
 
 
 class TreeItem(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -306,6 +346,9 @@ class TreeItem(BasicOpts):
 
 # Chart Options
 class GraphNode(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -332,6 +375,9 @@ class GraphNode(BasicOpts):
 
 
 class GraphLink(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         source: Union[str, int, None] = None,
@@ -354,6 +400,9 @@ class GraphLink(BasicOpts):
 
 
 class GraphCategory(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -369,7 +418,163 @@ class GraphCategory(BasicOpts):
         }
 
 
+class BatchItems:
+    """
+    Data items stored column by column: one sequence (list, numpy array or
+    pandas Series) per field instead of one option object per data point.
+    The columns are written straight into the JSON of the items, a column
+    left to `None` is omitted, a `None` cell is omitted from its own item
+    and a single value (not a sequence) is shared by every item.
+    """
+
+    __slots__ = ("columns", "size")
+
+    def __init__(self, columns: dict):
+        # key of the field in each item, or (key, sub key) for nested fields
+        self.columns: dict = {}
+        self.size: Optional[int] = None
+        for key, column in columns.items():
+            if column is None:
+                continue
+            if _is_column(column):
+                if self.size is None:
+                    self.size = len(column)
+                elif len(column) != self.size:
+                    raise ValueError(
+                        "column {} holds {} items instead of {}".format(
+                            key, len(column), self.size
+                        )
+                    )
+            self.columns[key] = column
+        if self.size is None:
+            raise ValueError("at least one column must be a sequence")
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __repr__(self) -> str:
+        return "{}(size={}, columns={})".format(
+            self.__class__.__name__, self.size, list(self.columns)
+        )
+
+    def items(self) -> list:
+        """
+        Return the data items as plain dicts.
+        """
+        columns = []
+        for key, column in self.columns.items():
+            if not _is_column(column):
+                column = [column] * self.size
+            elif utils.is_ndarray(column):
+                column = utils.as_ndarray(column).tolist()
+            columns.append((key, column))
+        items = [{} for _ in range(self.size)]
+        for key, column in columns:
+            for item, value in zip(items, column):
+                if value is None:
+                    continue
+                if isinstance(key, tuple):
+                    item.setdefault(key[0], {})[key[1]] = value
+                else:
+                    item[key] = value
+        return items
+
+
+def _is_column(value) -> bool:
+    if isinstance(value, (list, tuple)):
+        return True
+    return utils.is_ndarray(value) and utils.as_ndarray(value).ndim > 0
+
+
+class BarItems(BatchItems):
+    __slots__ = ()
+
+    def __init__(
+        self,
+        values: Sequence = None,
+        names: Optional[Sequence[str]] = None,
+        colors: Union[Sequence[str], str, None] = None,
+        opacities: Union[Sequence[Numeric], Numeric, None] = None,
+    ):
+        super().__init__(
+            {
+                "name": names,
+                "value": values,
+                ("itemStyle", "color"): colors,
+                ("itemStyle", "opacity"): opacities,
+            }
+        )
+
+
+class MapItems(BatchItems):
+    __slots__ = ()
+
+    def __init__(
+        self,
+        values: Sequence = None,
+        names: Optional[Sequence[str]] = None,
+        area_colors: Union[Sequence[str], str, None] = None,
+        opacities: Union[Sequence[Numeric], Numeric, None] = None,
+    ):
+        super().__init__(
+            {
+                "name": names,
+                "value": values,
+                ("itemStyle", "areaColor"): area_colors,
+                ("itemStyle", "opacity"): opacities,
+            }
+        )
+
+
+class PieItems(BatchItems):
+    __slots__ = ()
+
+    def __init__(
+        self,
+        values: Sequence = None,
+        names: Optional[Sequence[str]] = None,
+        colors: Union[Sequence[str], str, None] = None,
+        opacities: Union[Sequence[Numeric], Numeric, None] = None,
+    ):
+        super().__init__(
+            {
+                "name": names,
+                "value": values,
+                ("itemStyle", "color"): colors,
+                ("itemStyle", "opacity"): opacities,
+            }
+        )
+
+
+class ScatterItems(BatchItems):
+    __slots__ = ()
+
+    def __init__(
+        self,
+        values: Sequence = None,
+        names: Optional[Sequence[str]] = None,
+        symbols: Union[Sequence[str], str, None] = None,
+        symbol_sizes: Union[Sequence, Numeric, None] = None,
+        symbol_rotates: Union[Sequence[Numeric], Numeric, None] = None,
+        colors: Union[Sequence[str], str, None] = None,
+        opacities: Union[Sequence[Numeric], Numeric, None] = None,
+    ):
+        super().__init__(
+            {
+                "name": names,
+                "value": values,
+                "symbol": symbols,
+                "symbolSize": symbol_sizes,
+                "symbolRotate": symbol_rotates,
+                ("itemStyle", "color"): colors,
+                ("itemStyle", "opacity"): opacities,
+            }
+        )
+
+
 class BMapNavigationControlOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         position: Numeric = BMapType.ANCHOR_TOP_LEFT,
@@ -399,6 +604,8 @@ class BMapNavigationControlOpts(BasicOpts):
 
 
 class BMapOverviewMapControlOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         position: Numeric = BMapType.ANCHOR_BOTTOM_RIGHT,
@@ -425,6 +632,8 @@ class BMapOverviewMapControlOpts(BasicOpts):
 
 
 class BMapScaleControlOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         position: Numeric = BMapType.ANCHOR_BOTTOM_LEFT,
@@ -446,6 +655,8 @@ class BMapScaleControlOpts(BasicOpts):
 
 
 class BMapTypeControlOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         position: Numeric = BMapType.ANCHOR_TOP_RIGHT,
@@ -461,6 +672,8 @@ class BMapTypeControlOpts(BasicOpts):
 
 
 class BMapCopyrightTypeOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         position: Numeric = BMapType.ANCHOR_BOTTOM_LEFT,
@@ -489,6 +702,8 @@ class BMapCopyrightTypeOpts(BasicOpts):
 
 
 class BMapGeoLocationControlOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         position: Numeric = BMapType.ANCHOR_BOTTOM_LEFT,
@@ -516,6 +731,8 @@ class BMapGeoLocationControlOpts(BasicOpts):
 
 
 class ComponentTitleOpts:
+    __slots__ = ("title", "subtitle", "title_style", "subtitle_style")
+
     def __init__(
         self,
         title: str = "",
@@ -539,6 +756,8 @@ class ComponentTitleOpts:
 
 
 class PageLayoutOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         justify_content: Optional[str] = None,
@@ -555,10 +774,12 @@ class PageLayoutOpts(BasicOpts):
 
 
 class BaseGraphic(BasicOpts):
-    pass
+    __slots__ = ()
 
 
 class GraphicShapeOpts(BaseGraphic):
+    __slots__ = ()
+
     def __init__(
         self,
         pos_x: Numeric = 0,
@@ -577,6 +798,8 @@ class GraphicShapeOpts(BaseGraphic):
 
 
 class GraphicBasicStyleOpts(BaseGraphic):
+    __slots__ = ()
+
     def __init__(
         self,
         fill: str = "#000",
@@ -599,6 +822,8 @@ class GraphicBasicStyleOpts(BaseGraphic):
 
 
 class GraphicImageStyleOpts(BaseGraphic):
+    __slots__ = ()
+
     def __init__(
         self,
         image: Optional[str] = None,
@@ -626,6 +851,8 @@ class GraphicImageStyleOpts(BaseGraphic):
 
 
 class GraphicTextStyleOpts(BaseGraphic):
+    __slots__ = ()
+
     def __init__(
         self,
         text: Optional[JSFunc] = None,
@@ -653,6 +880,8 @@ class GraphicTextStyleOpts(BaseGraphic):
 
 
 class GraphicItem(BaseGraphic):
+    __slots__ = ()
+
     def __init__(
         self,
         id_: Optional[str] = None,
@@ -703,6 +932,8 @@ class GraphicItem(BaseGraphic):
 
 
 class GraphicGroup(BaseGraphic):
+    __slots__ = ()
+
     def __init__(
         self,
         graphic_item: Union[GraphicItem, dict, None] = None,
@@ -723,6 +954,8 @@ class GraphicGroup(BaseGraphic):
 
 
 class GraphicImage(BaseGraphic):
+    __slots__ = ()
+
     def __init__(
         self,
         graphic_item: Union[GraphicItem, dict, None] = None,
@@ -744,6 +977,8 @@ class GraphicImage(BaseGraphic):
 
 
 class GraphicText(BaseGraphic):
+    __slots__ = ()
+
     def __init__(
         self,
         graphic_item: Union[GraphicItem, dict, None] = None,
@@ -765,6 +1000,8 @@ class GraphicText(BaseGraphic):
 
 
 class GraphicRect(BaseGraphic):
+    __slots__ = ()
+
     def __init__(
         self,
         graphic_item: Union[GraphicItem, dict, None] = None,
@@ -793,6 +1030,8 @@ class GraphicRect(BaseGraphic):
 
 
 class SankeyLevelsOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         depth: Numeric = None,
@@ -807,6 +1046,8 @@ class SankeyLevelsOpts(BasicOpts):
 
 
 class TreeMapItemStyleOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         color: Optional[str] = None,
@@ -833,6 +1074,8 @@ class TreeMapItemStyleOpts(BasicOpts):
 
 
 class TreeMapLevelsOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         color_alpha: Union[Numeric, Sequence] = None,
@@ -853,6 +1096,8 @@ class TreeMapLevelsOpts(BasicOpts):
 
 
 class Map3DLabelOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -869,6 +1114,8 @@ class Map3DLabelOpts(BasicOpts):
 
 
 class Map3DRealisticMaterialOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         detail_texture: Optional[JSFunc] = None,
@@ -893,6 +1140,8 @@ class Map3DRealisticMaterialOpts(BasicOpts):
 
 
 class Map3DLambertMaterialOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         detail_texture: Optional[JSFunc] = None,
@@ -907,6 +1156,8 @@ class Map3DLambertMaterialOpts(BasicOpts):
 
 
 class Map3DColorMaterialOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         detail_texture: Optional[JSFunc] = None,
@@ -921,6 +1172,8 @@ class Map3DColorMaterialOpts(BasicOpts):
 
 
 class Map3DLightOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         main_color: str = "#fff",
@@ -954,6 +1207,8 @@ class Map3DLightOpts(BasicOpts):
 
 
 class Map3DPostEffectOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_enable: bool = False,
@@ -1005,6 +1260,8 @@ class Map3DPostEffectOpts(BasicOpts):
 
 
 class Map3DViewControlOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         projection: str = "perspective",
@@ -1067,6 +1324,8 @@ class Map3DViewControlOpts(BasicOpts):
 
 
 class BarBackgroundStyleOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         color: str = "rgba(180, 180, 180, 0.2)",
@@ -1095,6 +1354,8 @@ class BarBackgroundStyleOpts(BasicOpts):
 
 
 class GaugeTitleOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -1137,6 +1398,8 @@ class GaugeTitleOpts(BasicOpts):
 
 
 class GaugeDetailOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -1181,6 +1444,8 @@ class GaugeDetailOpts(BasicOpts):
 
 
 class GaugePointerOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -1191,6 +1456,8 @@ class GaugePointerOpts(BasicOpts):
 
 
 class PieLabelLineOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -1209,6 +1476,8 @@ class PieLabelLineOpts(BasicOpts):
 
 
 class TimelineCheckPointerStyle(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         symbol: str = "circle",
@@ -1242,6 +1511,8 @@ class TimelineCheckPointerStyle(BasicOpts):
 
 
 class TimelineControlStyle(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
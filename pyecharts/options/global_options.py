@@ -18,6 +18,8 @@ from ..options.series_options import (
 
 
 class AnimationOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         animation: bool = True,
@@ -42,6 +44,8 @@ class AnimationOpts(BasicOpts):
 
 
 class InitOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         width: str = "900px",
@@ -53,6 +57,9 @@ class InitOpts(BasicOpts):
         bg_color: Union[str, dict] = None,
         js_host: str = "",
         animation_opts: Union[AnimationOpts, dict] = AnimationOpts(),
+        typed_array_threshold: Optional[int] = None,
+        json_backend: Optional[str] = None,
+        is_fragment_cache: bool = False,
     ):
         self.opts: dict = {
             "width": width,
@@ -64,10 +71,15 @@ class InitOpts(BasicOpts):
             "bg_color": bg_color,
             "js_host": js_host,
             "animationOpts": animation_opts,
+            "typed_array_threshold": typed_array_threshold,
+            "json_backend": json_backend,
+            "is_fragment_cache": is_fragment_cache,
         }
 
 
 class ToolBoxFeatureSaveAsImageOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         type_: str = "png",
@@ -94,6 +106,8 @@ class ToolBoxFeatureSaveAsImageOpts(BasicOpts):
 
 
 class ToolBoxFeatureRestoreOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self, is_show: bool = True, title: str = "还原", icon: Optional[JSFunc] = None
     ):
@@ -101,6 +115,8 @@ class ToolBoxFeatureRestoreOpts(BasicOpts):
 
 
 class ToolBoxFeatureDataViewOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -138,6 +154,8 @@ class ToolBoxFeatureDataViewOpts(BasicOpts):
 
 
 class ToolBoxFeatureDataZoomOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -160,6 +178,8 @@ class ToolBoxFeatureDataZoomOpts(BasicOpts):
 
 
 class ToolBoxFeatureMagicTypeOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -195,6 +215,8 @@ class ToolBoxFeatureMagicTypeOpts(BasicOpts):
 
 
 class ToolBoxFeatureBrushOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         type_: Optional[str] = None,
@@ -233,6 +255,8 @@ class ToolBoxFeatureBrushOpts(BasicOpts):
 
 
 class ToolBoxFeatureOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         save_as_image: Union[
@@ -261,6 +285,8 @@ class ToolBoxFeatureOpts(BasicOpts):
 
 
 class ToolboxOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -287,6 +313,8 @@ class ToolboxOpts(BasicOpts):
 
 
 class BrushOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         tool_box: Optional[Sequence] = None,
@@ -333,6 +361,8 @@ class BrushOpts(BasicOpts):
 
 
 class TitleOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         title: Optional[str] = None,
@@ -371,6 +401,8 @@ class TitleOpts(BasicOpts):
 
 
 class DataZoomOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -411,6 +443,8 @@ class DataZoomOpts(BasicOpts):
 
 
 class LegendOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         type_: Optional[str] = None,
@@ -451,6 +485,8 @@ class LegendOpts(BasicOpts):
 
 
 class VisualMapOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -531,6 +567,8 @@ class VisualMapOpts(BasicOpts):
 
 
 class TooltipOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -569,6 +607,8 @@ class TooltipOpts(BasicOpts):
 
 
 class AxisLineOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -587,6 +627,8 @@ class AxisLineOpts(BasicOpts):
 
 
 class AxisTickOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -605,6 +647,8 @@ class AxisTickOpts(BasicOpts):
 
 
 class AxisPointerOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = False,
@@ -623,6 +667,8 @@ class AxisPointerOpts(BasicOpts):
 
 
 class AxisOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         type_: Optional[str] = None,
@@ -685,6 +731,8 @@ class AxisOpts(BasicOpts):
 
 
 class GridOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = False,
@@ -721,6 +769,8 @@ class GridOpts(BasicOpts):
 
 
 class Grid3DOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         width: Numeric = 200,
@@ -743,6 +793,8 @@ class Grid3DOpts(BasicOpts):
 
 
 class Axis3DOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         data: Optional[Sequence] = None,
@@ -770,6 +822,8 @@ class Axis3DOpts(BasicOpts):
 
 
 class ParallelOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         pos_left: str = "5%",
@@ -788,6 +842,8 @@ class ParallelOpts(BasicOpts):
 
 
 class ParallelAxisOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         dim: Numeric,
@@ -810,6 +866,9 @@ class ParallelAxisOpts(BasicOpts):
 
 
 class RadarIndicatorItem(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -821,6 +880,8 @@ class RadarIndicatorItem(BasicOpts):
 
 
 class CalendarDayLabelOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -853,6 +914,8 @@ class CalendarDayLabelOpts(BasicOpts):
 
 
 class CalendarMonthLabelOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -885,6 +948,8 @@ class CalendarMonthLabelOpts(BasicOpts):
 
 
 class CalendarYearLabelOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -915,6 +980,8 @@ class CalendarYearLabelOpts(BasicOpts):
 
 
 class CalendarOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         pos_left: Optional[str] = None,
@@ -951,6 +1018,8 @@ class CalendarOpts(BasicOpts):
 
 
 class SingleAxisOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -981,6 +1050,9 @@ class SingleAxisOpts(BasicOpts):
 
 
 class RadiusAxisItem(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         value: Optional[str] = None,
@@ -990,6 +1062,9 @@ class RadiusAxisItem(BasicOpts):
 
 
 class AngleAxisItem(RadiusAxisItem):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         value: Optional[str] = None,
@@ -999,6 +1074,8 @@ class AngleAxisItem(RadiusAxisItem):
 
 
 class RadiusAxisOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         polar_index: Optional[int] = None,
@@ -1046,6 +1123,8 @@ class RadiusAxisOpts(BasicOpts):
 
 
 class AngleAxisOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         polar_index: Optional[int] = None,
@@ -1093,6 +1172,8 @@ class AngleAxisOpts(BasicOpts):
 
 
 class PolarOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         center: Optional[Sequence] = None,
@@ -6,17 +6,85 @@ Numeric = Union[int, float]
 JSFunc = Union[str, JsCode]
 
 
+class _Fragments(dict):
+    """
+    The encoded JSON of frozen options, by encoder settings, and the frozen
+    options they are nested in, whose JSON holds theirs.
+    """
+
+    __slots__ = ("parents",)
+
+    def __init__(self):
+        super().__init__()
+        # by id, each parent is kept once however often it is updated
+        self.parents = {}
+
+    def invalidate(self):
+        self.clear()
+        for parent in self.parents.values():
+            parent._fragments.invalidate()
+
+
+def _nested_opts(value):
+    if isinstance(value, BasicOpts):
+        yield value
+    elif isinstance(value, dict):
+        for v in value.values():
+            yield from _nested_opts(v)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            yield from _nested_opts(v)
+
+
 class BasicOpts:
-    __slots__ = ("opts",)
+    __slots__ = ("_opts", "_fragments")
+    # Data items are created by the million, they do not keep `None` entries.
+    # Their options are only dumped, a missing key means the same as `None`.
+    _is_sparse = False
+
+    @property
+    def opts(self):
+        return self._opts
+
+    @opts.setter
+    def opts(self, value):
+        if self._is_sparse and type(value) is dict:
+            value = {k: v for k, v in value.items() if v is not None}
+        self._opts = value
 
     def update(self, **kwargs):
         self.opts.update(kwargs)
+        if self.is_frozen:
+            self._freeze_nested(kwargs)
+            self._fragments.invalidate()
+
+    def freeze(self):
+        """
+        Promise that the options only change through `update` from now on,
+        nested values included, so that their encoded JSON can be reused
+        across dumps and charts. Nested options are frozen as well, updating
+        them drops the JSON of the options they are nested in.
+        """
+        if not self.is_frozen:
+            self._fragments = _Fragments()
+            self._freeze_nested(self.opts)
+        return self
+
+    def _freeze_nested(self, value):
+        for nested in _nested_opts(value):
+            nested.freeze()._fragments.parents[id(self)] = self
+
+    @property
+    def is_frozen(self) -> bool:
+        return getattr(self, "_fragments", None) is not None
 
     def get(self, key: str) -> Any:
         return self.opts.get(key)
 
 
 class ItemStyleOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         color: Optional[JSFunc] = None,
@@ -41,6 +109,8 @@ class ItemStyleOpts(BasicOpts):
 
 
 class TextStyleOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         color: Optional[str] = None,
@@ -85,6 +155,8 @@ class TextStyleOpts(BasicOpts):
 
 
 class LabelOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -131,6 +203,8 @@ class LabelOpts(BasicOpts):
 
 
 class LineStyleOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -151,6 +225,8 @@ class LineStyleOpts(BasicOpts):
 
 
 class SplitLineOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self, is_show: bool = False, linestyle_opts: LineStyleOpts = LineStyleOpts()
     ):
@@ -158,6 +234,9 @@ class SplitLineOpts(BasicOpts):
 
 
 class MarkPointItem(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -188,6 +267,8 @@ class MarkPointItem(BasicOpts):
 
 
 class MarkPointOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         data: Sequence[Union[MarkPointItem, dict]] = None,
@@ -204,6 +285,9 @@ class MarkPointOpts(BasicOpts):
 
 
 class MarkLineItem(BasicOpts):
+    __slots__ = ()
+    _is_sparse = True
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -234,6 +318,8 @@ class MarkLineItem(BasicOpts):
 
 
 class MarkLineOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_silent: bool = False,
@@ -256,6 +342,8 @@ class MarkLineOpts(BasicOpts):
 
 
 class MarkAreaItem(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -289,6 +377,8 @@ class MarkAreaItem(BasicOpts):
 
 
 class MarkAreaOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_silent: bool = False,
@@ -305,6 +395,8 @@ class MarkAreaOpts(BasicOpts):
 
 
 class EffectOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -329,6 +421,8 @@ class EffectOpts(BasicOpts):
 
 
 class Lines3DEffectOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -351,16 +445,22 @@ class Lines3DEffectOpts(BasicOpts):
 
 
 class AreaStyleOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(self, opacity: Optional[Numeric] = 0, color: Optional[str] = None):
         self.opts: dict = {"opacity": opacity, "color": color}
 
 
 class SplitAreaOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(self, is_show=True, areastyle_opts: AreaStyleOpts = AreaStyleOpts()):
         self.opts: dict = {"show": is_show, "areaStyle": areastyle_opts}
 
 
 class TreeMapBreadcrumbOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = True,
@@ -385,6 +485,8 @@ class TreeMapBreadcrumbOpts(BasicOpts):
 
 
 class MinorTickOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = False,
@@ -401,6 +503,8 @@ class MinorTickOpts(BasicOpts):
 
 
 class MinorSplitLineOpts(BasicOpts):
+    __slots__ = ()
+
     def __init__(
         self,
         is_show: bool = False,
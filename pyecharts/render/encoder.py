@@ -0,0 +1,654 @@
+import base64
+import datetime
+import decimal
+import sys
+
+from simplejson.encoder import encode_basestring_ascii
+
+from ..commons import utils
+from ..commons.utils import JsCode
+from ..options.charts_options import BatchItems, _is_column
+from ..options.series_options import BasicOpts
+from ..types import Optional
+
+_INFINITY = float("inf")
+# number of array rows formatted at once, bounds the temporary text buffers
+_ARRAY_CHUNK_SIZE = 1 << 16
+# option keys whose numeric arrays may be packed into typed array payloads
+_TYPED_ARRAY_KEYS = ("data", "source")
+_INT32_RANGE = (-(2 ** 31), 2 ** 31 - 1)
+# nesting depth checked for in-place changes of cached option fragments
+_SHAPE_DEPTH = 2
+
+
+def _floatstr(o: float) -> str:
+    # NaN and +/-Infinity are not valid JSON, dump them as `null` just like
+    # `simplejson.dumps(..., ignore_nan=True)` does.
+    if o != o or o == _INFINITY or o == -_INFINITY:
+        return "null"
+    return float.__repr__(o)
+
+
+def _keystr(key) -> str:
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, float):
+        return _floatstr(key)
+    if isinstance(key, (int, decimal.Decimal)):
+        return str(key)
+    raise TypeError(
+        "keys must be str, int, float, bool or None, not {}".format(
+            key.__class__.__name__
+        )
+    )
+
+
+def _is_numpy_scalar(o) -> bool:
+    np = sys.modules.get("numpy")
+    return np is not None and isinstance(o, np.generic)
+
+
+_BOOL_TEXTS = {True: "true", False: "false"}
+_PLAIN_TYPES = frozenset((int, float, str))
+
+
+def _is_supported_column(column) -> bool:
+    kind = column.dtype.kind
+    if kind == "O":
+        return all(type(v) is str for v in column.tolist())
+    return kind in "biufUM"
+
+
+def _column_texts(column) -> list:
+    """
+    Format a chunk of a 1-D numpy array into JSON texts. Only one chunk of
+    python objects is alive at a time, whatever the size of the array.
+    """
+    import numpy as np
+
+    kind = column.dtype.kind
+    if kind == "b":
+        return list(map(_BOOL_TEXTS.__getitem__, column.tolist()))
+    if kind in "iu":
+        return list(map(int.__repr__, column.tolist()))
+    if kind == "f":
+        if np.isfinite(column).all():
+            return list(map(float.__repr__, column.tolist()))
+        return list(map(_floatstr, column.tolist()))
+    if kind == "M":
+        texts = np.datetime_as_string(column, unit="auto").tolist()
+        return ["null" if t == "NaT" else encode_basestring_ascii(t) for t in texts]
+    return list(map(encode_basestring_ascii, column.tolist()))
+
+
+class _Source:
+    __slots__ = ("columns",)
+
+    def __init__(self, columns: dict):
+        self.columns = columns
+
+
+def _pack_numbers(arr) -> dict:
+    import numpy as np
+
+    if arr.dtype.kind == "f":
+        dtype = "float32" if arr.dtype.itemsize <= 4 else "float64"
+    elif arr.size == 0 or (
+        _INT32_RANGE[0] <= arr.min() and arr.max() <= _INT32_RANGE[1]
+    ):
+        dtype = "int32"
+    else:
+        dtype = "float64"
+    # 2-D arrays are packed column after column
+    buffer = arr.astype(np.dtype(dtype).newbyteorder("<")).tobytes(order="F")
+    return {
+        "dtype": dtype,
+        "shape": list(arr.shape),
+        "data": base64.b64encode(buffer).decode("ascii"),
+    }
+
+
+def pack_typed_array(data, threshold: int) -> Optional[dict]:
+    """
+    Pack a large numeric array into a base64 encoded little-endian buffer.
+    Record arrays (zipped columns) are packed column by column, columns which
+    are not numeric are kept as they are.
+
+    Return None when `data` holds less than `threshold` rows or no numbers
+    at all, in which case it should be dumped as plain JSON.
+    """
+    if isinstance(data, (list, tuple)):
+        if len(data) < threshold:
+            return None
+    elif not utils.is_ndarray(data):
+        return None
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+
+    try:
+        arr = utils.as_ndarray(data)
+    except ValueError:
+        # rows of different lengths
+        return None
+    if arr.ndim not in (1, 2) or len(arr) < threshold:
+        return None
+    if arr.dtype.names is not None:
+        columns = [arr[n] for n in arr.dtype.names]
+        if not any(c.dtype.kind in "iuf" for c in columns):
+            return None
+        return {
+            "__typed_array__": {
+                "shape": [len(arr), len(columns)],
+                "columns": [
+                    {"__typed_array__": _pack_numbers(c)}
+                    if c.dtype.kind in "iuf"
+                    else c
+                    for c in columns
+                ],
+            }
+        }
+    if arr.dtype.kind not in "iuf":
+        return None
+    return {"__typed_array__": _pack_numbers(arr)}
+
+
+def compile_options(
+    options,
+    indent: int = 4,
+    with_quotes: bool = False,
+    typed_array_threshold: Optional[int] = None,
+    level: int = 0,
+) -> str:
+    """
+    Compile chart options into JSON text within a single traversal.
+
+    `None` values and empty strings are pruned from dicts, `BasicOpts` are
+    unwrapped and `JsCode` is emitted as raw javascript (or as a quoted string
+    when `with_quotes` is True), so the output is the same as cleaning the
+    options with `remove_key_with_none_value`, dumping them with `simplejson`
+    and stripping the placeholders afterwards. numpy arrays and pandas objects
+    are dumped chunk by chunk straight from their buffers.
+
+    :param options: The options to compile, usually `chart.options`.
+    :param indent: Number of spaces to indent nested containers with.
+    :param with_quotes: Whether to keep `JsCode` as a JSON string.
+    :param typed_array_threshold: Pack numeric `data`/`source` arrays with at
+                                  least this many rows into typed array payloads,
+                                  see `pack_typed_array`.
+    :param level: Indent level the text is nested at, used to compile
+                  fragments of a larger document.
+    """
+    chunks = []
+    append = chunks.append
+    indents, separators = ["\n"], [",\n"]
+    # where each `BasicOpts` was first written, so that instances shared by
+    # several series are only encoded once
+    written = {}
+    enc = encode_basestring_ascii
+
+    def _newline(level):
+        while len(indents) <= level:
+            indents.append("\n" + " " * (indent * len(indents)))
+            separators.append("," + indents[-1])
+        return indents[level]
+
+    def _scalar(o):
+        # Return the JSON text of a leaf value, or None for containers.
+        t = type(o)
+        if t is str:
+            return enc(o)
+        if t is int:
+            return int.__repr__(o)
+        if t is float:
+            return _floatstr(o)
+        if o is None:
+            return "null"
+        if o is True:
+            return "true"
+        if o is False:
+            return "false"
+        if isinstance(o, str):
+            return enc(o)
+        if isinstance(o, int):
+            return int.__repr__(o)
+        if isinstance(o, float):
+            return _floatstr(o)
+        if isinstance(o, JsCode):
+            code = enc(utils.js_code_body(o))
+            return code if with_quotes else code[1:-1]
+        if isinstance(o, decimal.Decimal):
+            return str(o)
+        if isinstance(o, (datetime.date, datetime.datetime)):
+            return enc(o.isoformat())
+        return None
+
+    def _dict(o, level, is_source=False):
+        first = True
+        for key, value in o.items():
+            if value is None:
+                continue
+            if isinstance(value, str) and not value:
+                # delete key with empty string
+                continue
+            if typed_array_threshold is not None and (
+                is_source or key in _TYPED_ARRAY_KEYS
+            ):
+                if key == "source" and isinstance(value, dict):
+                    # keyed-column dataset source, pack columns one by one
+                    value = _Source(value)
+                else:
+                    value = pack_typed_array(value, typed_array_threshold) or value
+            if first:
+                append("{")
+                append(_newline(level + 1))
+                separator = separators[level + 1]
+                first = False
+            else:
+                append(separator)
+            append(enc(_keystr(key)))
+            append(": ")
+            if value.__class__ is _Source:
+                _dict(value.columns, level + 1, is_source=True)
+            else:
+                _value(value, level + 1)
+        if first:
+            append("{}")
+        else:
+            append(_newline(level))
+            append("}")
+
+    def _array(o, level):
+        if not o:
+            append("[]")
+            return
+        append("[")
+        append(_newline(level + 1))
+        separator = separators[level + 1]
+        first = True
+        for value in o:
+            if first:
+                first = False
+            else:
+                append(separator)
+            t = type(value)
+            if t is int:
+                append(int.__repr__(value))
+            elif t is float:
+                append(_floatstr(value))
+            elif t is str:
+                append(enc(value))
+            else:
+                _value(value, level + 1)
+        append(_newline(level))
+        append("]")
+
+    def _opts(o, level):
+        fragments = getattr(o, "_fragments", None)
+        if fragments is not None:
+            # frozen options keep their JSON between dumps
+            fragment_key = (indent, with_quotes, typed_array_threshold, level)
+            text = fragments.get(fragment_key)
+            if text is not None:
+                return append(text)
+        key = (id(o), level)
+        text = written.get(key)
+        if text is not None:
+            if type(text) is tuple:
+                start, stop = text
+                text = written[key] = "".join(chunks[start:stop])
+            append(text)
+        else:
+            start = len(chunks)
+            _opts_body(o, level)
+            written[key] = (start, len(chunks))
+            if fragments is not None:
+                text = "".join(chunks[start:])
+        if fragments is not None:
+            fragments[fragment_key] = text
+
+    def _opts_body(o, level):
+        value = o.opts
+        if isinstance(value, dict):
+            _dict(value, level)
+        elif isinstance(value, (list, tuple)):
+            # Each item of sequence opts is cleaned on its own,
+            # falsy items are dumped as `null`.
+            _array([item if item else None for item in value], level)
+        elif value:
+            _value(value, level)
+        else:
+            append("null")
+
+    def _value(o, level):
+        t = type(o)
+        if t is dict:
+            _dict(o, level)
+        elif t is list:
+            _array(o, level)
+        else:
+            text = _scalar(o)
+            if text is not None:
+                append(text)
+            elif isinstance(o, dict):
+                _dict(o, level)
+            elif isinstance(o, (list, tuple, set)):
+                _array(o, level)
+            elif isinstance(o, BasicOpts):
+                _opts(o, level)
+            elif isinstance(o, BatchItems):
+                _batch(o, level)
+            elif utils.is_ndarray(o):
+                _ndarray(utils.as_ndarray(o), level)
+            elif _is_numpy_scalar(o):
+                _ndarray(o.reshape(()), level)
+            else:
+                # unknown objects can not be serialized
+                append("null")
+
+    def _ndarray(arr, level):
+        if arr.ndim == 0:
+            arr = arr.reshape(1)
+            if not _is_supported_column(arr):
+                return _value(arr.tolist()[0], level)
+            return append(_column_texts(arr)[0])
+        if arr.dtype.names is not None:
+            # record array, every row is dumped as a list of its fields
+            columns = [arr[name] for name in arr.dtype.names]
+        elif arr.ndim == 2:
+            columns = [arr[:, i] for i in range(arr.shape[1])]
+        elif arr.ndim == 1:
+            columns = [arr]
+        else:
+            return _array(list(arr), level)
+        if not len(arr) or not columns:
+            return _value(arr.tolist(), level)
+        if not all(_is_supported_column(c) for c in columns):
+            return _value(arr.tolist(), level)
+
+        outer = _newline(level + 1)
+        separator = "," + outer
+        if arr.ndim == 1 and arr.dtype.names is None:
+            row = None
+        else:
+            inner = _newline(level + 2)
+            row = "[" + inner + ("," + inner).join(["{}"] * len(columns))
+            row += outer + "]"
+        append("[" + outer)
+        for start in range(0, len(arr), _ARRAY_CHUNK_SIZE):
+            stop = start + _ARRAY_CHUNK_SIZE
+            texts = [_column_texts(c[start:stop]) for c in columns]
+            if start:
+                append(separator)
+            if row is None:
+                append(separator.join(texts[0]))
+            else:
+                append(separator.join(map(row.format, *texts)))
+        append(_newline(level) + "]")
+
+    def _text(o, level):
+        # JSON text of a single cell of batch items
+        text = _scalar(o)
+        if text is not None:
+            return text
+        t = type(o)
+        if (t is list or t is tuple) and o and all(type(v) in _PLAIN_TYPES for v in o):
+            return "[" + _newline(level + 1) + separators[level + 1].join(
+                map(_scalar, o)
+            ) + _newline(level) + "]"
+        return compile_options(o, indent, with_quotes, level=level)
+
+    def _batch_texts(column, start, stop, level):
+        # JSON texts of a chunk of a column, None for the omitted cells
+        if not _is_column(column):
+            return [_text(column, level)] * (stop - start)
+        if utils.is_ndarray(column):
+            arr = utils.as_ndarray(column)[start:stop]
+            if arr.dtype.names is not None or arr.ndim > 2:
+                columns = []
+            elif arr.ndim == 1:
+                columns = [arr]
+            else:
+                columns = [arr[:, i] for i in range(arr.shape[1])]
+            if columns and all(_is_supported_column(c) for c in columns):
+                texts = [_column_texts(c) for c in columns]
+                if arr.ndim == 2:
+                    inner = _newline(level + 1)
+                    row = "[" + inner + ("," + inner).join(["%s"] * len(columns))
+                    row += _newline(level) + "]"
+                    return list(map(row.__mod__, zip(*texts)))
+                if arr.dtype.kind in "UO":
+                    # empty strings are pruned like in dicts
+                    return [None if t == '""' else t for t in texts[0]]
+                return texts[0]
+            column = arr.tolist()
+        else:
+            column = column[start:stop]
+            if all(type(v) is str and v for v in column):
+                return list(map(enc, column))
+        return [
+            None if v is None or (type(v) is str and not v) else _text(v, level)
+            for v in column
+        ]
+
+    def _batch(o, level):
+        if not o.size:
+            return append("[]")
+        # top-level keys of the items, with the sub keys of nested fields
+        fields, keys = [], []
+        for key in o.columns:
+            if isinstance(key, tuple):
+                for name, group in fields:
+                    if name == key[0] and group is not None:
+                        group.append(key[1])
+                        break
+                else:
+                    fields.append((key[0], [key[1]]))
+            else:
+                fields.append((key, None))
+        for name, group in fields:
+            keys.extend([name] if group is None else [(name, k) for k in group])
+
+        item_inner, group_inner = _newline(level + 2), _newline(level + 3)
+        templates = {}
+
+        def _template(mask):
+            # `%` template of an item holding the cells flagged in `mask`
+            parts, i = [], 0
+            for name, group in fields:
+                name = enc(name).replace("%", "%%")
+                if group is None:
+                    if mask[i]:
+                        parts.append(name + ": %s")
+                    i += 1
+                    continue
+                cells = [
+                    enc(k).replace("%", "%%") + ": %s"
+                    for k, present in zip(group, mask[i:])
+                    if present
+                ]
+                i += len(group)
+                if cells:
+                    cells = ("," + group_inner).join(cells)
+                    parts.append(
+                        "{}: {{{}{}{}}}".format(name, group_inner, cells, item_inner)
+                    )
+            if not parts:
+                return "{}"
+            return "{" + item_inner + ("," + item_inner).join(parts) + (
+                _newline(level + 1) + "}"
+            )
+
+        outer = _newline(level + 1)
+        separator = "," + outer
+        append("[" + outer)
+        for start in range(0, o.size, _ARRAY_CHUNK_SIZE):
+            stop = min(start + _ARRAY_CHUNK_SIZE, o.size)
+            texts = [
+                _batch_texts(
+                    o.columns[key],
+                    start,
+                    stop,
+                    level + (3 if isinstance(key, tuple) else 2),
+                )
+                for key in keys
+            ]
+            if start:
+                append(separator)
+            if not any(None in t for t in texts):
+                mask = (True,) * len(keys)
+                template = templates.get(mask)
+                if template is None:
+                    template = templates[mask] = _template(mask)
+                append(separator.join(map(template.__mod__, zip(*texts))))
+                continue
+            rows = []
+            for row in zip(*texts):
+                mask = tuple(t is not None for t in row)
+                template = templates.get(mask)
+                if template is None:
+                    template = templates[mask] = _template(mask)
+                rows.append(template % tuple(t for t in row if t is not None))
+            append(separator.join(rows))
+        append(_newline(level) + "]")
+
+    _value(options, level)
+    text = "".join(chunks)
+    # the nested helpers form a reference cycle, do not leave the chunks to
+    # the garbage collector
+    chunks.clear()
+    written.clear()
+    return text
+
+
+def _shape(o, depth: int, refs: list, sizes: list):
+    # Record the objects an option is made of, down to `depth` levels.
+    if isinstance(o, BasicOpts):
+        refs.append(o.opts)
+        o = o.opts
+    if isinstance(o, dict):
+        sizes.append(len(o))
+        for key, value in o.items():
+            refs.append(key)
+            refs.append(value)
+            if depth:
+                _shape(value, depth - 1, refs, sizes)
+    elif isinstance(o, list):
+        sizes.append(len(o))
+        if depth:
+            for value in o:
+                refs.append(value)
+                _shape(value, depth - 1, refs, sizes)
+
+
+class _Fragment:
+    __slots__ = ("value", "refs", "sizes", "text")
+
+    def __init__(self, value, text: str):
+        self.value, self.text = value, text
+        self.refs, self.sizes = [], []
+        _shape(value, _SHAPE_DEPTH, self.refs, self.sizes)
+
+    def is_valid(self, value) -> bool:
+        if value is not self.value:
+            return False
+        refs, sizes = [], []
+        _shape(value, _SHAPE_DEPTH, refs, sizes)
+        if sizes != self.sizes or len(refs) != len(self.refs):
+            return False
+        return all(a is b for a, b in zip(refs, self.refs))
+
+
+class FragmentCache:
+    """
+    Compile chart options incrementally. The JSON of every top-level component
+    and of every series is cached and only compiled again when it has been
+    invalidated, or when its first levels no longer hold the same objects,
+    every item of a list included.
+
+    Changes made deeper in the options without going through the chart
+    methods have to be announced with `invalidate`. Charts only use a cache
+    when created with `InitOpts(is_fragment_cache=True)`.
+    """
+
+    def __init__(self, indent: int = 4):
+        self.indent = indent
+        self._threshold = None
+        self._components = {}
+        self._series = {}
+
+    def invalidate(self, *keys):
+        """
+        Drop the cached fragments of the given top-level keys, or all of
+        them when no key is given.
+        """
+        if not keys:
+            self._components.clear()
+            self._series.clear()
+        for key in keys:
+            self._components.pop(key, None)
+            if key == "series":
+                self._series.clear()
+
+    def _compile(self, cache: dict, key, value, level: int) -> str:
+        fragment = cache.get(key)
+        if fragment is None or not fragment.is_valid(value):
+            text = compile_options(
+                value,
+                indent=self.indent,
+                typed_array_threshold=self._threshold,
+                level=level,
+            )
+            fragment = cache[key] = _Fragment(value, text)
+        return fragment.text
+
+    def compile(self, options, typed_array_threshold: Optional[int] = None) -> str:
+        """
+        Same as `compile_options(options, typed_array_threshold=...)`.
+        """
+        if not isinstance(options, dict):
+            return compile_options(
+                options,
+                indent=self.indent,
+                typed_array_threshold=typed_array_threshold,
+            )
+        if typed_array_threshold != self._threshold:
+            self.invalidate()
+            self._threshold = typed_array_threshold
+
+        outer, inner = "\n" + " " * self.indent, "\n" + " " * (2 * self.indent)
+        components, series = {}, {}
+        # fragments are joined once, large texts are not copied over and over
+        chunks = ["{"]
+        for key, value in options.items():
+            if value is None or (isinstance(value, str) and not value):
+                continue
+            chunks.append(outer if len(chunks) == 1 else "," + outer)
+            chunks.append(encode_basestring_ascii(_keystr(key)) + ": ")
+            if key == "series" and type(value) is list and value:
+                # series are cached one by one, adding a series does not
+                # compile the others again
+                for s in value:
+                    fragment = self._series.get(id(s))
+                    if fragment is not None:
+                        series[id(s)] = fragment
+                chunks.append("[")
+                for i, s in enumerate(value):
+                    chunks.append("," + inner if i else inner)
+                    chunks.append(self._compile(series, id(s), s, 2))
+                chunks.append(outer + "]")
+            else:
+                fragment = self._components.get(key)
+                if fragment is not None:
+                    components[key] = fragment
+                chunks.append(self._compile(components, key, value, 1))
+        self._components, self._series = components, series
+        chunks.append("}" if len(chunks) == 1 else "\n}")
+        return "".join(chunks)
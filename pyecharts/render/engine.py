@@ -1,22 +1,55 @@
 import os
 from collections import Iterable
-
-from jinja2 import Environment
+from typing import TYPE_CHECKING
 
 from ..commons import utils
-from ..datasets import EXTRA, FILENAMES
+from ..datasets import DEPENDENCY_RESOLVER
 from ..globals import CurrentConfig, NotebookType
 from ..types import Any, Optional
 from .display import HTML, Javascript
 
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
+
+# buffer size of streamed html files
+_STREAM_BUFFER_SIZE = 1 << 20
+
 
 def write_utf8_html_file(file_name: str, html_content: str):
     with open(file_name, "w+", encoding="utf-8") as html_file:
         html_file.write(html_content)
 
 
+def write_utf8_html_stream(file_name: str, chunks: Iterable):
+    with open(
+        file_name, "w+", encoding="utf-8", buffering=_STREAM_BUFFER_SIZE
+    ) as html_file:
+        for chunk in chunks:
+            html_file.write(chunk)
+
+
+class LazyOptions:
+    """
+    Dump the options of a chart only when the template writes them, so that
+    a streamed page holds the JSON of a single chart at a time.
+    """
+
+    __slots__ = ("chart",)
+
+    def __init__(self, chart: Any):
+        self.chart = chart
+
+    def __str__(self) -> str:
+        chart = self.chart
+        # bypass the fragment cache, it would keep the JSON of every chart
+        return chart._serializer().dumps(
+            chart.options, typed_array_threshold=chart.typed_array_threshold
+        )
+
+
 class RenderEngine:
-    def __init__(self, env: Optional[Environment] = None):
+    def __init__(self, env: Optional["Environment"] = None):
         self.env = env or CurrentConfig.GLOBAL_ENV
 
     @staticmethod
@@ -28,27 +61,35 @@ class RenderEngine:
             # TODO: if?
             if dep.startswith("https://api.map.baidu.com"):
                 links.append(dep)
-            if dep in FILENAMES:
-                f, ext = FILENAMES[dep]
-                links.append("{}{}.{}".format(chart.js_host, f, ext))
-            else:
-                for url, files in EXTRA.items():
-                    if dep in files:
-                        f, ext = files[dep]
-                        links.append("{}{}.{}".format(url, f, ext))
-                        break
+            resolved = DEPENDENCY_RESOLVER.resolve(dep)
+            if resolved is not None:
+                url, f, ext = resolved
+                links.append("{}{}.{}".format(url or chart.js_host, f, ext))
         chart.dependencies = links
         return chart
 
-    def render_chart_to_file(self, template_name: str, chart: Any, path: str, **kwargs):
+    def render_chart_to_file(
+        self,
+        template_name: str,
+        chart: Any,
+        path: str,
+        is_stream: bool = False,
+        **kwargs,
+    ):
         """
         Render a chart or page to local html files.
 
         :param chart: A Chart or Page object
         :param path: The destination file which the html code write to
         :param template_name: The name of template file.
+        :param is_stream: Write the html chunk by chunk as the template renders
+                          it instead of building the whole document first.
         """
         tpl = self.env.get_template(template_name)
+        if is_stream:
+            chunks = tpl.generate(chart=self.generate_js_link(chart), **kwargs)
+            write_utf8_html_stream(path, utils.replace_placeholder_stream(chunks))
+            return
         html = utils.replace_placeholder(
             tpl.render(chart=self.generate_js_link(chart), **kwargs)
         )
@@ -66,16 +107,25 @@ class RenderEngine:
 
 
 def render(
-    chart, path: str, template_name: str, env: Optional[Environment], **kwargs
+    chart,
+    path: str,
+    template_name: str,
+    env: Optional["Environment"],
+    is_stream: bool = False,
+    **kwargs,
 ) -> str:
     RenderEngine(env).render_chart_to_file(
-        template_name=template_name, chart=chart, path=path, **kwargs
+        template_name=template_name,
+        chart=chart,
+        path=path,
+        is_stream=is_stream,
+        **kwargs,
     )
     return os.path.abspath(path)
 
 
 def render_embed(
-    chart, template_name: str, env: Optional[Environment], **kwargs
+    chart, template_name: str, env: Optional["Environment"], **kwargs
 ) -> str:
     return RenderEngine(env).render_chart_to_template(
         template_name=template_name, chart=chart, **kwargs
@@ -112,6 +162,9 @@ def render_notebook(self, notebook_template, lab_template):
 def load_javascript(chart):
     scripts = []
     for dep in chart.js_dependencies.items:
-        f, ext = FILENAMES[dep]
-        scripts.append("{}{}.{}".format(CurrentConfig.ONLINE_HOST, f, ext))
+        resolved = DEPENDENCY_RESOLVER.resolve(dep)
+        if resolved is None:
+            raise KeyError(dep)
+        url, f, ext = resolved
+        scripts.append("{}{}.{}".format(url or CurrentConfig.ONLINE_HOST, f, ext))
     return Javascript(lib=scripts)
@@ -0,0 +1,278 @@
+import datetime
+import decimal
+import json
+import sys
+import warnings
+
+import simplejson
+
+from ..commons import utils
+from ..commons.utils import JsCode
+from ..globals import JsonBackendType, WarningType
+from ..options.charts_options import BatchItems
+from ..options.series_options import BasicOpts
+from ..types import Optional
+from . import encoder
+
+
+class Serializer:
+    """
+    A JSON backend. Options are dumped with the same semantics whatever the
+    backend: `None` and empty strings are pruned from dicts, `BasicOpts` are
+    unwrapped, NaN and +/-Infinity become `null`, dates are dumped as ISO
+    strings and `JsCode` as raw javascript. Backends may differ in spacing,
+    in how they escape non-ASCII characters and in how they write `Decimal`
+    numbers: the builtin and simplejson backends write them exactly, the
+    json and orjson ones, which can not, as the nearest float.
+    """
+
+    name: str = ""
+
+    def dumps(
+        self,
+        options,
+        with_quotes: bool = False,
+        typed_array_threshold: Optional[int] = None,
+    ) -> str:
+        plain = to_builtin(
+            options, typed_array_threshold, numpy_arrays=self._numpy_arrays
+        )
+        return utils.JS_CODES.splice(self._dumps(plain), with_quotes=with_quotes)
+
+    # whether contiguous numeric numpy arrays can be handed over as they are
+    _numpy_arrays = False
+
+    def _dumps(self, plain) -> str:
+        raise NotImplementedError
+
+
+class BuiltinSerializer(Serializer):
+    """
+    The single pass compiler of `pyecharts.render.encoder`, see
+    `compile_options`.
+    """
+
+    name = JsonBackendType.BUILTIN
+
+    def dumps(
+        self,
+        options,
+        with_quotes: bool = False,
+        typed_array_threshold: Optional[int] = None,
+    ) -> str:
+        return encoder.compile_options(
+            options,
+            with_quotes=with_quotes,
+            typed_array_threshold=typed_array_threshold,
+        )
+
+
+class SimpleJsonSerializer(Serializer):
+    name = JsonBackendType.SIMPLEJSON
+
+    def _dumps(self, plain) -> str:
+        return simplejson.dumps(plain, indent=4, ignore_nan=True)
+
+
+class StdlibJsonSerializer(Serializer):
+    """
+    Writes `Decimal` numbers as floats.
+    """
+
+    name = JsonBackendType.JSON
+
+    def _dumps(self, plain) -> str:
+        return json.dumps(plain, indent=4, default=_decimal_default)
+
+
+class OrjsonSerializer(Serializer):
+    """
+    Indents with 2 spaces, writes non-ASCII characters as they are and
+    `Decimal` numbers as floats.
+    """
+
+    name = JsonBackendType.ORJSON
+    _numpy_arrays = True
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        self._option = (
+            orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+
+    def _dumps(self, plain) -> str:
+        try:
+            content = self._orjson.dumps(
+                plain, default=_decimal_default, option=self._option
+            )
+        except self._orjson.JSONEncodeError:
+            # integers over 64 bits and the like, numpy arrays handed over
+            # as they are then go through `tolist()`
+            return simplejson.dumps(
+                plain, indent=4, ignore_nan=True, default=_ndarray_default
+            )
+        return content.decode("utf-8")
+
+
+_SERIALIZERS = {
+    JsonBackendType.BUILTIN: BuiltinSerializer,
+    JsonBackendType.SIMPLEJSON: SimpleJsonSerializer,
+    JsonBackendType.JSON: StdlibJsonSerializer,
+    JsonBackendType.ORJSON: OrjsonSerializer,
+}
+_INSTANCES = {}
+
+
+def get_serializer(name: str) -> Serializer:
+    """
+    Return the serializer of a `JsonBackendType`. Backends whose package is
+    not installed fall back to simplejson.
+    """
+    serializer = _INSTANCES.get(name)
+    if serializer is None:
+        if name not in _SERIALIZERS:
+            raise ValueError("unknown json backend: {}".format(name))
+        try:
+            serializer = _SERIALIZERS[name]()
+        except ImportError:
+            if WarningType.ShowWarning:
+                warnings.warn(
+                    "json backend {} is not installed, "
+                    "falling back to simplejson".format(name)
+                )
+            serializer = SimpleJsonSerializer()
+        _INSTANCES[name] = serializer
+    return serializer
+
+
+def _not_serializable(o):
+    return TypeError(
+        "Object of type {} is not JSON serializable".format(o.__class__.__name__)
+    )
+
+
+def _decimal_default(o):
+    if isinstance(o, decimal.Decimal):
+        return float(o)
+    raise _not_serializable(o)
+
+
+def _ndarray_default(o):
+    if utils.is_ndarray(o):
+        return o.tolist()
+    raise _not_serializable(o)
+
+
+# numpy dtypes orjson dumps on its own with the same output as `tolist()`
+_NATIVE_DTYPES = ("b1", "i4", "i8", "u4", "u8", "f8")
+
+
+def _is_native_array(arr) -> bool:
+    if arr.ndim not in (1, 2) or not arr.flags.c_contiguous:
+        return False
+    return arr.dtype.isnative and arr.dtype.str[1:] in _NATIVE_DTYPES
+
+
+def to_builtin(
+    options, typed_array_threshold: Optional[int] = None, numpy_arrays: bool = False
+):
+    """
+    Convert chart options into JSON-native python objects any encoder can
+    dump, with the semantics of `encoder.compile_options`. `JsCode` objects
+    are replaced by tokens of `utils.JS_CODES`, to be spliced afterwards.
+
+    :param options: The options to convert, usually `chart.options`.
+    :param typed_array_threshold: See `encoder.pack_typed_array`.
+    :param numpy_arrays: Keep contiguous numeric numpy arrays as they are.
+    """
+
+    def _dict(o, is_source=False):
+        result = {}
+        for key, value in o.items():
+            if value is None:
+                continue
+            if isinstance(value, str) and not value:
+                continue
+            if typed_array_threshold is not None and (
+                is_source or key in encoder._TYPED_ARRAY_KEYS
+            ):
+                if key == "source" and isinstance(value, dict):
+                    result[encoder._keystr(key)] = _dict(value, is_source=True)
+                    continue
+                packed = encoder.pack_typed_array(value, typed_array_threshold)
+                if packed is not None:
+                    value = packed
+            result[encoder._keystr(key)] = _value(value)
+        return result
+
+    # instances shared by several series are only converted once
+    converted = {}
+
+    def _opts(o):
+        result = converted.get(id(o), converted)
+        if result is not converted:
+            return result
+        value = o.opts
+        if isinstance(value, dict):
+            result = _dict(value)
+        elif isinstance(value, (list, tuple)):
+            result = [_value(item) if item else None for item in value]
+        else:
+            result = _value(value) if value else None
+        converted[id(o)] = result
+        return result
+
+    def _ndarray(arr):
+        if arr.ndim == 0:
+            return _value(arr.tolist())
+        if arr.dtype.kind == "M":
+            import numpy as np
+
+            texts = np.datetime_as_string(arr, unit="auto").astype(object)
+            texts[np.isnat(arr)] = None
+            return texts.tolist()
+        if numpy_arrays and _is_native_array(arr):
+            return arr
+        return _value(arr.tolist())
+
+    def _value(o):
+        t = type(o)
+        if t is str or t is int or t is bool or o is None:
+            return o
+        if t is float:
+            return o if o - o == 0 else None
+        if t is dict:
+            return _dict(o)
+        if t is list or t is tuple:
+            return [_value(v) for v in o]
+        if isinstance(o, JsCode):
+            return utils.JS_CODES.token(o)
+        if isinstance(o, str):
+            return str(o)
+        if isinstance(o, int):
+            return int(o)
+        if isinstance(o, float):
+            return _value(float(o))
+        if isinstance(o, decimal.Decimal):
+            return o
+        if isinstance(o, (datetime.date, datetime.datetime)):
+            return o.isoformat()
+        if isinstance(o, dict):
+            return _dict(o)
+        if isinstance(o, (list, tuple, set)):
+            return [_value(v) for v in o]
+        if isinstance(o, BasicOpts):
+            return _opts(o)
+        if isinstance(o, BatchItems):
+            return [_dict(item) for item in o.items()]
+        if utils.is_ndarray(o):
+            return _ndarray(utils.as_ndarray(o))
+        np = sys.modules.get("numpy")
+        if np is not None and isinstance(o, np.generic):
+            return _ndarray(o.reshape(()))
+        # unknown objects can not be serialized
+        return None
+
+    return _value(options)
@@ -0,0 +1,97 @@
+import random
+from unittest.mock import patch
+
+from nose.tools import assert_equal, assert_raises
+
+from pyecharts.commons import binning
+
+
+def _points(count: int, seed: int = 1):
+    rnd = random.Random(seed)
+    return [
+        [rnd.uniform(73, 135), rnd.uniform(18, 53), rnd.randint(1, 9)]
+        for _ in range(count)
+    ]
+
+
+def test_bin_points_grid():
+    points = [[0.1, 0.1, 1], [0.9, 0.4, 1], [1.5, 0.5, 1], [-0.5, -0.5, 3]]
+    assert_equal(
+        binning.bin_points(points, 1),
+        [[-0.5, -0.5, 1], [0.5, 0.5, 2], [1.5, 0.5, 1]],
+    )
+    assert_equal(
+        binning.bin_points(points, 1, aggregate="sum"),
+        [[-0.5, -0.5, 3.0], [0.5, 0.5, 2.0], [1.5, 0.5, 1.0]],
+    )
+    assert_equal(
+        binning.bin_points([p[:2] for p in points], 1, aggregate="sum"),
+        [[-0.5, -0.5, 1], [0.5, 0.5, 2], [1.5, 0.5, 1]],
+    )
+    with assert_raises(ValueError):
+        binning.bin_points(points, 1, method="square")
+
+
+def test_bin_points_same_without_numpy():
+    points = _points(2000)
+    for method in (binning.GRID, binning.HEXBIN):
+        for aggregate in ("count", "sum"):
+            expected = binning._bin_python(points, 0.7, method, aggregate)
+            assert_equal(binning.bin_points(points, 0.7, method, aggregate), expected)
+            total = sum(b[2] for b in expected)
+            if aggregate == "count":
+                assert_equal(total, len(points))
+            else:
+                assert_equal(total, sum(p[2] for p in points))
+
+
+def test_hexbin_nearest_center():
+    points = _points(500)
+    for x, y, *_ in points:
+        (cx, cy, _), = binning.bin_points([[x, y]], 1.5, binning.HEXBIN)
+        distance = (x - cx) ** 2 + (y - cy) ** 2
+        # no other hexagon center is closer
+        for dx, dy in ((1.5, 0), (0.75, 1.5 * 0.866), (-0.75, 1.5 * 0.866)):
+            for sign in (1, -1):
+                other = (x - cx - sign * dx) ** 2 + (y - cy - sign * dy) ** 2
+                assert other >= distance - 1e-9
+
+
+def test_axis_bins():
+    indices, labels = binning.axis_bins([0, 2.5, 5, 10, -1, 11], 2)
+    assert_equal(list(indices), [0, 0, 1, 1, 0, 1])
+    assert_equal(labels, ["-1 - 5", "5 - 11"])
+    indices, labels = binning.axis_bins([0, 2.5, 5, 10, -1, 11], [0, 5, 10])
+    assert_equal(list(indices), [0, 0, 1, 1, -1, -1])
+    indices, labels = binning.axis_bins(["b", "a", "c", "b"], categories=["b", "a"])
+    assert_equal(list(indices), [0, 1, -1, 0])
+    assert_equal(binning.axis_bins(["b", "a"])[1], ["a", "b"])
+    with assert_raises(ValueError):
+        binning.axis_bins([1, 2], [2, 1])
+
+
+def test_count_cells_same_without_numpy():
+    rnd = random.Random(2)
+    xs = [rnd.choice("abcd") for _ in range(3000)]
+    ys = [rnd.gauss(0, 1) for _ in range(3000)]
+    weights = [rnd.random() for _ in range(3000)]
+    x_index, x_labels = binning.axis_bins(xs, categories=["a", "b", "c"])
+    y_index, y_labels = binning.axis_bins(ys, [-3, -1, 0, 1, 3])
+    for aggregate in ("count", "sum", "mean"):
+        cells, value_range = binning.count_cells(
+            x_index, y_index, (3, 4), weights, aggregate
+        )
+        with patch("pyecharts.commons.utils.optional_numpy", return_value=None):
+            x_python, _ = binning.axis_bins(xs, categories=["a", "b", "c"])
+            y_python, _ = binning.axis_bins(ys, [-3, -1, 0, 1, 3])
+            expected = binning.count_cells(
+                x_python, y_python, (3, 4), weights, aggregate
+            )
+        assert_equal([c[:2] for c in cells], [c[:2] for c in expected[0]])
+        for cell, other in zip(cells, expected[0]):
+            assert abs(cell[2] - other[2]) < 1e-9
+        assert_equal(value_range, (min(c[2] for c in cells), max(c[2] for c in cells)))
+    # cells of events out of every bin are left out
+    assert len(cells) <= 12
+    with assert_raises(ValueError):
+        binning.count_cells([0], [0], (1, 1), aggregate="mean")
@@ -1,6 +1,6 @@
 from unittest.mock import patch
 
-from nose.tools import assert_in
+from nose.tools import assert_equal, assert_in
 
 from pyecharts import options as opts
 from pyecharts.charts import BMap
@@ -140,3 +140,25 @@ def test_bmap_progressive_options(fake_writer):
     content = fake_writer.call_args[0][1]
     assert_in("progressive", content)
     assert_in("progressiveThreshold", content)
+
+
+def test_bmap_lines_flow_aggregation():
+    lines = [
+        {"coords": [[116.4, 39.9], [121.5, 31.2]]},
+        {"coords": [[116.4, 39.9], [121.5, 31.2]]},
+    ]
+    bmap = BMap().add("lines", lines, type_=ChartType.LINES, flow_aggregate="count")
+    assert_equal(
+        bmap.options["series"][0]["data"],
+        [{"coords": [[116.4, 39.9], [121.5, 31.2]], "value": 2}],
+    )
+
+    # polylines keep their points and line styles
+    polyline = {
+        "coords": [[116.4, 39.9], [118.8, 32.1], [121.5, 31.2]],
+        "lineStyle": {"color": "red"},
+    }
+    bmap = BMap().add(
+        "lines", [polyline, polyline], type_=ChartType.LINES, flow_aggregate="sum"
+    )
+    assert_equal(bmap.options["series"][0]["data"], [dict(polyline, value=2)])
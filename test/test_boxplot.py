@@ -48,3 +48,17 @@ def test_boxplot_item_base(fake_writer):
     _, content = fake_writer.call_args[0]
     assert_equal(c.theme, "white")
     assert_equal(c.renderer, "canvas")
+
+
+def test_boxplot_outliers():
+    v = [[1, 2, 3, 4, 5, 6, 7, 100, -50], [850, 740, 900, 1070, 930, 850]]
+    c = Boxplot()
+    c.add_xaxis(["a", "b"]).add_yaxis("box", c.prepare_data(v, whisker=1.5))
+    c.add_outliers("outliers", c.prepare_outliers(v))
+    assert_equal(c.options["series"][0]["data"][0], [1, 1.5, 4, 6.5, 7])
+    assert_equal(c.options["series"][1]["type"], "scatter")
+    assert_equal(c.options["series"][1]["data"], [[0, -50], [0, 100]])
+    assert_equal(
+        c.prepare_data(v),
+        [[-50, 1.5, 4, 6.5, 100], [740, 822.5, 875.0, 965.0, 1070]],
+    )
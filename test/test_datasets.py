@@ -1,9 +1,31 @@
+import difflib
+import functools
+import http.server
+import json
+import math
 import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import threading
 from unittest.mock import patch
 
-from nose.tools import assert_equal, raises
+from nose.tools import assert_equal, assert_false, assert_in, assert_raises, raises
 
-from pyecharts.datasets import EXTRA, FuzzyDict, register_url
+from pyecharts.datasets import (
+    COORDINATES,
+    EXTRA,
+    CoordinateStore,
+    DependencyResolver,
+    FuzzyDict,
+    build_coordinate_store,
+    register_geojson,
+    refresh_url,
+    register_url,
+)
+from pyecharts.datasets import geojson as geojson_maps
+from pyecharts.datasets.coordinate_store import main as build_store_main
 
 
 @patch("pyecharts.datasets.urllib.request.urlopen")
@@ -11,9 +33,12 @@ def test_register_url(fake):
     current_path = os.path.dirname(__file__)
     fake_registry = os.path.join(current_path, "fixtures", "registry.json")
     file_name = ["shape-with-internal-borders/an1_hui1_an1_qing4", "js"]
-    with open(fake_registry, encoding="utf8") as f:
-        fake.return_value = f
-        register_url("http://register.url/is/used")
+    with tempfile.TemporaryDirectory() as folder:
+        with open(fake_registry, encoding="utf8") as f, patch(
+            "pyecharts.datasets.CACHE_DIR", folder
+        ):
+            fake.return_value = f
+            register_url("http://register.url/is/used")
         assert_equal(
             EXTRA,
             {
@@ -31,8 +56,285 @@ def test_fuzzy_search_dict():
     assert_equal(fd["我是北京"], [1, 2])
 
 
+def test_fuzzy_search_same_as_scan():
+    def _scan(lookfor):
+        ratios = [
+            difflib.SequenceMatcher(None, lookfor, key).ratio()
+            for key in dict.keys(COORDINATES)
+        ]
+        best = max(ratios)
+        if not best:
+            return None, 0
+        return list(dict.keys(COORDINATES))[ratios.index(best)], best
+
+    for lookfor in ["北京市市", "上海浦东", "广洲", "杭州市西湖", "Shenzen", "abc"]:
+        _, key, _, ratio = COORDINATES._search(lookfor)
+        assert_equal((key, ratio), _scan(lookfor))
+
+
+def test_fuzzy_search_dict_changes():
+    fd = FuzzyDict(cache_size=1)
+    fd.update({"北京市": 1, "南京市": 2})
+    assert_equal(fd["京市"], 1)
+    del fd["北京市"]
+    assert_equal(fd["京市"], 2)
+    fd["东京市"] = 3
+    fd.pop("南京市")
+    assert_equal(fd["京市"], 3)
+    assert_equal(len(fd._cache), 1)
+
+
+def test_fuzzy_search_threads():
+    fd = FuzzyDict(cache_size=2)
+    fd.update({"city{}".format(i): i for i in range(50)})
+    errors = []
+
+    def _lookup(offset):
+        try:
+            for i in range(2000):
+                fd._search("citx{}".format((i + offset) % 8))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=_lookup, args=(i,)) for i in range(8)]
+    # switch threads as often as possible to interleave the cache updates
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert_equal(errors, [])
+    assert_equal(len(fd._cache), 2)
+
+
 @raises(KeyError)
 def test_fuzzy_search_key_error():
     fd = FuzzyDict()
     fd.cutoff = 0.9
     _ = fd["我是北京"]
+
+
+def test_dependency_resolver():
+    filenames = FuzzyDict()
+    filenames.update({"echarts": ["echarts.min", "js"], "北京": ["maps/beijing", "js"]})
+    extra = {}
+    resolver = DependencyResolver(filenames, extra)
+    assert_equal(resolver.resolve("echarts"), (None, "echarts.min", "js"))
+
+    with patch.object(FuzzyDict, "_search") as fake_search:
+        assert_equal(resolver.resolve("北京市"), None)
+        fake_search.assert_not_called()
+
+    extra["https://example.com/"] = {"安庆": ["anqing", "js"]}
+    assert_equal(resolver.resolve("安庆"), ("https://example.com/", "anqing", "js"))
+
+    resolver.is_fuzzy = True
+    with patch.object(FuzzyDict, "_search", wraps=filenames._search) as fake_search:
+        assert_equal(resolver.resolve("北京市"), (None, "maps/beijing", "js"))
+        assert_equal(resolver.resolve("北京市"), (None, "maps/beijing", "js"))
+        assert_equal(fake_search.call_count, 1)
+
+
+def test_datasets_are_loaded_lazily():
+    script = (
+        "import sys, pyecharts\n"
+        "print('FILENAMES' in vars(pyecharts.datasets))\n"
+        "print(any('basic_charts' in m for m in sys.modules))\n"
+        "print('jinja2' in sys.modules)\n"
+        "from pyecharts.charts import Bar, Candlestick\n"
+        "print(len(pyecharts.datasets.FILENAMES) > 0)\n"
+        "print('jinja2' in sys.modules)\n"
+        "Bar().render_embed()\n"
+        "print('jinja2' in sys.modules)\n"
+    )
+    output = subprocess.check_output([sys.executable, "-c", script])
+    assert_equal(
+        output.decode().split(), ["False", "False", "False", "True", "False", "True"]
+    )
+
+
+def test_datasets_are_loaded_eagerly_before_python37():
+    # without module `__getattr__`, names have to be there on import
+    script = (
+        "import sys\n"
+        "sys.version_info = (3, 6, 9)\n"
+        "import pyecharts.charts, pyecharts.datasets\n"
+        "print('COORDINATES' in vars(pyecharts.datasets))\n"
+        "print('Candlestick' in vars(pyecharts.charts))\n"
+    )
+    output = subprocess.check_output([sys.executable, "-c", script])
+    assert_equal(output.decode().split(), ["True", "True"])
+
+
+def test_coordinate_store():
+    coords = {"北京": [116.46, 39.92], "b": [1, 2], "a": [3.5, -4.25], "": [0, 0]}
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "coords.bin")
+        assert_equal(build_coordinate_store(coords, path), 4)
+        with CoordinateStore(path) as store:
+            assert_equal(len(store), 4)
+            assert_equal(sorted(store), sorted(coords))
+            for name, coordinate in coords.items():
+                assert_equal(store[name], coordinate)
+            assert_false("北" in store)
+            assert_equal(store.get("c"), None)
+            assert_equal(store.get(1), None)
+
+        many = {"place-%d" % i: [i, -i] for i in range(1000)}
+        build_coordinate_store(many, path)
+        with CoordinateStore(path) as store:
+            for name, coordinate in many.items():
+                assert_equal(store[name], coordinate)
+            assert_false("place-1000" in store)
+            assert_false("a" in store)
+            assert_false("z" in store)
+
+        source = os.path.join(folder, "coords.json")
+        with open(source, "w", encoding="utf-8") as f:
+            json.dump(coords, f)
+        build_store_main([source, path])
+        with CoordinateStore(path) as store:
+            assert_in("北京", store)
+
+
+def test_geo_coordinate_store():
+    from pyecharts.charts import Geo
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "coords.bin")
+        build_coordinate_store({"北京市朝阳区某街道": [116.5, 39.9]}, path)
+        with CoordinateStore(path) as store, patch(
+            "pyecharts.datasets.COORDINATE_STORES", [store]
+        ):
+            geo = Geo()
+            assert_equal(geo.get_coordinate("北京市朝阳区某街道"), [116.5, 39.9])
+            assert_equal(geo.get_coordinate("北京"), COORDINATES["北京"])
+
+
+def _decode_ring(encoded: str, offset: list, scale: int) -> list:
+    # the decoding echarts does on registerMap
+    x, y, ring = offset[0], offset[1], []
+    for i in range(0, len(encoded), 2):
+        dx, dy = ord(encoded[i]) - 64, ord(encoded[i + 1]) - 64
+        x += (dx >> 1) ^ (-(dx & 1))
+        y += (dy >> 1) ^ (-(dy & 1))
+        ring.append([x / scale, y / scale])
+    return ring
+
+
+# the maps are registered into the process-wide EXTRA, restored afterwards
+@patch.dict("pyecharts.datasets.EXTRA")
+def test_register_geojson():
+    circle = [
+        [100 + 10 * math.cos(i * math.pi / 500), 30 + 10 * math.sin(i * math.pi / 500)]
+        for i in range(1000)
+    ]
+    circle.append(circle[0])
+    square = [[0, 0], [40, 0], [40, 40], [0, 40], [0, 0]]
+    content = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "properties": {"name": "circle"},
+                "geometry": {"type": "Polygon", "coordinates": [circle]},
+            },
+            {
+                "type": "Feature",
+                "properties": {"name": "squares"},
+                "geometry": {"type": "MultiPolygon", "coordinates": [[square]]},
+            },
+        ],
+    }
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "shapes.json")
+        with open(path, "w") as f:
+            json.dump(content, f)
+        cache_dir = os.path.join(folder, "cache")
+        levels = [0, 0.1]
+        names = register_geojson("shapes", path, tolerances=levels, cache_dir=cache_dir)
+        assert_equal(names, ["shapes", "shapes@0.1"])
+        assert_equal(len(os.listdir(cache_dir)), 2)
+        for name in names:
+            url, f, ext = DependencyResolver().resolve(name)
+            assert_equal(url, pathlib.Path(cache_dir).resolve().as_uri() + "/")
+            with open(os.path.join(cache_dir, f + "." + ext), encoding="utf-8") as f:
+                assert_in('registerMap("{}", {{'.format(name), f.read())
+
+        # outputs are reused as long as the file and the parameters are the same
+        with patch.object(geojson_maps, "simplify_geojson") as fake:
+            register_geojson("shapes", path, tolerances=levels, cache_dir=cache_dir)
+            fake.assert_not_called()
+        register_geojson("shapes", path, tolerances=[0.2], cache_dir=cache_dir)
+        assert_equal(len(os.listdir(cache_dir)), 3)
+
+    simplified = geojson_maps.simplify_geojson(content, 0.1)
+    ring = simplified["features"][0]["geometry"]["coordinates"][0]
+    assert 4 <= len(ring) < 100
+    ring = geojson_maps.simplify_ring(circle, 0.1, geojson_maps.VISVALINGAM)
+    assert 4 <= len(ring) < 100
+    triangle = [circle[i] for i in (0, 250, 500, 1000)]
+    assert_equal(geojson_maps.simplify_ring(circle, 1000), triangle)
+
+    encoded = geojson_maps.encode_geojson(simplified, scale=1024)
+    geometry = encoded["features"][0]["geometry"]
+    decoded = _decode_ring(
+        geometry["coordinates"][0], geometry["encodeOffsets"][0], 1024
+    )
+    original = simplified["features"][0]["geometry"]["coordinates"][0]
+    for (x0, y0), (x1, y1) in zip(original, decoded):
+        assert abs(x0 - x1) <= 0.5 / 1024 and abs(y0 - y1) <= 0.5 / 1024
+    geometry = encoded["features"][1]["geometry"]
+    # 40 degrees steps are cut to stay out of the surrogates
+    decoded = _decode_ring(
+        geometry["coordinates"][0][0], geometry["encodeOffsets"][0][0], 1024
+    )
+    assert_equal([p for p in decoded if p in square], square)
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def test_register_url_cache():
+    fixtures = os.path.join(os.path.dirname(__file__), "fixtures")
+    # a local stand-in for the asset host
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), functools.partial(_QuietHandler, directory=fixtures)
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = "http://127.0.0.1:{}".format(server.server_address[1])
+    prefix = url + "/js/"
+    try:
+        with tempfile.TemporaryDirectory() as folder, patch(
+            "pyecharts.datasets.CACHE_DIR", folder
+        ):
+            register_url(url)
+            files = EXTRA.pop(prefix)
+            assert_in("安庆", files)
+            server.shutdown()
+            server.server_close()
+
+            # later runs do not need the network
+            with patch("pyecharts.datasets.urllib.request.urlopen") as fake:
+                register_url(url)
+                fake.assert_not_called()
+            assert_equal(EXTRA.pop(prefix), files)
+
+            # a stale copy is only used when the registry can not be downloaded
+            with patch("pyecharts.datasets.time.sleep"), patch(
+                "pyecharts.datasets.warnings.warn"
+            ) as fake_warn:
+                register_url(url, max_age=0, timeout=1)
+                fake_warn.assert_called_once()
+                assert_equal(EXTRA.pop(prefix), files)
+                with assert_raises(OSError):
+                    refresh_url(url, timeout=1)
+    finally:
+        server.server_close()
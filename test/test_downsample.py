@@ -0,0 +1,58 @@
+import datetime
+import math
+import random
+
+import numpy as np
+from nose.tools import assert_equal, assert_raises
+
+from pyecharts.commons import downsample
+
+
+def _series(size: int, seed: int = 1) -> list:
+    rnd = random.Random(seed)
+    values, value = [], 0
+    for _ in range(size):
+        value += rnd.randint(-5, 5)
+        values.append(value)
+    # a spike and a gap
+    values[size // 3] += 1000
+    values[size // 2] = None
+    return values
+
+
+def test_lttb_same_without_numpy():
+    y = _series(5000)
+    x = list(range(5000))
+    indices = downsample.lttb(x, y, 100)
+    assert_equal(len(indices), 100)
+    assert_equal(indices[0], 0)
+    assert_equal(indices[-1], 4999)
+    assert_equal(indices, sorted(set(indices)))
+    values = [math.nan if v is None else v for v in y]
+    assert_equal(indices, downsample._lttb_python(x, values, 100))
+    # the spike stands out of its bucket
+    assert 5000 // 3 in indices
+
+
+def test_minmax_same_without_numpy():
+    y = _series(5003)
+    indices = downsample.minmax(y, 200)
+    values = [math.nan if v is None else v for v in y]
+    assert_equal(indices, downsample._minmax_python(values, 100))
+    assert 5003 // 3 in indices
+    assert len(indices) <= 202
+    assert_equal(downsample.minmax(y[:10], 200), list(range(10)))
+
+
+def test_downsample_positions():
+    dates = [datetime.date(2020, 1, 1) + datetime.timedelta(days=i) for i in range(3)]
+    assert_equal(downsample.positions(dates)[1] - downsample.positions(dates)[0], 86400)
+    assert_equal(downsample.positions(["a", "b"]), [0.0, 1.0])
+    times = np.array(["2020-01-01T00:00", "2020-01-01T00:01"], dtype="datetime64[m]")
+    assert_equal(list(downsample.positions(times)), [1577836800.0, 1577836860.0])
+    assert_equal(
+        [downsample.is_numeric(x) for x in ([1, 2.5], np.arange(3), dates, [True])],
+        [True, True, False, False],
+    )
+    with assert_raises(ValueError):
+        downsample.downsample([1, 2], [1, 2], 10, "average")
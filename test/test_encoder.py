@@ -0,0 +1,281 @@
+import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import simplejson as json
+from nose.tools import (
+    assert_equal,
+    assert_false,
+    assert_in,
+    assert_not_equal,
+    assert_not_in,
+    assert_raises,
+    assert_true,
+)
+
+from pyecharts import options as opts
+from pyecharts.charts import Bar
+from pyecharts.charts.base import default
+from pyecharts.commons import utils
+from pyecharts.render.encoder import compile_options, pack_typed_array
+
+
+def _legacy_dump(options: dict) -> str:
+    return utils.replace_placeholder(
+        json.dumps(
+            utils.remove_key_with_none_value(options),
+            indent=4,
+            default=default,
+            ignore_nan=True,
+        )
+    )
+
+
+def test_compile_options_prune_values():
+    options = {
+        "a": None,
+        "b": "",
+        "c": {"d": None, "e": [None, "", 1.5, float("nan")]},
+        "f": (1, 2),
+        "g": {},
+        "h": [],
+    }
+    expected = (
+        "{\n"
+        '    "c": {\n'
+        '        "e": [\n'
+        "            null,\n"
+        '            "",\n'
+        "            1.5,\n"
+        "            null\n"
+        "        ]\n"
+        "    },\n"
+        '    "f": [\n'
+        "        1,\n"
+        "        2\n"
+        "    ],\n"
+        '    "g": {},\n'
+        '    "h": []\n'
+        "}"
+    )
+    assert_equal(compile_options(options), expected)
+
+
+def test_compile_options_same_as_legacy_dump():
+    options = {
+        "title": opts.TitleOpts(title="标题"),
+        "label": opts.LabelOpts(formatter=utils.JsCode("function (x) {\n return x; }")),
+        "date": datetime.date(2020, 1, 1),
+        "flag": True,
+        "keys": {1: "a", None: "b", 1.5: "c"},
+    }
+    assert_equal(compile_options(options), _legacy_dump(options))
+
+
+def test_compile_options_js_code():
+    options = {"formatter": utils.JsCode("function () { return 'a\\nb'; }")}
+    assert_in(
+        "\"formatter\": function () { return 'a\\nb'; }", compile_options(options)
+    )
+    assert_in(
+        '"formatter": "function () { return \'a\\nb\'; }"',
+        compile_options(options, with_quotes=True),
+    )
+
+
+def test_chart_dump_options():
+    c = (
+        Bar()
+        .add_xaxis(["A", "B"])
+        .add_yaxis("series0", [1, 2])
+        .set_global_opts(title_opts=opts.TitleOpts(title="Bar"))
+    )
+    assert_equal(c.dump_options(), _legacy_dump(c.options))
+
+
+def test_compile_options_ndarray():
+    arrays = [
+        np.array([1.5, np.nan, 3, -np.inf]),
+        np.arange(3),
+        np.array([[1, 2, 3], [4, 5, 6]], dtype=np.float32),
+        np.array([True, False]),
+        np.array(["a", "中"]),
+        np.zeros((2, 0)),
+        np.zeros((2, 2, 2)),
+    ]
+    for arr in arrays:
+        assert_equal(
+            compile_options({"data": arr}), _legacy_dump({"data": arr.tolist()})
+        )
+
+
+def test_compile_options_pandas():
+    df = pd.DataFrame({"name": ["a", "b"], "value": [1, 2]})
+    expected = _legacy_dump({"data": [["a", 1], ["b", 2]]})
+    assert_equal(compile_options({"data": df}), expected)
+    series = pd.Series([1.0, 2.0])
+    assert_equal(compile_options({"data": series}), _legacy_dump({"data": [1.0, 2.0]}))
+
+
+def test_compile_options_numpy_scalar():
+    options = {"a": np.int64(1), "b": np.bool_(True), "c": np.float64(0.5)}
+    assert_equal(compile_options(options), _legacy_dump({"a": 1, "b": True, "c": 0.5}))
+
+
+def test_add_dataset_with_dataframe():
+    df = pd.DataFrame({"product": ["A", "B"], "count": [1, 2]})
+    c = Bar().add_dataset(source=df)
+    assert_in('"source": {\n', c.dump_options())
+    assert_equal(list(c.options["dataset"]["source"]), ["product", "count"])
+
+
+def test_pack_typed_array():
+    packed = pack_typed_array([[1, 2], [3, 4]], threshold=2)
+    assert_equal(
+        packed,
+        {
+            "__typed_array__": {
+                "dtype": "int32",
+                "shape": [2, 2],
+                "data": "AQAAAAMAAAACAAAABAAAAA==",
+            }
+        },
+    )
+    packed = pack_typed_array(np.array([0.5], dtype=np.float32), threshold=1)
+    assert_equal(packed["__typed_array__"]["dtype"], "float32")
+    assert_equal(pack_typed_array([1, 2], threshold=3), None)
+    assert_equal(pack_typed_array(["a", "b"], threshold=1), None)
+    assert_equal(pack_typed_array([[1, 2], [3]], threshold=1), None)
+
+
+def test_compile_options_typed_array_threshold():
+    options = {
+        "series": [{"data": [1.5, 2.5], "markPoint": {"data": [1, 2]}}],
+        "dataset": {"source": {"x": [1, 2], "name": ["a", "b"]}},
+    }
+    content = compile_options(options, typed_array_threshold=2)
+    assert_equal(content.count("__typed_array__"), 3)
+    assert_in('"name": [', content)
+    assert_not_in("__typed_array__", compile_options(options))
+
+
+def _cached_bar() -> Bar:
+    return Bar(init_opts=opts.InitOpts(is_fragment_cache=True))
+
+
+def test_fragment_cache_reuses_unchanged_series():
+    c = _cached_bar().add_xaxis(["A", "B"]).add_yaxis("series0", [1, 2])
+    first = c.dump_options()
+    with patch("pyecharts.render.encoder.compile_options") as fake_compile:
+        assert_equal(c.dump_options(), first)
+        fake_compile.assert_not_called()
+
+    c.add_yaxis("series1", [3, 4])
+    with patch(
+        "pyecharts.render.encoder.compile_options", wraps=compile_options
+    ) as fake_compile:
+        content = c.dump_options()
+    # only the new series and the legend are compiled
+    assert_equal(fake_compile.call_count, 2)
+    assert_equal(content, compile_options(c.options))
+
+
+def test_fragment_cache_invalidation():
+    c = _cached_bar().add_xaxis(["A", "B"]).add_yaxis("series0", [1, 2])
+    c.dump_options()
+    c.set_series_opts(label_opts=opts.LabelOpts(is_show=False))
+    c.set_global_opts(xaxis_opts=opts.AxisOpts(name="x"))
+    assert_equal(c.dump_options(), compile_options(c.options))
+
+    # in-place changes of the first levels are picked up
+    c.options["series"][0]["data"].append(3)
+    c.options["xAxis"][0]["name"] = "xx"
+    c.options["series"][0]["label"].update(color="red")
+    assert_in('"color": "red"', c.dump_options())
+
+    # deeper ones have to be announced
+    c.options["xAxis"][0]["splitLine"].get("lineStyle").update(width=2)
+    assert_not_equal(c.dump_options(), compile_options(c.options))
+    c.invalidate_options("xAxis", "yAxis")
+    assert_equal(c.dump_options(), compile_options(c.options))
+
+    # items of long lists are checked one by one
+    c.options["series"][0]["data"] = list(range(100))
+    c.dump_options()
+    c.options["series"][0]["data"][5] = {"value": 999}
+    assert_in('"value": 999', c.dump_options())
+
+
+def test_dump_options_without_fragment_cache():
+    c = Bar().add_xaxis(list(range(100))).add_yaxis("series0", list(range(100)))
+    c.dump_options()
+    c.options["series"][0]["data"][5] = {"value": 999}
+    c.options["xAxis"][0]["splitLine"].get("lineStyle").update(width=2)
+    assert_equal(c.dump_options(), compile_options(c.options))
+
+
+def test_compile_options_shared_opts():
+    label = opts.LabelOpts(is_show=False)
+    options = {"series": [{"label": label}, {"label": label}], "label": label}
+    assert_equal(compile_options(options), _legacy_dump(options))
+
+
+def test_frozen_opts():
+    label = opts.LabelOpts(is_show=False).freeze()
+    assert_true(label.is_frozen)
+    options = {"series": [{"label": label}]}
+    assert_equal(compile_options(options), _legacy_dump(options))
+
+    # the cached fragment is reused even if opts are changed behind its back
+    label.opts["show"] = True
+    assert_in('"show": false', compile_options(options))
+
+    label.update(color="red")
+    assert_equal(compile_options(options), _legacy_dump(options))
+    assert_in('"show": true', compile_options(options))
+    assert_false(opts.LabelOpts().is_frozen)
+
+
+def test_frozen_nested_opts():
+    text_style = opts.TextStyleOpts(color="red")
+    axis = opts.AxisOpts(name_textstyle_opts=text_style).freeze()
+    assert_true(text_style.is_frozen)
+    options = {"xAxis": [axis]}
+    assert_in('"red"', compile_options(options))
+
+    # updating the nested opts drops the JSON of the outer ones
+    text_style.update(color="blue")
+    assert_equal(compile_options(options), _legacy_dump(options))
+    assert_in('"blue"', compile_options(options))
+
+    # so does updating opts nested by an update
+    font = opts.TextStyleOpts(font_size=12)
+    axis.update(nameTextStyle=font)
+    compile_options(options)
+    font.update(font_size=14)
+    assert_equal(compile_options(options), _legacy_dump(options))
+
+    # a parent updated many times with the same nested opts is kept once
+    for _ in range(100):
+        axis.update(nameTextStyle=font)
+    assert_equal(len(font._fragments.parents), 1)
+
+
+def test_compile_options_batch_items():
+    items = opts.PieItems(
+        values=np.array([1, 2, 3]),
+        names=["a", "", None],
+        colors=["red", None, "blue"],
+        opacities=0.5,
+    )
+    expected = [
+        {"name": "a", "value": 1, "itemStyle": {"color": "red", "opacity": 0.5}},
+        {"value": 2, "itemStyle": {"opacity": 0.5}},
+        {"value": 3, "itemStyle": {"color": "blue", "opacity": 0.5}},
+    ]
+    assert_equal(compile_options({"data": items}), _legacy_dump({"data": expected}))
+    empty = {"data": opts.BarItems(values=[])}
+    assert_equal(compile_options(empty), '{\n    "data": []\n}')
+    with assert_raises(ValueError):
+        opts.BarItems(values=[1, 2], colors=["red"])
@@ -0,0 +1,39 @@
+from nose.tools import assert_equal, assert_raises
+
+from pyecharts.commons import flows
+
+
+def test_aggregate_flows():
+    routes = [
+        ([1, 2], [3, 4], 2),
+        ("a", "b"),
+        ([1, 2], [3, 4], 5),
+    ]
+    assert_equal(flows.aggregate_flows(routes), [([1, 2], [3, 4], 7), ("a", "b", 1)])
+    assert_equal(flows.aggregate_flows(routes, "count", top_k=1), [([1, 2], [3, 4], 2)])
+    with assert_raises(ValueError):
+        flows.aggregate_flows(routes, "mean")
+
+
+def test_aggregate_dict_flows():
+    polyline = {
+        "coords": [[1, 2], [3, 4], [5, 6]],
+        "lineStyle": {"color": "red"},
+        "name": "route",
+        "value": 2,
+    }
+    routes = [
+        polyline,
+        {"coords": [[1, 2], [3, 4], [5, 6]], "value": 3},
+        # the same endpoints through another point are another route
+        {"coords": [[1, 2], [0, 0], [5, 6]]},
+    ]
+    assert_equal(
+        flows.aggregate_flows(routes),
+        [dict(polyline, value=5), {"coords": [[1, 2], [0, 0], [5, 6]], "value": 1}],
+    )
+    assert_equal(polyline["value"], 2)
+
+    data = flows.scale_flow_widths(flows.aggregate_flows(routes), [2, 4])
+    assert_equal(data[0]["lineStyle"], {"color": "red", "width": 4})
+    assert_equal(data[1]["lineStyle"], {"width": 2})
@@ -1,10 +1,20 @@
 from unittest.mock import patch
 
-from nose.tools import assert_equal, assert_in
+from nose.tools import (
+    assert_equal,
+    assert_false,
+    assert_in,
+    assert_raises,
+    assert_true,
+    raises,
+)
 
+from pyecharts import datasets
 from pyecharts import options as opts
 from pyecharts.charts import Geo
+from pyecharts.exceptions import NonexistentCoordinatesException
 from pyecharts.faker import Faker
+from pyecharts.globals import ChartType
 
 
 @patch("pyecharts.render.engine.write_utf8_html_file")
@@ -64,3 +74,114 @@ def test_geo_dump_options_with_quotes():
     c = _geo_chart()
     formatter = """"formatter": "function (params) {        return params.name + ' : ' + params.value[2];    }"""  # noqa
     assert_in(formatter, c.dump_options_with_quotes())
+
+
+def test_geo_batch_coordinates():
+    data = [["广州", 1], ["不存在", 2], ["广州", 3], ["北京", 4], ["不存在", 5]]
+    c = Geo(is_ignore_nonexistent_coord=True).add_schema(maptype="china")
+    with patch.object(Geo, "get_coordinate", wraps=c.get_coordinate) as fake:
+        c.add("geo", data)
+    assert_equal(fake.call_count, 3)
+    names = [d["name"] for d in c.options["series"][0]["data"]]
+    assert_equal(names, ["广州", "广州", "北京"])
+    assert_equal(c.coordinate_misses, {"不存在": 2})
+
+    c.add("lines", [["广州", "北京"], ["广州", "不存在"]], type_=ChartType.LINES)
+    assert_equal(len(c.options["series"][1]["data"]), 1)
+    assert_equal(c.coordinate_misses, {"不存在": 3})
+
+
+def test_geo_generator_data_pair():
+    pairs = [["广州", 1], ["北京", 2]]
+    c = Geo().add_schema(maptype="china").add("geo", ((n, v) for n, v in pairs))
+    names = [d["name"] for d in c.options["series"][0]["data"]]
+    assert_equal(names, ["广州", "北京"])
+
+
+@raises(NonexistentCoordinatesException)
+def test_geo_nonexistent_coordinates():
+    Geo().add_schema(maptype="china").add("geo", [["广州", 1], ["不存在", 2]])
+
+
+def test_geo_added_coordinates_stay_in_chart():
+    c0 = Geo().add_coordinate("某地", 110.5, 30.5)
+    c1 = Geo()
+    assert_equal(c0.get_coordinate("某地"), [110.5, 30.5])
+    assert_equal(c1.get_coordinate("某地"), None)
+    assert_false(dict.__contains__(datasets.COORDINATES, "某地"))
+    # added coordinates are matched fuzzily too
+    assert_equal(c0.get_coordinate("某地方"), [110.5, 30.5])
+    assert_equal(c0.get_coordinate("广州"), datasets.COORDINATES["广州"])
+
+
+def test_geo_added_coordinates_lru():
+    c = Geo(max_added_coordinates=2)
+    c.add_coordinate("甲地", 1, 1).add_coordinate("乙地", 2, 2)
+    c.get_coordinate("甲地")
+    c.add_coordinate("丙地", 3, 3)
+    assert_equal(list(c._coordinates.added), ["甲地", "丙地"])
+
+    # hits only reorder the added coordinates, their fuzzy index is kept
+    assert_equal(c._coordinates.search("丙地方"), [3, 3])
+    index = c._coordinates.added._index
+    c.get_coordinate("甲地")
+    assert_true(c._coordinates.added._index is index)
+    c.add_coordinate("丁地", 4, 4)
+    assert_equal(list(c._coordinates.added), ["甲地", "丁地"])
+
+
+def test_geo_lines_flow_aggregation():
+    flights = [("广州", "北京", 2), ("上海", "北京"), ("广州", "北京", 3), ("广州", "北京")]
+    c = Geo().add_schema(maptype="china")
+    c.add("sum", flights, type_=ChartType.LINES, flow_aggregate="sum")
+    c.add("count", flights, type_=ChartType.LINES, flow_aggregate="count")
+    c.add(
+        "top",
+        flights,
+        type_=ChartType.LINES,
+        flow_aggregate="sum",
+        flow_top_k=1,
+        flow_width_range=[1, 5],
+    )
+    summed, counted, top = (s["data"] for s in c.options["series"])
+    assert_equal(
+        [(d["name"], d["value"]) for d in summed], [("广州->北京", 6), ("上海->北京", 1)]
+    )
+    assert_equal([d["value"] for d in counted], [3, 1])
+    assert_equal(len(top), 1)
+    assert_equal(top[0]["lineStyle"], {"width": 5})
+    assert_equal(top[0]["coords"], summed[0]["coords"])
+    with assert_raises(ValueError):
+        c.add("top", flights, type_=ChartType.LINES, flow_top_k=1)
+
+
+def test_geo_binned_scatter():
+    c = Geo().add_schema(maptype="china")
+    for name, (lng, lat) in [("p0", (116.1, 39.9)), ("p1", (116.4, 39.6))]:
+        c.add_coordinate(name, lng, lat)
+    data = [("p0", 1), ("p1", 2), ("p1", 3)]
+    c.add("bins", data, bin_method="grid", bin_sizes=[1, 0.25], bin_aggregate="sum")
+    series = c.options["series"][0]
+    assert_equal(series["id"], "{}_0".format(c.chart_id))
+    assert_equal(series["data"], [[116.5, 39.5, 6.0]])
+    assert_equal(len(c.js_functions.items), 1)
+    js_code = str(c.js_functions.items[0])
+    assert_in("georoam", js_code)
+    assert_in("[116.125, 39.875, 1.0]", js_code)
+    assert_in("chart_" + c.chart_id, js_code)
+
+    c.add("points", data)
+    assert_equal(len(c.options["series"][1]["data"]), 3)
+    assert_false("id" in c.options["series"][1] and c.options["series"][1]["id"])
+
+
+def test_geo_binned_series_of_same_name():
+    c = Geo().add_schema(maptype="china")
+    c.add_coordinate("p0", 116.1, 39.9).add_coordinate("p1", 116.4, 39.6)
+    data = [("p0", 1), ("p1", 2)]
+    c.add("bins", data, bin_method="grid", bin_sizes=[1, 0.25])
+    c.add("bins", data, bin_method="grid", bin_sizes=[1, 0.25])
+    ids = [s["id"] for s in c.options["series"]]
+    assert_equal(len(set(ids)), 2)
+    for series_id, js_code in zip(ids, c.js_functions.items):
+        assert_in('id: "{}"'.format(series_id), str(js_code))
@@ -40,6 +40,7 @@ def test_init_options_remove_none():
     expected = {
         "animationOpts": {},
         "height": "500px",
+        "is_fragment_cache": False,
         "page_title": "Awesome-pyecharts",
         "renderer": "canvas",
         "theme": "white",
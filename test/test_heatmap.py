@@ -21,3 +21,33 @@ def test_heatmap_base(fake_writer):
     _, content = fake_writer.call_args[0]
     assert_equal(c.theme, "white")
     assert_equal(c.renderer, "canvas")
+
+
+def test_heatmap_binned():
+    x = ["Mon", "Tue", "Mon", "Sun", "Mon"]
+    y = [0.5, 1.5, 0.7, 3.2, 9]
+    c = (
+        HeatMap()
+        .add_xaxis(["Mon", "Tue", "Wed"])
+        .add_binned("events", x, y, y_bins=[0, 1, 2, 4])
+    )
+    assert_equal(c.options["xAxis"][0]["data"], ["Mon", "Tue", "Wed"])
+    assert_equal(c.options["yAxis"][0]["data"], ["0 - 1", "1 - 2", "2 - 4"])
+    assert_equal(c.options["series"][0]["data"], [[0, 0, 2], [1, 1, 1]])
+    assert_equal(
+        (c.options["visualMap"]["min"], c.options["visualMap"]["max"]), (1, 2)
+    )
+
+
+def test_heatmap_binned_visualmaps():
+    visualmaps = [opts.VisualMapOpts(), opts.VisualMapOpts(dimension=0)]
+    c = (
+        HeatMap()
+        .set_global_opts(visualmap_opts=visualmaps)
+        .add_binned("events", ["Mon", "Mon", "Tue"], [0.5, 0.7, 1.5], y_bins=[0, 1, 2])
+    )
+    first, second = c.options["visualMap"]
+    assert_equal((first["min"], first["max"]), (1, 2))
+    assert_equal(second, visualmaps[1])
+    # the options passed in are left as they are
+    assert_equal(visualmaps[0].opts["max"], 100)
@@ -1,6 +1,8 @@
 from unittest.mock import patch
 
-from nose.tools import assert_equal, assert_in
+import numpy as np
+import pandas as pd
+from nose.tools import assert_equal, assert_in, assert_true
 
 from pyecharts import options as opts
 from pyecharts.charts import Line
@@ -90,3 +92,70 @@ def test_line_opts_with_zlevel_z(fake_writer):
     _, content = fake_writer.call_args[0]
     assert_in("zlevel", content)
     assert_in("z", content)
+
+
+def test_line_numpy_data():
+    x_axis, y_axis = ["A", "B", "C"], [1.5, 2.0, float("nan")]
+    c0 = Line().add_xaxis(x_axis).add_yaxis("series0", y_axis)
+    c1 = Line().add_xaxis(np.array(x_axis)).add_yaxis("series0", np.array(y_axis))
+    c2 = Line().add_xaxis(x_axis).add_yaxis("series0", pd.Series(y_axis))
+    assert_equal(c0.dump_options(), c1.dump_options())
+    assert_equal(c0.dump_options(), c2.dump_options())
+
+
+def test_line_typed_array_payload():
+    c = (
+        Line(opts.InitOpts(typed_array_threshold=3))
+        .add_xaxis(["A", "B", "C"])
+        .add_yaxis("series0", np.array([1.5, 2.0, 3.0]))
+        .add_yaxis("series1", [1, 2])
+    )
+    content = c.render_embed()
+    assert_in("pyechartsDecodeTypedArrays", content)
+    # the category column stays plain JSON, the values column is packed
+    assert_equal(c.dump_options().count("__typed_array__"), 2)
+    assert_in('"columns": [', c.dump_options())
+
+    # a threshold of 0 packs every array, the decoder has to be there too
+    c = (
+        Line(opts.InitOpts(typed_array_threshold=0))
+        .add_xaxis(["A", "B"])
+        .add_yaxis("series0", np.array([1.5, 2.0]))
+    )
+    assert_in("__typed_array__", c.dump_options())
+    assert_in("pyechartsDecodeTypedArrays(", c.render_embed())
+
+
+def test_line_downsampling():
+    size = 10000
+    x = ["c{}".format(i) for i in range(size)]
+    y = np.sin(np.arange(size) / 100.0)
+    c = (
+        Line(init_opts=opts.InitOpts(width="300px"))
+        .set_downsampling()
+        .add_xaxis(x)
+        .add_yaxis("lttb", y)
+        .add_yaxis("short", [1, 2, 3])
+    )
+    data = c.options["series"][0]["data"]
+    assert_equal(len(data), 300)
+    assert_equal(tuple(data[0]), ("c0", 0.0))
+    # the category axis only keeps the categories of the points kept
+    axis = c.options["xAxis"][0]["data"]
+    assert_equal(set(axis), set(x[:3]) | set(data["f0"].tolist()))
+    assert_equal(list(axis), sorted(axis, key=x.index))
+    assert_equal(c.options["xAxis"][0].get("type"), None)
+    assert_true(set(data["f0"].tolist()) <= set(axis))
+
+    c = Line().set_downsampling("minmax", threshold=100).add_xaxis(list(range(size)))
+    c.add_yaxis("minmax", y.tolist())
+    data = c.options["series"][0]["data"]
+    assert len(data) <= 102
+    assert_equal(max(d[1] for d in data), y.max())
+    assert_equal(min(d[1] for d in data), y.min())
+    # numbers on a category axis would be read as category indices
+    xaxis = c.options["xAxis"][0]
+    assert_equal(xaxis["type"], "value")
+    assert_equal(xaxis["data"], None)
+    assert_true(all(d[0] in range(size) for d in data))
+    assert_equal([d[1] for d in data], [y[d[0]] for d in data])
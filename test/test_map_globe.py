@@ -2,6 +2,7 @@ from unittest.mock import patch
 
 from nose.tools import assert_equal, assert_in
 
+from pyecharts import options as opts
 from pyecharts.charts import MapGlobe
 from pyecharts.faker import Faker
 from pyecharts.globals import CurrentConfig, NotebookType
@@ -29,3 +30,17 @@ def test_map_globe_in_jupyter():
     content = c.render_notebook()._repr_html_()
     assert_in("document.createElement('canvas')", content)
     assert_in("baseTexture", content)
+
+
+def test_map_globe_typed_array_payload():
+    CurrentConfig.NOTEBOOK_TYPE = NotebookType.JUPYTER_NOTEBOOK
+
+    c = MapGlobe(opts.InitOpts(typed_array_threshold=2)).add(
+        "商家A", [list(z) for z in zip(Faker.provinces, Faker.values())], "china"
+    )
+    content = c.render_embed("simple_globe.html")
+    assert_in("pyechartsDecodeTypedArrays(", content)
+    assert_in("function pyechartsDecodeTypedArrays", content)
+    content = c.render_notebook()._repr_html_()
+    assert_in("pyechartsDecodeTypedArrays(", content)
+    assert_in("function pyechartsDecodeTypedArrays", content)
@@ -163,3 +163,11 @@ def test_page_resize():
     )
     assert_not_in(".resizable()", content)
     assert_not_in(".draggable()", content)
+
+
+def test_page_render_stream():
+    page = Page().add(_create_bar(), _create_line(), _create_table())
+    page.render("render_stream.html", is_stream=True)
+    with open("render_stream.html", encoding="utf-8") as f:
+        streamed = f.read()
+    assert_equal(streamed, page.render_embed())
@@ -0,0 +1,127 @@
+import datetime
+import json
+import os
+import tempfile
+
+import numpy as np
+from nose.tools import assert_equal, assert_in, assert_raises
+
+from pyecharts import options as opts
+from pyecharts.charts import Kline, Line, Page, Tab
+from pyecharts.commons import pyramid
+
+
+def test_build_pyramid():
+    items = [[i, (i * 7919) % 1000] for i in range(10000)]
+    items[5000][1] = 5000
+    levels = pyramid.build_pyramid(items, factor=4, threshold=100)
+    sizes = [len(level) for level in levels]
+    assert_equal(sizes[:2], [10000, 2500])
+    assert sizes == sorted(sizes, reverse=True) and sizes[-1] <= 100 < sizes[-2]
+    for level in levels:
+        # peaks are kept on every level
+        assert_in([5000, 5000], level)
+
+    candles = [[0, 1, 2, 0, 3], [1, 2, 3, 1, 5], [2, 3, 1, -1, 4]]
+    assert_equal(
+        pyramid.build_pyramid(candles, pyramid.OHLC, factor=2, threshold=1),
+        [candles, [[0, 1, 3, 0, 5], [2, 3, 1, -1, 4]], [[0, 1, 1, -1, 5]]],
+    )
+    with assert_raises(ValueError):
+        pyramid.build_pyramid(items, factor=1)
+
+
+def test_pyramid_axis_values():
+    assert_equal(pyramid.axis_values([1, 2.5]), ([1.0, 2.5], "value"))
+    dates = [datetime.date(1970, 1, 2), "1970-01-01T00:00:01"]
+    assert_equal(pyramid.axis_values(dates), ([86400000.0, 1000.0], "time"))
+    times = np.array(["1970-01-01T00:01"], dtype="datetime64[m]")
+    assert_equal(pyramid.axis_values(times), ([60000.0], "time"))
+    with assert_raises(ValueError):
+        pyramid.axis_values(["Mon", "Tue"])
+
+
+def test_line_lod_pyramid():
+    size = 20000
+    c = (
+        Line()
+        .set_lod_pyramid(threshold=500)
+        .add_xaxis(np.arange(size))
+        .add_yaxis("series0", np.sin(np.arange(size) / 50.0))
+        .set_global_opts(datazoom_opts=opts.DataZoomOpts())
+    )
+    data = c.options["series"][0]["data"]
+    assert len(data) <= 500
+    assert_equal(c.options["xAxis"][0]["type"], "value")
+    js_code = str(c.js_functions.items[0])
+    assert_in("chart_" + c.chart_id, js_code)
+
+    with tempfile.TemporaryDirectory() as folder:
+        c.render(os.path.join(folder, "render.html"))
+        (key,) = os.listdir(os.path.join(folder, "lod"))
+        assert_in('"lod/{}/"'.format(key), js_code)
+        with open(os.path.join(folder, "lod", key, "index.json")) as f:
+            index = json.load(f)
+        assert_equal(len(index["levels"]), 4)
+        assert_equal(sum(chunk[2] for chunk in index["levels"][0]["chunks"]), size)
+        with open(os.path.join(folder, "lod", key, "0", "0.json")) as f:
+            assert_equal(len(json.load(f)), 500)
+        with open(os.path.join(folder, "lod", key, "3", "0.json")) as f:
+            assert_equal(json.load(f), data)
+
+        # the folder is keyed by the content, rendering again reuses it
+        c.render(os.path.join(folder, "render.html"))
+        assert_equal(os.listdir(os.path.join(folder, "lod")), [key])
+
+
+def _lod_line(size: int = 2000) -> Line:
+    return (
+        Line()
+        .set_lod_pyramid(threshold=100)
+        .add_xaxis(list(range(size)))
+        .add_yaxis("series0", [i % 7 for i in range(size)])
+    )
+
+
+def test_lod_pyramid_key():
+    levels = pyramid.build_pyramid([[i, i % 7] for i in range(1000)], threshold=100)
+    key = pyramid.pyramid_key(levels, 100)
+    assert_equal(key, pyramid.pyramid_key([list(level) for level in levels], 100))
+    assert key != pyramid.pyramid_key(levels, 50)
+    assert key != pyramid.pyramid_key(levels[:-1], 100)
+    c0, c1 = _lod_line(), _lod_line()
+    assert_equal(c0._lod_pyramids[0][0], c1._lod_pyramids[0][0])
+    assert _lod_line(1000)._lod_pyramids[0][0] != c0._lod_pyramids[0][0]
+
+
+def test_composite_lod_pyramid():
+    for composite in (Page().add(_lod_line()), Tab().add(_lod_line(), "lod")):
+        with tempfile.TemporaryDirectory() as folder:
+            composite.render(os.path.join(folder, "render.html"))
+            (key,) = os.listdir(os.path.join(folder, "lod"))
+            assert os.path.isfile(os.path.join(folder, "lod", key, "index.json"))
+
+
+def test_embedded_lod_pyramid():
+    c = _lod_line()
+    for render in (c.render_embed, c.render_notebook, Page().add(c).render_embed):
+        with assert_raises(ValueError):
+            render()
+    with tempfile.TemporaryDirectory() as folder:
+        c.write_lod_files(os.path.join(folder, "lod"))
+    assert_in("chart_" + c.chart_id, c.render_embed())
+    Page().add(c).render_embed()
+
+
+def test_kline_lod_pyramid():
+    days = [datetime.date(2020, 1, 1) + datetime.timedelta(days=i) for i in range(8)]
+    candles = [[i, i + 1, i - 1, i + 2] for i in range(8)]
+    c = Kline().set_lod_pyramid(threshold=2).add_xaxis(days).add_yaxis("k", candles)
+    assert_equal(c.options["xAxis"][0]["type"], "time")
+    assert_equal(
+        c.options["series"][0]["data"],
+        [
+            [1577836800000.0, 0, 4, -1, 5],
+            [1578182400000.0, 4, 8, 3, 9],
+        ],
+    )
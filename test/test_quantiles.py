@@ -0,0 +1,55 @@
+import random
+from unittest.mock import patch
+
+import numpy as np
+from nose.tools import assert_equal, assert_raises
+
+from pyecharts.commons import quantiles
+
+
+def _groups(seed: int = 1) -> list:
+    rnd = random.Random(seed)
+    floats = [[rnd.gauss(0, 1) for _ in range(rnd.randint(1, 60))] for _ in range(200)]
+    ints = [[rnd.randint(0, 9) for _ in range(rnd.randint(1, 9))] for _ in range(200)]
+    return floats + ints
+
+
+def test_box_stats_same_without_numpy():
+    groups = _groups()
+    for whisker in (None, 1.5):
+        stats = quantiles.box_stats(groups, whisker)
+        with patch("pyecharts.commons.utils.optional_numpy", return_value=None):
+            assert_equal(quantiles.box_stats(groups, whisker), stats)
+
+    samples = np.random.default_rng(0).normal(size=(20, 1001))
+    boxes, outliers = quantiles.box_stats(samples)
+    expected = np.quantile(samples, [0, 0.25, 0.5, 0.75, 1], axis=1, method="weibull")
+    np.testing.assert_allclose(boxes, expected.T)
+    assert_equal(outliers, [])
+    with assert_raises(ValueError):
+        quantiles.box_stats([[1, 2, 3], []])
+
+
+def test_box_stats_tukey_fences():
+    boxes, outliers = quantiles.box_stats([[1, 2, 3, 4, 5, 6, 7, 100, -50]], 1.5)
+    assert_equal(boxes, [[1, 1.5, 4, 6.5, 7]])
+    assert_equal(outliers, [[0, -50], [0, 100]])
+    # groups too short to interpolate stay within their samples
+    assert_equal(quantiles.box_stats([[3], [4, 2]])[0], [[3] * 5, [2, 2, 3.0, 4, 4]])
+
+
+def test_kll_sketch():
+    values = np.random.default_rng(1).random(200000)
+    sketch = quantiles.KLLSketch(200).update(values.tolist())
+    assert_equal(sketch.count, 200000)
+    assert sum(len(level) for level in sketch._levels) < 600
+    for q in (0.1, 0.25, 0.5, 0.75, 0.9):
+        assert abs(sketch.quantile(q) - q) < 0.02
+
+    groups = (iter(row) for row in values.reshape(4, -1).tolist())
+    boxes = quantiles.sketch_stats(groups, k=200)
+    assert_equal(len(boxes), 4)
+    assert_equal(boxes[0][0], values[:50000].min())
+    assert abs(boxes[0][2] - 0.5) < 0.02
+    with assert_raises(ValueError):
+        quantiles.sketch_stats([iter([])])
@@ -0,0 +1,100 @@
+import datetime
+import random
+from unittest.mock import patch
+
+import numpy as np
+from nose.tools import assert_equal, assert_raises
+
+from pyecharts.charts import Kline
+from pyecharts.commons import resample
+
+
+def _trades(size: int, seed: int = 1) -> tuple:
+    rnd = random.Random(seed)
+    timestamps = sorted(rnd.uniform(0, 1000) for _ in range(size))
+    prices = [round(rnd.uniform(90, 110), 2) for _ in range(size)]
+    volumes = [rnd.randint(1, 100) for _ in range(size)]
+    return timestamps, prices, volumes
+
+
+def test_resample_ohlc():
+    bars = resample.resample_ohlc([0, 1, 5, 12, 11, 25], [1, 3, 2, 5, 4, 6], 10)
+    assert_equal(bars.starts, [0, 10, 20])
+    assert_equal(bars.rows, [[1, 2, 1, 3], [4, 5, 4, 5], [6, 6, 6, 6]])
+    assert_equal(bars.volumes, [0, 0, 0])
+
+    timestamps, prices, volumes = _trades(10000)
+    bars = resample.resample_ohlc(timestamps, prices, 7, volumes, origin=3)
+    with patch("pyecharts.commons.utils.optional_numpy", return_value=None):
+        fallback = resample.resample_ohlc(timestamps, prices, 7, volumes, origin=3)
+    assert_equal(list(bars), list(fallback))
+    assert_equal(sum(bars.volumes), sum(volumes))
+    array = resample.resample_ohlc(np.array(timestamps), np.array(prices), 7, origin=3)
+    assert_equal(array.rows, bars.rows)
+    with assert_raises(ValueError):
+        resample.resample_ohlc([1, 2], [1], 10)
+
+
+def test_resample_shuffled_trades():
+    bars = resample.resample_ohlc([5, 1, 9, 3], [50, 10, 90, 30], 10)
+    assert_equal(bars.rows, [[10, 90, 10, 90]])
+
+    timestamps, prices, volumes = _trades(5000)
+    expected = resample.resample_ohlc(timestamps, prices, 7, volumes)
+    order = list(range(5000))
+    random.Random(3).shuffle(order)
+    shuffled = [[column[i] for i in order] for column in (timestamps, prices, volumes)]
+    assert_equal(
+        list(resample.resample_ohlc(*shuffled[:2], 7, shuffled[2])), list(expected)
+    )
+    with patch("pyecharts.commons.utils.optional_numpy", return_value=None):
+        fallback = resample.resample_ohlc(*shuffled[:2], 7, shuffled[2])
+    assert_equal(list(fallback), list(expected))
+
+
+def test_resample_stream():
+    timestamps, prices, volumes = _trades(5000)
+    bars = resample.resample_ohlc(timestamps, prices, 10, volumes)
+    ticks = iter(zip(timestamps, prices, volumes))
+    chunks = list(resample.stream_ohlc(ticks, 10, chunk_size=333))
+    streamed = sum(chunks, resample.Bars([], [], []))
+    assert_equal(list(streamed), list(bars))
+
+    resampler = resample.OHLCResampler(10)
+    resampler.update([20, 25], [1, 2])
+    with assert_raises(ValueError):
+        resampler.update([5], [1])
+
+
+def test_resample_rebucket():
+    bars = resample.resample_ohlc(*_trades(5000)[:2], 1)
+    merged, interval = resample.rebucket(bars, 1, 300)
+    assert_equal(interval, 4)
+    assert len(merged) <= 300
+    assert_equal(merged.rows[0][0], bars.rows[0][0])
+    assert_equal(merged.rows[-1][1], bars.rows[-1][1])
+    assert_equal(max(r[3] for r in merged.rows), max(r[3] for r in bars.rows))
+    assert_equal(resample.rebucket(bars, 1, 5000), (bars, 1))
+
+
+def test_kline_add_ticks():
+    start = datetime.datetime(2020, 1, 1, 9, 30)
+    timestamps = [start + datetime.timedelta(seconds=7 * i) for i in range(100)]
+    c = Kline().add_ticks(
+        "trades",
+        timestamps,
+        list(range(100)),
+        datetime.timedelta(minutes=1),
+        volumes=[1] * 100,
+        max_bars=4,
+    )
+    assert_equal(
+        c.options["xAxis"][0]["data"],
+        [
+            "2020-01-01 09:30",
+            "2020-01-01 09:33",
+            "2020-01-01 09:36",
+            "2020-01-01 09:39",
+        ],
+    )
+    assert_equal(c.options["series"][0]["data"][0], [0, 25, 0, 25, 26])
@@ -1,6 +1,6 @@
 from unittest.mock import patch
 
-from nose.tools import assert_equal, assert_in
+from nose.tools import assert_equal, assert_in, assert_raises
 
 from pyecharts import options as opts
 from pyecharts.charts import Sankey
@@ -68,3 +68,25 @@ def test_sankey_new_opts(fake_writer):
     assert_in("orient", content)
     assert_in("levels", content)
     assert_in("focusNodeAdjacency", content)
+
+
+def test_sankey_link_aggregation():
+    links = [
+        {"source": "a", "target": "b", "value": 1},
+        {"source": "a", "target": "c", "value": 4},
+        {"source": "a", "target": "b", "value": 2},
+    ]
+    c = Sankey().add("sankey", [], links, link_aggregate="sum")
+    assert_equal(
+        c.options["series"][0]["links"],
+        [
+            {"source": "a", "target": "b", "value": 3},
+            {"source": "a", "target": "c", "value": 4},
+        ],
+    )
+    c = Sankey().add("sankey", [], links, link_aggregate="count", link_top_k=1)
+    assert_equal(
+        c.options["series"][0]["links"], [{"source": "a", "target": "b", "value": 2}]
+    )
+    with assert_raises(ValueError):
+        Sankey().add("sankey", [], links, link_top_k=1)
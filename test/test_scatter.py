@@ -1,5 +1,6 @@
 from unittest.mock import patch
 
+import numpy as np
 from nose.tools import assert_equal
 
 from pyecharts import options as opts
@@ -38,3 +39,28 @@ def test_scatter_item_base(fake_writer):
     _, content = fake_writer.call_args[0]
     assert_equal(c.theme, "white")
     assert_equal(c.renderer, "canvas")
+
+
+def test_scatter_numpy_data():
+    x_axis, y_axis = [1, 2, 3], [[1.5, 7.0], [2.0, 8.0], [3.5, 9.0]]
+    c0 = Scatter().add_xaxis(x_axis).add_yaxis("series0", y_axis)
+    c1 = Scatter().add_xaxis(np.array(x_axis)).add_yaxis("series0", np.array(y_axis))
+    assert_equal(c0.dump_options(), c1.dump_options())
+
+
+def test_scatter_batch_items():
+    values = [[1.0, 1.5], [2.0, 2.5], [3.0, 3.5]]
+    colors = ["red", None, "blue"]
+    items = [{"value": v, "symbolSize": 5} for v in values]
+    items[0]["itemStyle"] = {"color": "red"}
+    items[2]["itemStyle"] = {"color": "blue"}
+    c0 = Scatter().add_xaxis([1, 2, 3]).add_yaxis("series0", items)
+    c1 = (
+        Scatter()
+        .add_xaxis([1, 2, 3])
+        .add_yaxis(
+            "series0",
+            opts.ScatterItems(values=np.array(values), symbol_sizes=5, colors=colors),
+        )
+    )
+    assert_equal(c0.dump_options(), c1.dump_options())
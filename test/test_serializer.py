@@ -0,0 +1,372 @@
+import datetime
+import decimal
+import json
+from unittest import SkipTest
+from unittest.mock import patch
+
+import numpy as np
+from nose.tools import assert_equal, assert_in, assert_true
+
+from pyecharts import charts
+from pyecharts import options as opts
+from pyecharts.charts import (
+    Bar,
+    Bar3D,
+    BMap,
+    Boxplot,
+    Calendar,
+    EffectScatter,
+    Funnel,
+    Gauge,
+    Geo,
+    Graph,
+    Grid,
+    HeatMap,
+    Kline,
+    Line,
+    Line3D,
+    Liquid,
+    Map,
+    Map3D,
+    MapGlobe,
+    Page,
+    Parallel,
+    PictorialBar,
+    Pie,
+    Polar,
+    Radar,
+    Sankey,
+    Scatter,
+    Scatter3D,
+    Sunburst,
+    Surface3D,
+    Tab,
+    ThemeRiver,
+    Timeline,
+    Tree,
+    TreeMap,
+    WordCloud,
+)
+from pyecharts.commons.utils import JsCode
+from pyecharts.faker import Faker
+from pyecharts.globals import ChartType, CurrentConfig, JsonBackendType
+from pyecharts.render import serializer
+
+_BACKENDS = (JsonBackendType.SIMPLEJSON, JsonBackendType.JSON)
+
+
+def _orjson() -> serializer.Serializer:
+    """
+    The orjson backend. Tests of it are skipped when orjson is not installed,
+    rather than run against the simplejson fallback.
+    """
+    backend = serializer.get_serializer(JsonBackendType.ORJSON)
+    if not isinstance(backend, serializer.OrjsonSerializer):
+        raise SkipTest("orjson is not installed")
+    return backend
+
+
+def _charts() -> list:
+    """
+    One chart of every chart class, Page and Tab holding some of the others,
+    with the main kinds of options: nested opts, data items, batches of
+    items, numpy arrays, javascript, dates and non-ASCII text.
+    """
+    formatter = JsCode("function (params) { return params.value + '%'; }")
+    values = np.array([1.5, np.nan, 3.0, 4.25, 5.0, 6.0, 7.0])
+    bar = (
+        Bar()
+        .add_xaxis(Faker.choose())
+        .add_yaxis(
+            "商家A",
+            Faker.values(),
+            markline_opts=opts.MarkLineOpts(data=[opts.MarkLineItem(type_="average")]),
+        )
+        .add_yaxis("商家B", opts.BarItems(values=Faker.values(), colors="#d14a61"))
+        .set_global_opts(
+            title_opts=opts.TitleOpts(title="Bar", subtitle="副标题"),
+            toolbox_opts=opts.ToolboxOpts(),
+            datazoom_opts=opts.DataZoomOpts(),
+            tooltip_opts=opts.TooltipOpts(formatter=formatter),
+        )
+    )
+    line = (
+        Line()
+        .add_xaxis([datetime.date(2020, 1, d) for d in range(1, 8)])
+        .add_yaxis("series0", values, is_smooth=True)
+        .set_series_opts(label_opts=opts.LabelOpts(formatter=formatter))
+        .set_global_opts(xaxis_opts=opts.AxisOpts(type_="time"))
+    )
+    pie = Pie().add(
+        "",
+        opts.PieItems(values=Faker.values(), names=Faker.choose()),
+        radius=["40%", "75%"],
+    )
+    scatter = (
+        Scatter()
+        .add_xaxis(list(range(7)))
+        .add_yaxis("series0", opts.ScatterItems(values=values, symbol_sizes=10))
+        .set_global_opts(visualmap_opts=opts.VisualMapOpts(type_="size"))
+    )
+    map_chart = (
+        Map()
+        .add("商家A", [list(z) for z in zip(Faker.provinces, Faker.values())], "china")
+        .set_global_opts(visualmap_opts=opts.VisualMapOpts(max_=200))
+    )
+    geo = (
+        Geo()
+        .add_schema(maptype="china")
+        .add("geo", [list(z) for z in zip(Faker.provinces, Faker.values())])
+        .add(
+            "lines",
+            [("广州", "上海"), ("广州", "北京")],
+            type_=ChartType.LINES,
+            effect_opts=opts.EffectOpts(symbol_size=6),
+        )
+    )
+    kline = (
+        Kline()
+        .add_xaxis(["2017-10-24", "2017-10-25", "2017-10-26"])
+        .add_yaxis("kline", [[20, 34, 10, 38], [40, 35, 30, 50], [31, 38, 33, 44]])
+    )
+    heatmap = (
+        HeatMap()
+        .add_xaxis(Faker.clock)
+        .add_yaxis(
+            "series0",
+            Faker.week,
+            [[i, j, i * j] for i in range(len(Faker.clock)) for j in range(7)],
+        )
+        .set_global_opts(visualmap_opts=opts.VisualMapOpts())
+    )
+    graph = Graph().add(
+        "",
+        [opts.GraphNode(name="结点1", symbol_size=10), {"name": "结点2"}],
+        [opts.GraphLink(source="结点1", target="结点2")],
+    )
+    sankey = Sankey().add(
+        "sankey",
+        [{"name": "a"}, {"name": "b"}],
+        [{"source": "a", "target": "b", "value": 1}],
+        linestyle_opt=opts.LineStyleOpts(opacity=0.2, curve=0.5),
+    )
+    boxplot = Boxplot()
+    boxplot.add_xaxis(["expr1", "expr2"]).add_yaxis(
+        "A", boxplot.prepare_data([[850, 740, 900, 1070], [960, 940, 960, 940]])
+    )
+    radar = (
+        Radar()
+        .add_schema(schema=[opts.RadarIndicatorItem(name="销售", max_=6500)])
+        .add("预算分配", [opts.RadarItem(value=[4300])])
+    )
+    grid = (
+        Grid()
+        .add(bar, grid_opts=opts.GridOpts(pos_bottom="60%"))
+        .add(
+            Line().add_xaxis(["A", "B"]).add_yaxis("series0", [1, 2]),
+            grid_opts=opts.GridOpts(pos_top="60%"),
+        )
+    )
+    calendar = Calendar().add(
+        "",
+        [[datetime.date(2017, 1, d), d * 100] for d in range(1, 29)],
+        calendar_opts=opts.CalendarOpts(range_="2017-01"),
+    )
+    polar = Polar().add(
+        "",
+        [(i, i * i) for i in range(10)],
+        type_="scatter",
+        label_opts=opts.LabelOpts(is_show=False),
+    )
+    sunburst = Sunburst().add(
+        "",
+        [{"name": "父", "children": [{"name": "子", "value": 2}]}],
+        radius=[0, "90%"],
+    )
+    themeriver = ThemeRiver().add(
+        ["DQ", "TY"],
+        [["2015/11/08", 10, "DQ"], ["2015/11/20", 30, "TY"]],
+        singleaxis_opts=opts.SingleAxisOpts(type_="time", pos_bottom="10%"),
+    )
+    parallel = (
+        Parallel()
+        .add_schema([{"dim": 0, "name": "AQI"}, {"dim": 1, "name": "PM2.5"}])
+        .add("parallel", [[91, 45], [65, 27]])
+    )
+    cube = [[i, j, i * j] for i in range(3) for j in range(4)]
+    axis3d = opts.Axis3DOpts(type_="value")
+    timeline = Timeline()
+    for year in (2019, 2020):
+        timeline.add(
+            Bar().add_xaxis(["A", "B"]).add_yaxis("商家A", [year, 1]), str(year)
+        )
+    return [
+        bar,
+        line,
+        pie,
+        scatter,
+        map_chart,
+        geo,
+        kline,
+        heatmap,
+        graph,
+        sankey,
+        boxplot,
+        radar,
+        grid,
+        calendar,
+        polar,
+        sunburst,
+        themeriver,
+        parallel,
+        timeline,
+        BMap()
+        .add_schema(baidu_ak="fake_application_key", center=[-0.118, 51.509])
+        .add_coordinate("London", -0.118, 51.509)
+        .add("bmap", [["London", 1]]),
+        EffectScatter().add_xaxis(Faker.choose()).add_yaxis("", Faker.values()),
+        Funnel().add("商品", [list(z) for z in zip(Faker.choose(), Faker.values())]),
+        Gauge().add("", [("完成率", 66.6)]),
+        Liquid().add("lq", [0.6, 0.7]),
+        PictorialBar()
+        .add_xaxis(["山西", "四川"])
+        .add_yaxis("", [13, 42], symbol_repeat="fixed", is_symbol_clip=True),
+        Tree().add("", [{"name": "A", "children": [{"name": "B"}, {"name": "C"}]}]),
+        TreeMap().add("演示数据", [{"value": 40, "name": "我是A"}]),
+        WordCloud().add("", [("Sam S Club", 10000), ("Macys", 6181)]),
+        Bar3D().add(
+            "",
+            cube,
+            xaxis3d_opts=opts.Axis3DOpts(["a", "b", "c"], type_="category"),
+            yaxis3d_opts=axis3d,
+            zaxis3d_opts=axis3d,
+        ),
+        Line3D().add("", cube, xaxis3d_opts=axis3d, yaxis3d_opts=axis3d),
+        Map3D()
+        .add_schema()
+        .add("商家A", [list(z) for z in zip(Faker.provinces, Faker.values())]),
+        MapGlobe().add(
+            "商家A", [list(z) for z in zip(Faker.provinces, Faker.values())], "china"
+        ),
+        Scatter3D().add("", cube),
+        Surface3D().add("", cube, xaxis3d_opts=axis3d, yaxis3d_opts=axis3d),
+        Page().add(Line().add_xaxis(["A", "B"]).add_yaxis("页", [1, 2])),
+        Tab().add(Pie().add("", [("甲", 1), ("乙", 2)]), "饼图"),
+    ]
+
+
+def _assert_conforms(backend, chart, is_exact: bool):
+    builtin = serializer.get_serializer(JsonBackendType.BUILTIN)
+    if is_exact:
+        assert_equal(backend.dumps(chart.options), builtin.dumps(chart.options))
+    assert_equal(
+        json.loads(backend.dumps(chart.options, with_quotes=True)),
+        json.loads(builtin.dumps(chart.options, with_quotes=True)),
+    )
+
+
+def _dumped_charts() -> list:
+    # Page and Tab have no options of their own, only their charts are dumped
+    dumped = []
+    for chart in _charts():
+        dumped.extend(chart if isinstance(chart, (Page, Tab)) else [chart])
+    return dumped
+
+
+def test_backends_conformance():
+    kinds = {type(chart).__name__ for chart in _charts()}
+    assert_equal(kinds, set(charts._CHARTS))
+    for chart in _dumped_charts():
+        for name in _BACKENDS:
+            _assert_conforms(serializer.get_serializer(name), chart, is_exact=True)
+
+
+def test_orjson_conformance():
+    # orjson indents with 2 spaces, only the parsed JSON has to match
+    backend = _orjson()
+    for chart in _dumped_charts():
+        _assert_conforms(backend, chart, is_exact=False)
+
+
+def _assert_semantics(backend):
+    options = {
+        "a": None,
+        "b": "",
+        "nan": [float("nan"), float("inf"), 1.5],
+        "date": datetime.date(2020, 1, 2),
+        "label": opts.LabelOpts(formatter=JsCode("function (x) { return x; }")),
+        "data": np.array([1.0, np.nan]),
+        "times": np.array(["2020-01-01", "NaT"], dtype="datetime64[D]"),
+    }
+    assert_in("function (x) { return x; }", backend.dumps(options))
+    assert_equal(
+        json.loads(backend.dumps(options, with_quotes=True)),
+        {
+            "nan": [None, None, 1.5],
+            "date": "2020-01-02",
+            "label": {
+                "show": True,
+                "position": "top",
+                "margin": 8,
+                "formatter": "function (x) { return x; }",
+            },
+            "data": [1.0, None],
+            "times": ["2020-01-01", None],
+        },
+    )
+
+
+def test_backends_semantics():
+    for name in _BACKENDS:
+        _assert_semantics(serializer.get_serializer(name))
+
+
+def test_orjson_semantics():
+    _assert_semantics(_orjson())
+
+
+def test_chart_json_backend():
+    with patch.object(CurrentConfig, "JSON_BACKEND", JsonBackendType.JSON):
+        c = Line().add_xaxis(["A", "B"]).add_yaxis("series0", [1, 2])
+        assert_equal(
+            c.dump_options(),
+            serializer.get_serializer(JsonBackendType.BUILTIN).dumps(c.options),
+        )
+
+
+def test_chart_orjson_backend():
+    _orjson()
+    c = (
+        Bar(opts.InitOpts(json_backend=JsonBackendType.ORJSON))
+        .add_xaxis(["A", "B"])
+        .add_yaxis("series0", [1, 2])
+    )
+    assert_true(c.dump_options().startswith('{\n  "animation"'))
+
+
+def test_missing_json_backend():
+    with patch.dict(serializer._INSTANCES, clear=True), patch.dict(
+        "sys.modules", {"orjson": None}
+    ):
+        backend = serializer.get_serializer(JsonBackendType.ORJSON)
+    assert_true(isinstance(backend, serializer.SimpleJsonSerializer))
+
+
+def test_orjson_fallback_with_arrays():
+    options = {"big": 1 << 70, "data": np.array([1.0, np.nan, 2.5])}
+    content = _orjson().dumps(options, with_quotes=True)
+    assert_equal(json.loads(content), {"big": 1 << 70, "data": [1.0, None, 2.5]})
+
+
+def test_backends_decimal():
+    options = {"value": decimal.Decimal("0.1000000000000000000001")}
+    exact = '{\n    "value": 0.1000000000000000000001\n}'
+    for name in (JsonBackendType.BUILTIN, JsonBackendType.SIMPLEJSON):
+        assert_equal(serializer.get_serializer(name).dumps(options), exact)
+    content = serializer.get_serializer(JsonBackendType.JSON).dumps(options)
+    assert_equal(json.loads(content), {"value": 0.1})
+
+
+def test_orjson_decimal():
+    options = {"value": decimal.Decimal("0.1000000000000000000001")}
+    assert_equal(json.loads(_orjson().dumps(options)), {"value": 0.1})
@@ -1,5 +1,6 @@
-from nose.tools import assert_equal
+from nose.tools import assert_equal, assert_false, assert_in
 
+from pyecharts.options import BarItem
 from pyecharts.options.series_options import LabelOpts
 
 
@@ -55,3 +56,13 @@ def test_label_options_custom():
         "rich": None,
     }
     assert_equal(expected, option.opts)
+
+
+def test_options_compact_representation():
+    item = BarItem(name="a", value=1)
+    assert_false(hasattr(item, "__dict__"))
+    assert_false(hasattr(LabelOpts(), "__dict__"))
+    assert_equal(item.opts, {"name": "a", "value": 1})
+    item.update(label=LabelOpts())
+    assert_in("label", item.opts)
+    assert_equal(LabelOpts().opts["color"], None)
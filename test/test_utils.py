@@ -12,7 +12,32 @@ def test_utils_produce_require_dict():
 def test_js_code():
     fn = "function() { console.log('test_js_code') }"
     js_code = utils.JsCode(fn)
-    assert_equal(js_code.js_code, "--x_x--0_0--{}--x_x--0_0--".format(fn))
+    assert_equal(js_code.js_code, fn)
+
+
+def test_js_code_registry_splice():
+    registry = utils.JsCodeRegistry()
+    fn = utils.JsCode("function () {\n return 'a\\nb'; }")
+    text = '{"formatter": "%s", "name": "x"}' % registry.token(fn)
+    assert_equal(
+        registry.splice(text),
+        '{"formatter": function () { return \'a\\nb\'; }, "name": "x"}',
+    )
+    assert_equal(
+        registry.splice(text, with_quotes=True),
+        '{"formatter": "function () { return \'a\\nb\'; }", "name": "x"}',
+    )
+    assert_equal(registry.splice('{"name": "x"}'), '{"name": "x"}')
+
+
+def test_js_code_registry_splice_stream():
+    registry = utils.JsCodeRegistry()
+    fns = [utils.JsCode("function () { return %d; }" % i) for i in range(3)]
+    text = ", ".join('{"f": "%s"}' % registry.token(fn) for fn in fns) * 20
+    expected = registry.splice(text)
+    for size in (1, 7, 23, 64, 1000):
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        assert_equal("".join(registry.splice_stream(chunks)), expected)
 
 
 def test_ordered_set():